@@ -1,11 +1,222 @@
 """This module implements only calling Zaim CSV converter package."""
 
+import argparse
+import contextlib
+import logging
+from pathlib import Path
+
+from zaimcsvconverter import PATH_FILE_CONFIG
+from zaimcsvconverter import DirectoryCsv
+from zaimcsvconverter.conversion_server import ConversionServer
+from zaimcsvconverter.convert_table_compactor import ConvertTableCompactor
+from zaimcsvconverter.spool_worker import ErrorFragments
+from zaimcsvconverter.spool_worker import SpoolWorker
+from zaimcsvconverter.workspace import Workspace
+from zaimcsvconverter.zaim_csv_batch_converter import ZaimCsvBatchConverter
+from zaimcsvconverter.zaim_csv_converter import MergeMode
 from zaimcsvconverter.zaim_csv_converter import ZaimCsvConverter
+from zaimcsvconverter.zaim_csv_converter_watcher import ZaimCsvConverterWatcher
+
+# Options which affect converting input CSV files in csvinput/
+LIST_OPTION_CONVERSION = [
+    "--parallel",
+    "--max-workers",
+    "--shard-size",
+    "--pipelined",
+    "--incremental",
+    "--watch",
+    "--merge",
+    "--batch",
+    "--spool",
+    "--compact",
+]
 
 
 def main() -> None:
     """Call Zaim CSV converter package."""
-    ZaimCsvConverter.execute()
+    parser = create_parser()
+    arguments = parser.parse_args()
+    validate(parser, arguments)
+    run(arguments)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create parser of command line arguments."""
+    parser = argparse.ArgumentParser(description="Convert account CSV files into Zaim CSV files.")
+    parser.add_argument("--parallel", action="store_true", help="convert each input CSV file on separate process")
+    parser.add_argument("--max-workers", type=int, help="number of worker processes, defaults to number of CPU cores")
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        help="split rows of each input CSV file into shards of this size to convert them on multiple processes",
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="read, process, convert and write rows of each input CSV file on separate threads",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="skip input CSV files whose content, convert tables and config are unchanged since previous run",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep converting input CSV files as soon as input CSV files or convert table CSV files are changed",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=ZaimCsvConverterWatcher.DEFAULT_INTERVAL_SECONDS,
+        help="interval in seconds to check changes of files in watch mode or leases of other workers in spool mode",
+    )
+    parser.add_argument(
+        "--merge",
+        choices=[MergeMode.ALSO.value, MergeMode.INSTEAD.value],
+        default=MergeMode.NONE.value,
+        help="also or instead output single Zaim CSV file which merges all Zaim CSV files ordered by date",
+    )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        type=Path,
+        metavar="WORKSPACE",
+        help="convert each of directories which has config.yml, csvconverttable/, csvinput/ and csvoutput/",
+    )
+    parser.add_argument(
+        "--spool",
+        choices=["worker", "report"],
+        help="worker: claim input CSV files from csvinput/ shared with other workers and convert them, "
+        "input CSV files are moved out of csvinput/ into csvinput/.lease/ while converting "
+        "and into csvinput/.done/ after converting, "
+        "report: merge errors reported by workers into error CSV files",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=SpoolWorker.DEFAULT_LEASE_SECONDS,
+        help="seconds after which lease of input CSV file claimed by crashed worker expires in spool mode",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="write convert table CSV files without duplicated rows into csvoutput/csvconverttable/ "
+        "and report conflicted, near-duplicated and unused entries",
+    )
+    parser.add_argument("--serve", action="store_true", help="start HTTP server which converts uploaded account CSV")
+    parser.add_argument("--host", default="127.0.0.1", help="host name to listen on in server mode")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on in server mode")
+    return parser
+
+
+def run(arguments: argparse.Namespace) -> None:
+    """Run mode specified by command line arguments."""
+    if run_standalone(arguments):
+        return
+    if arguments.batch:
+        batch(arguments)
+        return
+    if arguments.spool is not None:
+        spool(arguments)
+        return
+    ZaimCsvConverter.execute(
+        parallel=arguments.parallel,
+        max_workers=arguments.max_workers,
+        pipelined=arguments.pipelined,
+        incremental=arguments.incremental,
+        shard_size=arguments.shard_size,
+        merge_mode=MergeMode(arguments.merge),
+    )
+
+
+def run_standalone(arguments: argparse.Namespace) -> bool:
+    """Run mode which doesn't convert input CSV files only once, and return whether such mode is specified."""
+    if arguments.compact:
+        ConvertTableCompactor(Workspace.default()).execute()
+        return True
+    if arguments.serve:
+        serve(arguments.host, arguments.port)
+        return True
+    if arguments.watch:
+        watch(arguments.interval, pipelined=arguments.pipelined)
+        return True
+    return False
+
+
+def validate(parser: argparse.ArgumentParser, arguments: argparse.Namespace) -> None:
+    """Exit with usage when options which can't be used together are specified."""
+    validate_exclusive(parser, arguments, "--parallel", ["--shard-size"])
+    validate_exclusive(parser, arguments, "--batch", ["--shard-size"])
+    validate_exclusive(parser, arguments, "--watch", ["--parallel", "--merge", "--incremental", "--shard-size"])
+    validate_exclusive(parser, arguments, "--serve", LIST_OPTION_CONVERSION)
+    validate_exclusive(parser, arguments, "--spool", ["--merge", "--incremental"])
+
+
+def validate_exclusive(
+    parser: argparse.ArgumentParser,
+    arguments: argparse.Namespace,
+    option: str,
+    list_option_conflicted: list[str],
+) -> None:
+    """Exit with usage when option is specified together with any of options which can't be used with it."""
+    if not is_specified(parser, arguments, option):
+        return
+    for option_conflicted in list_option_conflicted:
+        if is_specified(parser, arguments, option_conflicted):
+            parser.error(f"{option} and {option_conflicted} can't be used together")
+
+
+def is_specified(parser: argparse.ArgumentParser, arguments: argparse.Namespace, option: str) -> bool:
+    """Return whether option is specified with value other than its default."""
+    dest = option.removeprefix("--").replace("-", "_")
+    return bool(getattr(arguments, dest) != parser.get_default(dest))
+
+
+def batch(arguments: argparse.Namespace) -> None:
+    """Convert workspaces in one process, or in one process pool when parallel."""
+    zaim_csv_batch_converter = ZaimCsvBatchConverter(
+        [Workspace.create(directory_root) for directory_root in arguments.batch],
+        parallel=arguments.parallel,
+        max_workers=arguments.max_workers,
+        pipelined=arguments.pipelined,
+    )
+    zaim_csv_batch_converter.execute(incremental=arguments.incremental, merge_mode=MergeMode(arguments.merge))
+
+
+def spool(arguments: argparse.Namespace) -> None:
+    """Run spool worker until spool is drained, or merge errors reported by spool workers."""
+    workspace = Workspace.default()
+    if arguments.spool == "report":
+        ErrorFragments(workspace.directory_csv_output).report()
+        return
+    logging.basicConfig(level=logging.INFO)
+    spool_worker = SpoolWorker(workspace, lease_seconds=arguments.lease_seconds, pipelined=arguments.pipelined)
+    with contextlib.suppress(KeyboardInterrupt):
+        spool_worker.run(arguments.interval)
+
+
+def watch(interval: float, *, pipelined: bool) -> None:
+    """Watch input CSV files and convert table CSV files until interrupted."""
+    logging.basicConfig(level=logging.INFO)
+    watcher = ZaimCsvConverterWatcher(
+        DirectoryCsv.INPUT.value,
+        DirectoryCsv.CONVERT.value,
+        DirectoryCsv.OUTPUT.value,
+        PATH_FILE_CONFIG,
+        pipelined=pipelined,
+    )
+    with contextlib.suppress(KeyboardInterrupt):
+        watcher.watch(interval)
+
+
+def serve(host: str, port: int) -> None:
+    """Serve HTTP server which converts uploaded account CSV until interrupted."""
+    with (
+        ConversionServer((host, port), PATH_FILE_CONFIG, DirectoryCsv.CONVERT.value) as server,
+        contextlib.suppress(KeyboardInterrupt),
+    ):
+        server.serve_forever()
 
 
 if __name__ == "__main__":
@@ -16,6 +16,7 @@ from tests.testlibraries.database_for_test import DatabaseForTest
 from tests.testlibraries.instance_resource import InstanceResource
 from zaimcsvconverter import CONFIG
 from zaimcsvconverter.accounts.context import AccountContext
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
 from zaimcsvconverter.inputtooutput.converters.recordtozaim import ZaimRowConverter
 from zaimcsvconverter.inputtooutput.converters.recordtozaim import ZaimRowFactory
 from zaimcsvconverter.inputtooutput.datasources.csvfile.csv_record_processor import CsvRecordProcessor
@@ -206,6 +207,7 @@ def _yaml_config_file(resource_path_root: Path) -> Generator[None, None, None]:
 @pytest.fixture(scope="class")
 def _yaml_config_load_class_scope(resource_path_root: Path) -> None:
     CONFIG.load(resource_path_root / "config.yml.dist")
+    CONVERT_TABLE_INDEX.configure(CONFIG.store_categories)
 
 
 @pytest.fixture
@@ -216,6 +218,7 @@ def _yaml_config_load(
 ) -> None:
     """Prepare YAML config file and loads it."""
     CONFIG.load(get_config_file_path(request, resource_path, resource_path_root))
+    CONVERT_TABLE_INDEX.configure(CONFIG.store_categories)
 
 
 def get_config_file_path(request: pytest.FixtureRequest, resource_path: Path, resource_path_root: Path) -> Path:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import csv
 from typing import TYPE_CHECKING
 
@@ -64,6 +65,22 @@ class TestCsvToCsvConverterForStore:
                 ],
             )
 
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.parametrize("path_file_csv_input", ["waon"], indirect=["path_file_csv_input"])
+    @pytest.mark.usefixtures("_yaml_config_load", "database_session_basic_store_waon")
+    def test_aexecute(path_file_csv_input: Path, tmp_path: Path) -> None:
+        """Asynchronous execution should output same CSV as synchronous one."""
+        directory_sync = tmp_path / "sync"
+        directory_async = tmp_path / "async"
+        directory_sync.mkdir()
+        directory_async.mkdir()
+        CsvToCsvConverter(path_file_csv_input, directory_sync).execute()
+        asyncio.run(CsvToCsvConverter(path_file_csv_input, directory_async).aexecute())
+        path_sync = directory_sync / path_file_csv_input.name
+        path_async = directory_async / path_file_csv_input.name
+        assert path_async.read_bytes() == path_sync.read_bytes()
+
     # pylint: disable=unused-argument
     @staticmethod
     @pytest.mark.parametrize("path_file_csv_input", ["waon"], indirect=["path_file_csv_input"])
@@ -0,0 +1,60 @@
+"""Tests for sharded_csv_converter.py."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+from zaimcsvconverter.csvconverter.csv_to_csv_converter import CsvToCsvConverter
+from zaimcsvconverter.csvconverter.sharded_csv_converter import ShardedCsvConverter
+from zaimcsvconverter.csvconverter.sharded_csv_converter import map_bounded
+from zaimcsvconverter.exceptions.invalid_input_csv_error import InvalidInputCsvError
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_map_bounded() -> None:
+    """Results should be yielded in order of iterable."""
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(map_bounded(executor, lambda item: item * 2, range(100), 3)) == [item * 2 for item in range(100)]
+
+
+class TestShardedCsvConverter:
+    """Tests for ShardedCsvConverter."""
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.parametrize("path_file_csv_input", ["waon"], indirect=["path_file_csv_input"])
+    @pytest.mark.parametrize("shard_size", [1, 2, 100])
+    @pytest.mark.usefixtures("_yaml_config_load", "database_session_basic_store_waon")
+    def test_invalid_record(path_file_csv_input: Path, tmp_path: Path, shard_size: int) -> None:
+        """Output and indices of invalid records should be same as the ones of converting without sharding."""
+        directory_expected = tmp_path / "expected"
+        directory_actual = tmp_path / "actual"
+        directory_expected.mkdir()
+        directory_actual.mkdir()
+        csv_to_csv_converter = CsvToCsvConverter(path_file_csv_input, directory_expected)
+        with pytest.raises(InvalidInputCsvError):
+            csv_to_csv_converter.execute()
+        expected = csv_to_csv_converter.convert_workflow.data_source
+        # Rows after invalid row should also be validated and converted.
+        assert list(expected.dictionary_invalid_record) == [1, 3]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            sharded_csv_converter = ShardedCsvConverter(
+                executor,
+                path_file_csv_input,
+                directory_actual,
+                shard_size=shard_size,
+            )
+            with pytest.raises(InvalidInputCsvError):
+                sharded_csv_converter.execute()
+        actual = sharded_csv_converter.convert_workflow.data_source
+        assert {index: list(map(str, errors)) for index, errors in actual.dictionary_invalid_record.items()} == {
+            index: list(map(str, errors)) for index, errors in expected.dictionary_invalid_record.items()
+        }
+        assert actual.undefined_content_error_handler.list_error == expected.undefined_content_error_handler.list_error
+        path_expected = directory_expected / path_file_csv_input.name
+        assert (directory_actual / path_file_csv_input.name).read_bytes() == path_expected.read_bytes()
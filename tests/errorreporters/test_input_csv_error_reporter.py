@@ -6,7 +6,6 @@ from typing import Generic
 import pytest
 
 from zaimcsvconverter.errorreporters.input_csv_error_reporter import DataSourceErrorReporterFactory
-from zaimcsvconverter.exceptions import InvalidCellError
 from zaimcsvconverter.inputtooutput.datasources import AbstractInputRecord
 from zaimcsvconverter.inputtooutput.datasources import DataSource
 from zaimcsvconverter.inputtooutput.datasources.csvfile.data import TypeVarInputRowData
@@ -26,9 +25,6 @@ class TestInputCsvErrorReporter:
             def __iter__(self) -> Generator[AbstractInputRecord, None, None]:
                 raise NotImplementedError
 
-            def mark_current_record_as_error(self, list_error: list[InvalidCellError]) -> None:
-                pass
-
             @property
             def is_invalid(self) -> bool:
                 return False
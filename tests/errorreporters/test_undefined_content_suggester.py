@@ -0,0 +1,53 @@
+"""Tests for undefined_content_suggester.py."""
+
+import pytest
+
+from zaimcsvconverter.errorreporters.undefined_content_suggester import NgramIndex
+from zaimcsvconverter.errorreporters.undefined_content_suggester import UndefinedContentSuggester
+
+
+class TestNgramIndex:
+    """Tests for NgramIndex."""
+
+    LIST_ROW: tuple[list[str], ...] = (
+        ["セブン－イレブン　東京駅店", "セブンイレブン"],  # noqa: RUF001
+        ["ローソン　東京駅店", "ローソン"],
+        ["セブン－イレブン　新宿店", "セブンイレブン"],  # noqa: RUF001
+        ["ＡＴＭ", "ATM"],  # noqa: RUF001
+    )
+
+    def test_search(self) -> None:
+        """Entries should be ordered by similarity, and former entry should come first when similarity is same."""
+        ngram_index = NgramIndex(list(self.LIST_ROW))
+        assert ngram_index.search("セブン－イレブン　品川駅店", 2) == [self.LIST_ROW[0], self.LIST_ROW[2]]  # noqa: RUF001
+        assert ngram_index.search("ローソン　新宿店", 1) == [self.LIST_ROW[1]]
+
+    def test_search_normalized(self) -> None:
+        """Full-width and half-width characters and cases should be matched."""
+        assert NgramIndex(list(self.LIST_ROW)).search("atm", 3) == [self.LIST_ROW[3]]
+
+    def test_search_not_found(self) -> None:
+        """Name which shares no n-gram should have no suggestion."""
+        assert NgramIndex(list(self.LIST_ROW)).search("ファミリーマート", 3) == []
+        assert NgramIndex([]).search("ファミリーマート", 3) == []
+
+
+class TestUndefinedContentSuggester:
+    """Tests for UndefinedContentSuggester."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session_stores_item")
+    def test_suggest() -> None:
+        """Suggestions should be rows of convert table CSV of same file."""
+        list_error = [["waon.csv", "イオン板橋", ""], ["mufg.csv", "板橋", ""], ["waon.csv", "未定義", ""]]
+        assert list(UndefinedContentSuggester().suggest(list_error)) == [
+            ["waon.csv", "イオン板橋", "", "板橋前野町,イオンスタイル　板橋前野町,,,,"],
+            ["mufg.csv", "板橋", ""],
+            ["waon.csv", "未定義", ""],
+        ]
+
+    @staticmethod
+    def test_suggest_disabled() -> None:
+        """Errors should be yielded as they are without loading convert tables when top k is 0."""
+        list_error = [["waon.csv", "イオン板橋", ""]]
+        assert list(UndefinedContentSuggester(0).suggest(list_error)) == list_error
@@ -7,8 +7,8 @@ import pytest
 from tests.testlibraries.assert_list import assert_each_properties
 from tests.testlibraries.instance_resource import InstanceResource
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.amazon import AmazonRow
-from zaimcsvconverter.models import Item
-from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import ItemValue
+from zaimcsvconverter.models import StoreValue
 
 
 class TestAmazonRow:
@@ -38,7 +38,7 @@ class TestAmazonRow:
         self.assert_store_and_item(amazon_row, store_name_zaim, item_name)
 
     def assert_store_and_item(self, amazon_row: AmazonRow, store_name_zaim: str, item_name: str) -> None:
-        assert isinstance(amazon_row.store, Store)
+        assert isinstance(amazon_row.store, StoreValue)
         assert amazon_row.store.name_zaim == store_name_zaim
-        assert isinstance(amazon_row.item, Item)
+        assert isinstance(amazon_row.item, ItemValue)
         assert amazon_row.item.name == item_name
@@ -8,8 +8,8 @@ from tests.testlibraries.instance_resource import InstanceResource
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.amazon_201911 import Amazon201911DiscountRow
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.amazon_201911 import Amazon201911PaymentRow
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.amazon_201911 import Amazon201911ShippingHandlingRow
-from zaimcsvconverter.models import Item
-from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import ItemValue
+from zaimcsvconverter.models import StoreValue
 
 
 class TestAmazon201911DiscountRow:
@@ -27,9 +27,9 @@ class TestAmazon201911DiscountRow:
         self.assert_store_and_item(amazon_row, store_name, item_name)
 
     def assert_store_and_item(self, amazon_row: Amazon201911DiscountRow, store_name: str, item_name: str) -> None:
-        assert isinstance(amazon_row.store, Store)
+        assert isinstance(amazon_row.store, StoreValue)
         assert amazon_row.store.name_zaim == store_name
-        assert isinstance(amazon_row.item, Item)
+        assert isinstance(amazon_row.item, ItemValue)
         assert amazon_row.item.name == item_name
 
     @staticmethod
@@ -78,9 +78,9 @@ class TestAmazon201911PaymentRow:
         self.assert_store_and_item(amazon_row, store_name, item_name)
 
     def assert_store_and_item(self, amazon_row: Amazon201911PaymentRow, store_name: str, item_name: str) -> None:
-        assert isinstance(amazon_row.store, Store)
+        assert isinstance(amazon_row.store, StoreValue)
         assert amazon_row.store.name_zaim == store_name
-        assert isinstance(amazon_row.item, Item)
+        assert isinstance(amazon_row.item, ItemValue)
         assert amazon_row.item.name == item_name
 
     @staticmethod
@@ -5,9 +5,12 @@ from datetime import datetime
 import pytest
 
 from tests.testlibraries.instance_resource import InstanceResource
+from zaimcsvconverter import CONFIG
+from zaimcsvconverter.config import StoreCategoryConfig
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
 from zaimcsvconverter.inputtooutput.datasources.csvfile.data.gold_point_card_plus import GoldPointCardPlusRowData
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.gold_point_card_plus import GoldPointCardPlusRow
-from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import StoreValue
 
 
 class TestGoldPointCardPlusRow:
@@ -73,8 +76,19 @@ class TestGoldPointCardPlusRow:
         expected_is_row_to_skip: bool,
     ) -> None:
         """Assert store and item."""
-        assert isinstance(row.store, Store)
+        assert isinstance(row.store, StoreValue)
         # pylint: disable=protected-access
         assert row.store.name == gold_point_card_plus_row_data.used_store
         assert row.store.name_zaim == expected_store_name_zaim
         assert row.is_row_to_skip == expected_is_row_to_skip
+
+    @staticmethod
+    @pytest.mark.usefixtures("_yaml_config_load", "database_session_stores_gold_point_card_plus")
+    def test_skip_store_category() -> None:
+        """Row should be skipped when store is classified into category to skip by configuration."""
+        CONFIG.store_categories = [StoreCategoryConfig("electricity", pattern="電気料金")]
+        CONFIG.gold_point_card_plus.skip_store_categories = ["electricity"]
+        CONVERT_TABLE_INDEX.configure(CONFIG.store_categories)
+        row = GoldPointCardPlusRow(InstanceResource.ROW_DATA_GOLD_POINT_CARD_PLUS_TOKYO_ELECTRIC)
+        assert row.store.categories == {"electricity"}
+        assert row.is_row_to_skip
@@ -11,7 +11,7 @@ from zaimcsvconverter.inputtooutput.datasources.csvfile.data.gold_point_card_plu
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.gold_point_card_plus_201912 import (
     GoldPointCardPlus201912Row,  # noqa: H301
 )
-from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import StoreValue
 
 
 class TestGoldPointCardPlus201912Row:
@@ -89,7 +89,7 @@ class TestGoldPointCardPlus201912Row:
         expected_is_row_to_skip: bool,
     ) -> None:
         """Assert store and item."""
-        assert isinstance(row.store, Store)
+        assert isinstance(row.store, StoreValue)
         # pylint: disable=protected-access
         assert row.store.name == gold_point_card_plus_201912_row_data.used_store
         assert row.store.name_zaim == expected_store_name_zaim
@@ -8,7 +8,7 @@ from tests.testlibraries.instance_resource import InstanceResource
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.mufg import MufgIncomeFromSelfRow
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.mufg import MufgPaymentToSelfRow
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.mufg import MufgStoreRow
-from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import StoreValue
 
 
 class TestMufgIncomeRow:
@@ -22,7 +22,7 @@ class TestMufgIncomeRow:
         mufg_row = MufgStoreRow(InstanceResource.ROW_DATA_MUFG_INCOME_CARD)
         # Reason: Time is not used in this process.
         assert mufg_row.date == datetime(2018, 10, 1, 0, 0, 0)  # noqa: DTZ001
-        assert isinstance(mufg_row.store, Store)
+        assert isinstance(mufg_row.store, StoreValue)
         assert mufg_row.store.name_zaim is None
 
 
@@ -37,7 +37,7 @@ class TestMufgPaymentRow:
         mufg_row = MufgStoreRow(InstanceResource.ROW_DATA_MUFG_PAYMENT)
         # Reason: Time is not used in this process.
         assert mufg_row.date == datetime(2018, 11, 5, 0, 0, 0)  # noqa: DTZ001
-        assert isinstance(mufg_row.store, Store)
+        assert isinstance(mufg_row.store, StoreValue)
         assert mufg_row.store.name_zaim is None
 
 
@@ -77,7 +77,7 @@ class TestMufgTransferIncomeRow:
         mufg_row = MufgStoreRow(InstanceResource.ROW_DATA_MUFG_TRANSFER_INCOME_NOT_OWN_ACCOUNT)
         # Reason: Time is not used in this process.
         assert mufg_row.date == datetime(2018, 8, 20, 0, 0, 0)  # noqa: DTZ001
-        assert isinstance(mufg_row.store, Store)
+        assert isinstance(mufg_row.store, StoreValue)
         assert mufg_row.store.name_zaim == store_name
 
 
@@ -93,5 +93,5 @@ class TestMufgTransferPaymentRow:
         mufg_row = MufgStoreRow(InstanceResource.ROW_DATA_MUFG_TRANSFER_PAYMENT_TOKYO_WATERWORKS)
         # Reason: Time is not used in this process.
         assert mufg_row.date == datetime(2018, 11, 28, 0, 0, 0)  # noqa: DTZ001
-        assert isinstance(mufg_row.store, Store)
+        assert isinstance(mufg_row.store, StoreValue)
         assert mufg_row.store.name_zaim == store_name
@@ -12,7 +12,7 @@ from zaimcsvconverter.inputtooutput.datasources.csvfile.data.sf_card_viewer impo
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.sf_card_viewer import SFCardViewerEnterExitRow
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.sf_card_viewer import SFCardViewerEnterRow
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.sf_card_viewer import SFCardViewerRow
-from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import StoreValue
 
 
 class TestSFCardViewerRow:
@@ -29,7 +29,7 @@ class TestSFCardViewerRow:
         )
         # Reason: Time is not used in this process.
         assert sf_card_viewer_row.date == datetime(2018, 11, 13, 0, 0, 0)  # noqa: DTZ001
-        assert isinstance(sf_card_viewer_row.store, Store)
+        assert isinstance(sf_card_viewer_row.store, StoreValue)
         assert sf_card_viewer_row.store.name_zaim == "東京地下鉄株式会社　南北線後楽園駅"
 
 
@@ -8,7 +8,7 @@ from tests.testlibraries.instance_resource import InstanceResource
 from zaimcsvconverter.inputtooutput.datasources.csvfile.data.view_card import ViewCardRowData
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.view_card import ViewCardNotStoreRow
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.view_card import ViewCardStoreRow
-from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import StoreValue
 
 
 class TestViewCardNotStoreRow:
@@ -92,7 +92,7 @@ class TestViewCardStoreRow:
         expected_is_row_to_skip: bool,
     ) -> None:
         """Assert store and item."""
-        assert isinstance(row.store, Store)
+        assert isinstance(row.store, StoreValue)
         # noinspection PyUnresolvedReferences
         assert row.store.name == view_card_row_data.used_place
         assert row.store.name_zaim == expected_store_name_zaim
@@ -10,7 +10,7 @@ from zaimcsvconverter.inputtooutput.datasources.csvfile.data.waon import WaonRow
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.waon import WaonChargeRow
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.waon import WaonRowToSkip
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records.waon import WaonStoreRow
-from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import StoreValue
 
 
 class TestWaonRow:
@@ -59,7 +59,7 @@ class TestWaonRow:
         expected_amount: int,
     ) -> None:
         """Assert store and item."""
-        assert isinstance(waon_row.store, Store)
+        assert isinstance(waon_row.store, StoreValue)
         assert waon_row.store.name_zaim == expected_store_name_zaim
         assert waon_row.used_amount == expected_amount
 
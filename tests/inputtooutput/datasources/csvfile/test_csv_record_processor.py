@@ -7,6 +7,9 @@ from zaimcsvconverter.accounts.enum import Account
 from zaimcsvconverter.exceptions import InvalidRecordError
 from zaimcsvconverter.inputtooutput.datasources.csvfile.csv_record_processor import CsvRecordProcessor
 from zaimcsvconverter.inputtooutput.datasources.csvfile.data import RowDataFactory
+from zaimcsvconverter.models import FileCsvConvertId
+from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import StoreValue
 
 
 class TestCsvRecordProcessor:
@@ -38,3 +41,33 @@ class TestCsvRecordProcessor:
         assert len(exception.list_error) == 1
         assert str(exception.list_error[0]) == "Charge kind in charge row is required. Charge kind = -"
         assert not exception.undefined_content_error_handler.is_presented
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "database_session_with_schema",
+        [[InstanceResource.FIXTURE_RECORD_STORE_WAON_ITABASHIMAENOCHO]],
+        indirect=["database_session_with_schema"],
+    )
+    @pytest.mark.usefixtures("_yaml_config_load", "database_session_with_schema")
+    def test_prefetch_undefined(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Name which prefetch has resolved as undefined should be reported without finding it again."""
+        account_context = Account.WAON.value
+        csv_record_processor = CsvRecordProcessor(account_context.input_row_factory)
+        input_record = csv_record_processor.create_input_row_instance(
+            RowDataFactory(account_context.input_row_data_class).create(
+                ["2018/08/07", "上尾", "129円", "支払", "-"],
+            ),
+        )
+        csv_record_processor.prefetch([input_record])
+        list_name_found: list[str] = []
+        try_to_find = Store.try_to_find
+
+        def spy(file_csv_convert_id: FileCsvConvertId, name: str) -> StoreValue:
+            list_name_found.append(name)
+            return try_to_find(file_csv_convert_id, name)
+
+        monkeypatch.setattr(Store, "try_to_find", spy)
+        with pytest.raises(InvalidRecordError) as excinfo:
+            csv_record_processor.check(input_record)
+        assert excinfo.value.undefined_content_error_handler.is_presented
+        assert list_name_found == []
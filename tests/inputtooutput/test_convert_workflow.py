@@ -1,5 +1,6 @@
 """Tests for input_csv.py."""
 
+import asyncio
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
@@ -12,7 +13,9 @@ from zaimcsvconverter.exceptions import InvalidCellError
 from zaimcsvconverter.exceptions.invalid_input_csv_error import InvalidInputCsvError
 from zaimcsvconverter.first_form_normalizer import FirstFormNormalizer
 from zaimcsvconverter.inputtooutput.convert_workflow import ConvertWorkflow
+from zaimcsvconverter.inputtooutput.convert_workflow import PipelinedConvertWorkflow
 from zaimcsvconverter.inputtooutput.converters.recordtozaim.record_to_zaim_converter import RecordToZaimConverter
+from zaimcsvconverter.inputtooutput.datasources import DataSource
 from zaimcsvconverter.inputtooutput.datasources.csvfile.csv_file import Csv
 from zaimcsvconverter.inputtooutput.datasources.csvfile.csv_record_processor import CsvRecordProcessor
 from zaimcsvconverter.inputtooutput.exporters.zaim.csvfile.zaim_csv_output_exporter import ZaimCsvOutputModelExporter
@@ -29,8 +32,14 @@ class TestConvertWorkflow:
         [([InstanceResource.FIXTURE_RECORD_STORE_WAON_ITABASHIMAENOCHO], "waon")],
         indirect=["database_session_with_schema", "path_file_csv_input"],
     )
+    @pytest.mark.parametrize("convert_workflow_class", [ConvertWorkflow, PipelinedConvertWorkflow])
     @pytest.mark.usefixtures("_yaml_config_load", "database_session_with_schema")
-    def test(self, path_file_csv_input: Path, tmp_path: Path) -> None:
+    def test(
+        self,
+        path_file_csv_input: Path,
+        tmp_path: Path,
+        convert_workflow_class: type[ConvertWorkflow[Any]],
+    ) -> None:
         """Tests following:
 
         - InvalidInputCsvError should be raised
@@ -41,6 +50,37 @@ class TestConvertWorkflow:
           when there are record having store name which there are no data in convert table.
         - Undefined content error handler should be empty.
         """
+        data_source, convert_workflow = self.create_convert_workflow(
+            convert_workflow_class,
+            path_file_csv_input,
+            tmp_path,
+        )
+        with pytest.raises(InvalidInputCsvError) as error:
+            convert_workflow.execute()
+        self.assert_error(error.value, path_file_csv_input)
+        self.assert_data_source(data_source)
+
+    @pytest.mark.parametrize(
+        ("database_session_with_schema", "path_file_csv_input"),
+        [([InstanceResource.FIXTURE_RECORD_STORE_WAON_ITABASHIMAENOCHO], "waon")],
+        indirect=["database_session_with_schema", "path_file_csv_input"],
+    )
+    @pytest.mark.parametrize("chunk_size", [1, DataSource.DEFAULT_CHUNK_SIZE])
+    @pytest.mark.usefixtures("_yaml_config_load", "database_session_with_schema")
+    def test_aexecute(self, path_file_csv_input: Path, tmp_path: Path, chunk_size: int) -> None:
+        """Asynchronous execution should raise same error and store same invalid records as synchronous one."""
+        data_source, convert_workflow = self.create_convert_workflow(ConvertWorkflow, path_file_csv_input, tmp_path)
+        with pytest.raises(InvalidInputCsvError) as error:
+            asyncio.run(convert_workflow.aexecute(chunk_size))
+        self.assert_error(error.value, path_file_csv_input)
+        self.assert_data_source(data_source)
+
+    @staticmethod
+    def create_convert_workflow(
+        convert_workflow_class: type[ConvertWorkflow[Any]],
+        path_file_csv_input: Path,
+        tmp_path: Path,
+    ) -> tuple[Csv[Any, Any], ConvertWorkflow[Any]]:
         account_context: AccountContext[Any, Any] = Account.create_by_path_csv_input(path_file_csv_input).value
         god_slayer = account_context.god_slayer_factory.create(path_file_csv_input)
         first_form_normalizer = FirstFormNormalizer(god_slayer, account_context.input_row_data_class)
@@ -48,14 +88,14 @@ class TestConvertWorkflow:
         data_source = Csv(first_form_normalizer, csv_record_processor)
         record_converter = RecordToZaimConverter(account_context.zaim_row_converter_factory, path_file_csv_input)
         output_model_exporter = ZaimCsvOutputModelExporter(tmp_path / "test.csv")
-        convert_workflow = ConvertWorkflow(data_source, record_converter, output_model_exporter)
-        with pytest.raises(InvalidInputCsvError) as error:
-            convert_workflow.execute()
-        assert str(error.value) == (
-            "Undefined store or item name in convert table CSV exists in test_waon.csv. "
+        return data_source, convert_workflow_class(data_source, record_converter, output_model_exporter)
+
+    @staticmethod
+    def assert_error(error: InvalidInputCsvError, path_file_csv_input: Path) -> None:
+        assert str(error) == (
+            f"Undefined store or item name in convert table CSV exists in {path_file_csv_input.name}. "
             "Please check property AccountCsvConverter.list_undefined_store."
         )
-        self.assert_data_source(data_source)
 
     def assert_data_source(self, data_source: Csv[Any, Any]) -> None:
         assert data_source.is_invalid
@@ -0,0 +1,49 @@
+"""Tests for pipeline.py."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from zaimcsvconverter.inputtooutput.pipeline import ThreadStage
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+class TestThreadStage:
+    """Tests for ThreadStage."""
+
+    @staticmethod
+    def test_order() -> None:
+        """Stages should keep order of items and drop None."""
+        stage_read = ThreadStage(range(1000), 2)
+        stage_process = ThreadStage.map(lambda item: None if item % 3 == 0 else item * 2, stage_read, 2)
+        assert list(stage_process) == [item * 2 for item in range(1000) if item % 3 != 0]
+
+    @staticmethod
+    def test_exception() -> None:
+        """Exception raised in upstream stage should be raised in downstream."""
+
+        def generate() -> Generator[int, None, None]:
+            yield 1
+            msg = "Invalid row."
+            raise ValueError(msg)
+
+        stage_process = ThreadStage.map(lambda item: item, ThreadStage(generate(), 1), 1)
+        iterator = iter(stage_process)
+        assert next(iterator) == 1
+        with pytest.raises(ValueError, match=r"Invalid row\."):
+            next(iterator)
+
+    @staticmethod
+    def test_stop() -> None:
+        """Upstream stages should stop when downstream stops iterating."""
+        stage_read = ThreadStage(range(1_000_000), 1)
+        stage_process = ThreadStage.map(lambda item: item, stage_read, 1)
+        for item in stage_process:
+            if item == 1:
+                break
+        assert not stage_process.thread.is_alive()
+        assert not stage_read.thread.is_alive()
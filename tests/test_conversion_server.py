@@ -0,0 +1,109 @@
+"""Tests for conversion_server.py."""
+
+from __future__ import annotations
+
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Thread
+from typing import TYPE_CHECKING
+from typing import Any
+from urllib.error import HTTPError
+from urllib.request import Request
+from urllib.request import urlopen
+
+import pytest
+
+from zaimcsvconverter.conversion_server import ConversionServer
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+CSV_WAON = """取引年月日,利用店舗,利用金額（税込）,利用区分,チャージ区分
+2018/8/30,板橋前野町,"1,489円",支払,-
+""".encode()  # noqa: RUF001
+
+CSV_WAON_UNDEFINED_STORE = """取引年月日,利用店舗,利用金額（税込）,利用区分,チャージ区分
+2018/8/30,マクドナルド津田沼駅前店,"1,489円",支払,-
+""".encode()  # noqa: RUF001
+
+
+@pytest.fixture
+def url_server(resource_path_root: Path, tmp_path: Path) -> Generator[str, None, None]:
+    """Start server on free port with copy of convert table CSV since cache of convert tables is saved beside it."""
+    shutil.copytree(resource_path_root / "test_conversion_server", tmp_path, dirs_exist_ok=True)
+    server = ConversionServer(("127.0.0.1", 0), resource_path_root / "config.yml.dist", tmp_path / "csvconverttable")
+    thread = Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01})
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def post(url: str, body: bytes) -> tuple[int, bytes]:
+    """Post body and return status and body of response."""
+    # Reason: URL is built by test. nosec B310
+    request = Request(url, data=body, method="POST")  # noqa: S310
+    try:
+        with urlopen(request) as response:  # noqa: S310 # nosec B310
+            return response.status, response.read()
+    except HTTPError as error:
+        return error.code, error.read()
+
+
+def load_json(body: bytes) -> Any:  # noqa: ANN401
+    return json.loads(body.decode("UTF-8"))
+
+
+class TestConversionServer:
+    """Tests for ConversionServer."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    @pytest.mark.parametrize("query", ["account=waon", "file_name=waon201808.csv"])
+    def test_success(url_server: str, query: str) -> None:
+        """Uploaded account CSV should be converted into Zaim CSV."""
+        status, body = post(f"{url_server}/convert?{query}", CSV_WAON)
+        assert status == HTTPStatus.OK
+        list_row = body.decode("UTF-8").splitlines()
+        assert list_row[0].startswith("日付,方法,カテゴリ")
+        assert "イオンスタイル　板橋前野町" in list_row[1]
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_concurrent(url_server: str) -> None:
+        """Requests should be handled concurrently with shared convert tables."""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list_result = list(executor.map(lambda _: post(f"{url_server}/convert?account=waon", CSV_WAON), range(8)))
+        assert {status for status, _ in list_result} == {HTTPStatus.OK}
+        assert len({body for _, body in list_result}) == 1
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_invalid(url_server: str) -> None:
+        """Errors should be returned as JSON when uploaded account CSV is invalid."""
+        status, body = post(f"{url_server}/convert?file_name=waon201808.csv", CSV_WAON_UNDEFINED_STORE)
+        assert status == HTTPStatus.UNPROCESSABLE_ENTITY
+        error = load_json(body)
+        assert [row[:2] for row in error["error_invalid_row"]] == [["waon201808.csv", 0]]
+        assert error["error_undefined_content"] == [["waon.csv", "マクドナルド津田沼駅前店", ""]]
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    @pytest.mark.parametrize(
+        ("path", "expected_status"),
+        [
+            ("/convert?account=unknown", HTTPStatus.BAD_REQUEST),
+            ("/convert?file_name=unknown.csv", HTTPStatus.BAD_REQUEST),
+            ("/convert", HTTPStatus.BAD_REQUEST),
+            ("/unknown?account=waon", HTTPStatus.NOT_FOUND),
+        ],
+    )
+    def test_bad_request(url_server: str, path: str, expected_status: HTTPStatus) -> None:
+        """Error message should be returned when request is invalid."""
+        status, body = post(f"{url_server}{path}", CSV_WAON)
+        assert status == expected_status
+        assert "message" in load_json(body)
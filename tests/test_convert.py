@@ -0,0 +1,55 @@
+"""Tests for convert.py."""
+
+from __future__ import annotations
+
+import pytest
+
+from convert import create_parser
+from convert import validate
+
+
+class TestValidate:
+    """Tests for validate()."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("argv", "expected"),
+        [
+            (["--parallel", "--shard-size", "100"], "--parallel and --shard-size can't be used together"),
+            (["--batch", "a", "--shard-size", "100"], "--batch and --shard-size can't be used together"),
+            (["--watch", "--parallel"], "--watch and --parallel can't be used together"),
+            (["--watch", "--merge", "also"], "--watch and --merge can't be used together"),
+            (["--watch", "--incremental"], "--watch and --incremental can't be used together"),
+            (["--watch", "--shard-size", "100"], "--watch and --shard-size can't be used together"),
+            (["--serve", "--pipelined"], "--serve and --pipelined can't be used together"),
+            (["--serve", "--max-workers", "2"], "--serve and --max-workers can't be used together"),
+            (["--serve", "--spool", "worker"], "--serve and --spool can't be used together"),
+            (["--serve", "--compact"], "--serve and --compact can't be used together"),
+            (["--spool", "worker", "--merge", "instead"], "--spool and --merge can't be used together"),
+            (["--spool", "report", "--incremental"], "--spool and --incremental can't be used together"),
+        ],
+    )
+    def test_conflicted(argv: list[str], expected: str, capsys: pytest.CaptureFixture[str]) -> None:
+        """Options which can't be used together should exit with usage."""
+        parser = create_parser()
+        with pytest.raises(SystemExit) as excinfo:
+            validate(parser, parser.parse_args(argv))
+        assert excinfo.value.code == 2  # noqa: PLR2004
+        assert expected in capsys.readouterr().err
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            [],
+            ["--parallel", "--merge", "instead", "--incremental"],
+            ["--shard-size", "100", "--pipelined"],
+            ["--watch", "--pipelined", "--interval", "0.5"],
+            ["--serve", "--host", "localhost", "--port", "8080"],
+            ["--spool", "worker", "--pipelined", "--lease-seconds", "60"],
+        ],
+    )
+    def test_valid(argv: list[str]) -> None:
+        """Options which can be used together should pass."""
+        parser = create_parser()
+        validate(parser, parser.parse_args(argv))
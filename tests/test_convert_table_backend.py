@@ -0,0 +1,315 @@
+"""Tests for convert_table_backend.py."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import NoResultFound
+
+from zaimcsvconverter import Session
+from zaimcsvconverter.config import ConvertTableBackendConfig
+from zaimcsvconverter.convert_table_backend import ConvertTableBackend
+from zaimcsvconverter.convert_table_backend import ConvertTableBackendFactory
+from zaimcsvconverter.convert_table_backend import ConvertTableBackendKind
+from zaimcsvconverter.convert_table_backend import DictConvertTableBackend
+from zaimcsvconverter.convert_table_backend import IndexedConvertTable
+from zaimcsvconverter.convert_table_backend import LruCache
+from zaimcsvconverter.convert_table_backend import SqliteConvertTableBackend
+from zaimcsvconverter.convert_table_backend import SqliteFileConvertTableBackend
+from zaimcsvconverter.convert_table_importer import ConvertTableImporter
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.models import Base
+from zaimcsvconverter.models import FileCsvConvertId
+from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import StoreRowData
+from zaimcsvconverter.models import StoreValue
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+    from sqlalchemy.orm.session import Session as SQLAlchemySession
+
+
+def save_stores_for_conformance() -> None:
+    """Save stores which conformance tests of backends look up, as if they have been imported from CSV."""
+    stores = [
+        Store(FileCsvConvertId.GOLD_POINT_CARD_PLUS, StoreRowData(name, name_zaim))
+        for name, name_zaim in [
+            ("prefix:ＡＴＭ", "ATM"),  # noqa: RUF001
+            ("ＡＴＭ　手数料", "fee"),  # noqa: RUF001
+            ("regex:.*駅", "station"),
+            ("セブンーイレブン", "7-Eleven"),
+            ("ＡＭＡＺＯＮ．ＣＯ．ＪＰ", "Amazon"),  # noqa: RUF001
+            ("本人*", "literal asterisk"),
+            ("/東京/", "literal slash"),
+        ]
+    ]
+    for store in stores:
+        store.source = "gold_point_card_plus.csv"
+    Store.save_all(stores)
+
+
+@pytest.fixture(params=[kind.value for kind in ConvertTableBackendKind])
+def convert_table_backend(
+    request: pytest.FixtureRequest,
+    tmp_path: Path,
+    database_session: SQLAlchemySession,  # noqa: ARG001
+) -> Generator[ConvertTableBackend[Any], None, None]:
+    """Select backend of each kind and save convert table into its database."""
+    convert_table_backend = ConvertTableBackendFactory.create(
+        ConvertTableBackendConfig(request.param, str(tmp_path), 2),
+    )
+    CONVERT_TABLE_INDEX.use(convert_table_backend)
+    try:
+        Base.metadata.create_all(Session.get_bind())
+        save_stores_for_conformance()
+        yield convert_table_backend
+    finally:
+        CONVERT_TABLE_INDEX.use(DictConvertTableBackend())
+
+
+class TestConvertTableBackend:
+    """Conformance tests which every backend of convert tables should pass."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("convert_table_backend")
+    def test_find() -> None:
+        """Only exact name should be found."""
+        for _ in range(2):
+            assert Store.find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "セブンーイレブン").name_zaim == "7-Eleven"
+            with pytest.raises(NoResultFound):
+                Store.find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "セブン−イレブン")  # noqa: RUF001
+            with pytest.raises(NoResultFound):
+                Store.find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "ＡＴＭ　セブン")  # noqa: RUF001
+            with pytest.raises(NoResultFound):
+                Store.find(FileCsvConvertId.WAON, "セブンーイレブン")
+
+    @staticmethod
+    @pytest.mark.usefixtures("convert_table_backend")
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("セブンーイレブン", "7-Eleven"),
+            ("セブン−イレブン", "7-Eleven"),  # noqa: RUF001
+            ("ＡＴＭ　手数料", "fee"),  # noqa: RUF001
+            ("ＡＴＭ　セブン", "ATM"),  # noqa: RUF001
+            ("東京駅", "station"),
+            ("東京", None),
+            ("本人*", "literal asterisk"),
+            ("本人カード", None),
+            ("/東京/", "literal slash"),
+        ],
+    )
+    def test_try_to_find(name: str, expected: str | None) -> None:
+        """Exact name, normalized name, prefix rule and regular expression rule should be found in this order.
+
+        Names without marker should match exactly even if they end with "*" or are enclosed by "/".
+        """
+        for _ in range(2):
+            if expected is None:
+                with pytest.raises(NoResultFound):
+                    Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, name)
+            else:
+                assert Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, name).name_zaim == expected
+            with pytest.raises(NoResultFound):
+                Store.try_to_find(FileCsvConvertId.WAON, name)
+
+    @staticmethod
+    def test_try_to_find_all(convert_table_backend: ConvertTableBackend[Any]) -> None:
+        """Distinct names should be found at once, and value should be None when name isn't defined."""
+        dictionary_value = convert_table_backend.try_to_find_all(
+            Store,
+            FileCsvConvertId.GOLD_POINT_CARD_PLUS.value,
+            ["東京駅", "東京", "東京駅"],
+        )
+        assert {name: None if value is None else value.name_zaim for name, value in dictionary_value.items()} == {
+            "東京駅": "station",
+            "東京": None,
+        }
+
+    @staticmethod
+    @pytest.mark.usefixtures("convert_table_backend")
+    def test_try_to_find_concurrently() -> None:
+        """Threads which share connection to in-memory database should find names at once."""
+
+        def try_to_find(name: str) -> str | None:
+            try:
+                return Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, name).name_zaim
+            finally:
+                Session.remove()
+
+        list_name = ["セブン−イレブン", "ＡＴＭ　セブン", "東京駅", "ＡＴＭ　手数料"] * 64  # noqa: RUF001
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert list(executor.map(try_to_find, list_name)) == ["7-Eleven", "ATM", "station", "fee"] * 64
+
+    @staticmethod
+    @pytest.mark.usefixtures("convert_table_backend")
+    def test_value() -> None:
+        """Immutable value which store is classified into categories should be returned."""
+        store = Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "ＡＭＡＺＯＮ．ＣＯ．ＪＰ")  # noqa: RUF001
+        assert isinstance(store, StoreValue)
+        assert store.is_amazon
+        with pytest.raises(FrozenInstanceError):
+            # Reason: To test immutability. pylint: disable-next=assigning-non-slot
+            store.name_zaim = "Amazon.co.jp"  # type: ignore[misc]
+
+    @staticmethod
+    @pytest.mark.usefixtures("convert_table_backend")
+    def test_replace_all() -> None:
+        """Change of convert table should be reflected in lookup."""
+        assert Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "ＡＴＭ　セブン").name_zaim == "ATM"  # noqa: RUF001
+        Store.replace_all(
+            FileCsvConvertId.GOLD_POINT_CARD_PLUS,
+            [Store(FileCsvConvertId.GOLD_POINT_CARD_PLUS, StoreRowData("ＡＴＭ　セブン", "Seven Bank"))],  # noqa: RUF001
+        )
+        assert Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "ＡＴＭ　セブン").name_zaim == "Seven Bank"  # noqa: RUF001
+        with pytest.raises(NoResultFound):
+            Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "東京駅")
+
+    @staticmethod
+    @pytest.mark.usefixtures("convert_table_backend")
+    def test_reload(tmp_path: Path) -> None:
+        """Difference of reloaded convert table CSV should be reflected in lookup even after lookup is cached."""
+        assert Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "東京駅").name_zaim == "station"
+        with pytest.raises(NoResultFound):
+            Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "東京")
+        path = tmp_path / "gold_point_card_plus.csv"
+        path.write_text(
+            "prefix:ＡＴＭ,ATM\nＡＴＭ　手数料,commission\nregex:.*駅,station\nＡＭＡＺＯＮ．ＣＯ．ＪＰ,Amazon\n東京,Tokyo\n",  # noqa: RUF001
+            encoding="UTF-8",
+        )
+        ConvertTableImporter.reload(path)
+        assert Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "東京").name_zaim == "Tokyo"
+        assert Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "ＡＴＭ　手数料").name_zaim == "commission"  # noqa: RUF001
+        with pytest.raises(NoResultFound):
+            Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "セブン−イレブン")  # noqa: RUF001
+        path.write_text("regex:.*駅前,station\n", encoding="UTF-8")
+        ConvertTableImporter.reload(path)
+        with pytest.raises(NoResultFound):
+            Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "東京駅")
+        assert Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "東京駅前").name_zaim == "station"
+
+
+class TestLruCache:
+    """Tests for LruCache."""
+
+    @staticmethod
+    def test_put() -> None:
+        """Least recently used entry should be discarded when cache is full, and None should be cached."""
+        lru_cache = LruCache(2)
+        lru_cache.put("a", None)
+        lru_cache.put("b", 2)
+        assert lru_cache.get("a") is None
+        lru_cache.put("c", 3)
+        assert lru_cache.get("b") is LruCache.MISSING
+        assert lru_cache.get("a") is None
+        assert lru_cache.get("c") == 3  # noqa: PLR2004
+        assert len(lru_cache) == 2  # noqa: PLR2004
+
+    @staticmethod
+    def test_put_disabled() -> None:
+        """Nothing should be cached when max size is 0."""
+        lru_cache = LruCache(0)
+        lru_cache.put("a", 1)
+        assert lru_cache.get("a") is LruCache.MISSING
+
+
+class TestSqliteFileConvertTableBackend:
+    """Tests for SqliteFileConvertTableBackend."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_use(tmp_path: Path) -> None:
+        """Database file should be in WAL mode, then be removed and previous engine should be bound again."""
+        engine = Session.get_bind()
+        sqlite_file_convert_table_backend = SqliteFileConvertTableBackend(tmp_path)
+        CONVERT_TABLE_INDEX.use(sqlite_file_convert_table_backend)
+        try:
+            assert Session.get_bind() is sqlite_file_convert_table_backend.engine
+            assert Session().execute(text("PRAGMA journal_mode")).scalar_one() == "wal"
+            assert sqlite_file_convert_table_backend.path.parent == tmp_path
+        finally:
+            CONVERT_TABLE_INDEX.use(DictConvertTableBackend())
+        assert Session.get_bind() is engine
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestConvertTableBackendFactory:
+    """Tests for ConvertTableBackendFactory."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("kind", "expected"),
+        [
+            ("dict", DictConvertTableBackend),
+            ("sqlite_memory", SqliteConvertTableBackend),
+            ("sqlite_file", SqliteFileConvertTableBackend),
+        ],
+    )
+    def test_create(tmp_path: Path, kind: str, expected: type[ConvertTableBackend[Any]]) -> None:
+        """Backend of kind in configuration should be created."""
+        convert_table_backend = ConvertTableBackendFactory.create(ConvertTableBackendConfig(kind, str(tmp_path)))
+        assert type(convert_table_backend) is expected
+        convert_table_backend.close()
+
+    @staticmethod
+    def test_create_invalid() -> None:
+        """Unknown kind should raise error."""
+        with pytest.raises(ValueError, match="'redis' is not a valid ConvertTableBackendKind"):
+            ConvertTableBackendFactory.create(ConvertTableBackendConfig("redis"))
+
+
+class TestIndexedConvertTable:
+    """Tests for IndexedConvertTable."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("list_name", "name", "expected"),
+        [
+            (["ファミリーマート"], "ファミリーマート", "ファミリーマート"),
+            (["ファミリーマート"], "ファミリ−マート", "ファミリーマート"),  # noqa: RUF001
+            (["ファミリ−マート"], "ファミリ−マート", "ファミリ−マート"),  # noqa: RUF001
+            (["ファミリ−マート"], "ファミリーマート", None),  # noqa: RUF001
+            (["ファミリ−マート", "ファミリーマート"], "ファミリ−マート", "ファミリ−マート"),  # noqa: RUF001
+            (["ファミリ−マート", "ファミリーマート"], "ファミリーマート", "ファミリーマート"),  # noqa: RUF001
+            (["ファミリーマート"], "セブン−イレブン", None),  # noqa: RUF001
+        ],
+    )
+    def test_try_to_find(list_name: list[str], name: str, expected: str | None) -> None:
+        """Name should be found as same as looking up by name, then by name normalized for Shift JIS."""
+        indexed_convert_table = IndexedConvertTable(
+            StoreValue(FileCsvConvertId.WAON.value, name_store) for name_store in list_name
+        )
+        for _ in range(2):
+            store = indexed_convert_table.try_to_find(FileCsvConvertId.WAON.value, name)
+            assert (None if store is None else store.name) == expected
+        assert indexed_convert_table.try_to_find(FileCsvConvertId.MUFG.value, name) is None
+        assert ((FileCsvConvertId.WAON.value, name) in indexed_convert_table.set_undefined) == (expected is None)
+
+    @staticmethod
+    def test_try_to_find_pattern() -> None:
+        """Exact name should take priority over rules, and rules should be separated by convert table CSV."""
+        indexed_convert_table = IndexedConvertTable(
+            [
+                StoreValue(FileCsvConvertId.SBI_SUMISHIN_NET_BANK.value, "prefix:ＡＴＭ", name_zaim="ATM"),  # noqa: RUF001
+                StoreValue(FileCsvConvertId.SBI_SUMISHIN_NET_BANK.value, "ＡＴＭ　手数料", name_zaim="fee"),  # noqa: RUF001
+                StoreValue(FileCsvConvertId.SF_CARD_VIEWER.value, "regex:.*ー.*", name_zaim="station"),
+            ],
+        )
+        for _ in range(2):
+            store = indexed_convert_table.try_to_find(FileCsvConvertId.SBI_SUMISHIN_NET_BANK.value, "ＡＴＭ　セブン")  # noqa: RUF001
+            assert store is not None
+            assert store.name_zaim == "ATM"
+        store = indexed_convert_table.try_to_find(FileCsvConvertId.SBI_SUMISHIN_NET_BANK.value, "ＡＴＭ　手数料")  # noqa: RUF001
+        assert store is not None
+        assert store.name_zaim == "fee"
+        assert indexed_convert_table.try_to_find(FileCsvConvertId.MUFG.value, "ＡＴＭ　セブン") is None  # noqa: RUF001
+        store = indexed_convert_table.try_to_find(FileCsvConvertId.SF_CARD_VIEWER.value, "セブン−イレブン")  # noqa: RUF001
+        assert store is not None
+        assert store.name_zaim == "station"
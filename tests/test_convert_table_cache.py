@@ -0,0 +1,84 @@
+"""Tests for convert_table_cache.py."""
+
+from __future__ import annotations
+
+import shutil
+from typing import TYPE_CHECKING
+
+import pytest
+
+from zaimcsvconverter.convert_table_cache import ConvertTableCache
+from zaimcsvconverter.convert_table_importer import ConvertTableImporter
+from zaimcsvconverter.models import FileCsvConvertId
+from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import initialize_database
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestConvertTableCache:
+    """Tests for ConvertTableCache."""
+
+    @pytest.fixture
+    def directory_csv_convert(self, resource_path_root: Path, tmp_path: Path) -> Path:
+        """Prepare copy of convert table CSV files."""
+        directory_csv_convert = tmp_path / "csvconverttable"
+        shutil.copytree(
+            resource_path_root / "test_zaim_csv_converter_watcher" / "csvconverttable",
+            directory_csv_convert,
+        )
+        return directory_csv_convert
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_execute(directory_csv_convert: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Convert tables should be imported from cache until convert table CSV is changed."""
+        initialize_database()
+        assert not ConvertTableCache(directory_csv_convert).execute()
+        assert TestConvertTableCache.find_name_zaim() == "イオンスタイル　板橋前野町"
+        with monkeypatch.context() as context:
+            context.setattr(ConvertTableImporter, "execute_all", TestConvertTableCache.fail)
+            initialize_database()
+            assert ConvertTableCache(directory_csv_convert).execute()
+            assert TestConvertTableCache.find_name_zaim() == "イオンスタイル　板橋前野町"
+        path_csv_convert = directory_csv_convert / "waon.csv"
+        path_csv_convert.write_text(
+            path_csv_convert.read_text("UTF-8").replace("イオンスタイル　板橋前野町", "イオン板橋前野町店"),
+            encoding="UTF-8",
+        )
+        initialize_database()
+        assert not ConvertTableCache(directory_csv_convert).execute()
+        assert TestConvertTableCache.find_name_zaim() == "イオン板橋前野町店"
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_execute_source_changed(directory_csv_convert: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Cache should be ignored when source code of this package is changed."""
+        initialize_database()
+        assert not ConvertTableCache(directory_csv_convert).execute()
+        monkeypatch.setattr("zaimcsvconverter.convert_table_cache.hash_package_source", lambda: "changed")
+        initialize_database()
+        assert not ConvertTableCache(directory_csv_convert).execute()
+        assert TestConvertTableCache.find_name_zaim() == "イオンスタイル　板橋前野町"
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_execute_broken(directory_csv_convert: Path) -> None:
+        """Broken cache should be ignored and saved again."""
+        (directory_csv_convert / ConvertTableCache.FILE_NAME).write_bytes(b"broken")
+        initialize_database()
+        assert not ConvertTableCache(directory_csv_convert).execute()
+        assert TestConvertTableCache.find_name_zaim() == "イオンスタイル　板橋前野町"
+        initialize_database()
+        assert ConvertTableCache(directory_csv_convert).execute()
+        assert TestConvertTableCache.find_name_zaim() == "イオンスタイル　板橋前野町"
+
+    @staticmethod
+    def find_name_zaim() -> str | None:
+        return Store.try_to_find(FileCsvConvertId.WAON, "板橋前野町").name_zaim
+
+    @staticmethod
+    def fail(directory_csv_convert: Path) -> None:
+        msg = f"Convert tables should not be imported: {directory_csv_convert}"
+        raise AssertionError(msg)
@@ -0,0 +1,138 @@
+"""Tests for convert_table_compactor.py."""
+
+from __future__ import annotations
+
+import csv
+import shutil
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tests.testlibraries.instance_resource import InstanceResource
+from zaimcsvconverter import CONFIG
+from zaimcsvconverter import Session
+from zaimcsvconverter.convert_table_backend import DictConvertTableBackend
+from zaimcsvconverter.convert_table_compactor import ConvertTableCompactor
+from zaimcsvconverter.convert_table_compactor import ExternalSorter
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.models import FileCsvConvertId
+from zaimcsvconverter.models import Store
+from zaimcsvconverter.workspace import Workspace
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+
+class TestExternalSorter:
+    """Tests for ExternalSorter."""
+
+    @staticmethod
+    def test_sort(tmp_path: Path) -> None:
+        """Items should be sorted across chunks, and files of chunks should be removed."""
+        external_sorter = ExternalSorter(tmp_path, chunk_size=3)
+        list_item = [[i % 4, str(i)] for i in reversed(range(10))]
+        assert list(external_sorter.sort(list_item, key=lambda item: (item[0], item[1]))) == sorted(list_item)
+        assert list(tmp_path.iterdir()) == []
+
+
+@pytest.fixture
+def workspace(resource_path_root: Path, tmp_path: Path) -> Generator[Workspace, None, None]:
+    """Workspace which has input CSV of WAON."""
+    workspace = Workspace.create(tmp_path)
+    shutil.copy(resource_path_root / "config.yml.dist", workspace.path_file_config)
+    shutil.copytree(resource_path_root / "test_spool_worker" / "csvinput", workspace.directory_csv_input)
+    workspace.directory_csv_convert.mkdir()
+    workspace.directory_csv_output.mkdir()
+    yield workspace
+    CONVERT_TABLE_INDEX.use(DictConvertTableBackend())
+
+
+class TestConvertTableCompactor:
+    """Tests for ConvertTableCompactor."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_execute(workspace: Workspace) -> None:
+        """Duplicated rows should be removed, near-duplicated names and unused entries should be reported."""
+        (workspace.directory_csv_convert / "waon.csv").write_text(
+            "板橋前野町,イオンスタイル　板橋前野町,食費,食料品,\n"
+            "ATM,ATM,,,\n"
+            "\n"
+            "板橋前野町,イオンスタイル　板橋前野町,食費,食料品,\n"
+            "ＡＴＭ,ATM,,,\n"  # noqa: RUF001
+            "ＡＴＭ,ATM,,,\n",  # noqa: RUF001
+            encoding="UTF-8",
+        )
+        list_finding = ConvertTableCompactor(workspace, chunk_size=2).execute()
+        assert list_finding == [
+            ["waon.csv", 2, "unused", "No input CSV refers. Name = ATM"],
+            ["waon.csv", 4, "duplicate", "Removed since same as line 1. Name = 板橋前野町"],
+            ["waon.csv", 5, "near_duplicate", "Name is same as name on line 2 after normalizing. Name = ＡＴＭ"],  # noqa: RUF001
+            ["waon.csv", 5, "unused", "No input CSV refers. Name = ＡＴＭ"],  # noqa: RUF001
+            ["waon.csv", 6, "duplicate", "Removed since same as line 5. Name = ＡＴＭ"],  # noqa: RUF001
+        ]
+        path_compacted = workspace.directory_csv_output / ConvertTableCompactor.DIRECTORY_NAME_COMPACTED / "waon.csv"
+        assert path_compacted.read_text(encoding="UTF-8") == (
+            "板橋前野町,イオンスタイル　板橋前野町,食費,食料品,\nATM,ATM,,,\nＡＴＭ,ATM,,,\n"  # noqa: RUF001
+        )
+        path_report = workspace.directory_csv_output / ConvertTableCompactor.FILE_NAME_REPORT
+        with path_report.open(encoding="UTF-8") as file:
+            assert len(list(csv.reader(file))) == len(list_finding)
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_conflict(workspace: Workspace) -> None:
+        """Conflicted rows should be kept and reported, then compacted convert table CSV should be reported invalid."""
+        (workspace.directory_csv_convert / "waon.csv").write_text(
+            "板橋前野町,イオンスタイル　板橋前野町,食費,食料品,\n板橋前野町,イオン　板橋前野町,食費,食料品,\n",
+            encoding="UTF-8",
+        )
+        assert ConvertTableCompactor(workspace).execute() == [
+            ["waon.csv", 2, "conflict", "Columns are different from line 1. Name = 板橋前野町"],
+            ["waon.csv", 2, "invalid", "Name has already been defined on line 1. Name = 板橋前野町"],
+        ]
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_execute_json(workspace: Workspace) -> None:
+        """Convert table JSON should be compacted into convert table CSV, and position of entry should be reported."""
+        (workspace.directory_csv_convert / "waon.json").write_text(
+            '[{"name": "ATM", "name_zaim": "ATM"}, {"name": "ATM", "name_zaim": "ATM"}]',
+            encoding="UTF-8",
+        )
+        (workspace.directory_csv_convert / "notes.json").write_text("{}", encoding="UTF-8")
+        assert ConvertTableCompactor(workspace).execute() == [
+            ["waon.json", 1, "unused", "No input CSV refers. Name = ATM"],
+            ["waon.json", 2, "duplicate", "Removed since same as line 1. Name = ATM"],
+        ]
+        path_compacted = workspace.directory_csv_output / ConvertTableCompactor.DIRECTORY_NAME_COMPACTED / "waon.csv"
+        assert path_compacted.read_text(encoding="UTF-8") == "ATM,ATM,,,,\n"
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_execute_invalid(workspace: Workspace) -> None:
+        """Convert table which can't be read should be reported invalid."""
+        (workspace.directory_csv_convert / "waon.yml").write_text("name: ATM\n", encoding="UTF-8")
+        assert ConvertTableCompactor(workspace).execute() == [
+            ["waon.yml", "", "invalid", "Top level should be list of entries."],
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "database_session_with_schema",
+        [[InstanceResource.FIXTURE_RECORD_STORE_WAON_ITABASHIMAENOCHO]],
+        indirect=["database_session_with_schema"],
+    )
+    @pytest.mark.usefixtures("database_session_with_schema")
+    def test_execute_keeps_state(workspace: Workspace) -> None:
+        """Configuration, backend and database which have been selected before should be kept."""
+        (workspace.directory_csv_convert / "waon.csv").write_text("ATM,ATM,,,\n", encoding="UTF-8")
+        backend = CONVERT_TABLE_INDEX.backend
+        engine = Session.get_bind()
+        dictionary_config = dict(vars(CONFIG))
+        ConvertTableCompactor(workspace).execute()
+        assert CONVERT_TABLE_INDEX.backend is backend
+        assert Session.get_bind() is engine
+        assert vars(CONFIG) == dictionary_config
+        assert Store.try_to_find(FileCsvConvertId.WAON, "板橋前野町").name_zaim == "イオンスタイル　板橋前野町"
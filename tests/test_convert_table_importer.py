@@ -1,12 +1,22 @@
 """Tests for convert_table_importer.py."""
 
+import sqlite3
 from pathlib import Path
 from typing import Any
 
 import pytest
+from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm.session import Session as SQLAlchemySession
 
+from zaimcsvconverter.config import ConvertTableSourceConfig
+from zaimcsvconverter.convert_table_backend import DictConvertTableBackend
+from zaimcsvconverter.convert_table_importer import ConvertTableBulkInserter
 from zaimcsvconverter.convert_table_importer import ConvertTableImporter
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.convert_table_source import CsvConvertTableSource
+from zaimcsvconverter.convert_table_source import SqliteConvertTableSource
+from zaimcsvconverter.exceptions import InvalidConvertTableError
+from zaimcsvconverter.models import FileCsvConvertId
 from zaimcsvconverter.models import Item
 from zaimcsvconverter.models import Store
 
@@ -136,3 +146,292 @@ class TestConvertTableImporter:
             match=r"can\'t\sdetect\saccount\stype\sby\scsv\sfile\sname\.\sPlease\sconfirm\scsv\sfile\sname\.",
         ):
             ConvertTableImporter.execute(resource_path / "invalid.csv")
+
+
+class TestConvertTableBulkInserter:
+    """Tests for ConvertTableBulkInserter."""
+
+    @staticmethod
+    def test_chunk(database_session_with_schema: SQLAlchemySession, tmp_path: Path) -> None:
+        """Rows should be inserted over chunks."""
+        path = tmp_path / "waon.csv"
+        path.write_text("".join(f"store{index},,食費,食料品\n" for index in range(5)), encoding="UTF-8")
+        ConvertTableBulkInserter(database_session_with_schema, CsvConvertTableSource(path), chunk_size=2).execute()
+        stores = database_session_with_schema.query(Store).order_by(Store.id.asc()).all()
+        assert [store.name for store in stores] == [f"store{index}" for index in range(5)]
+        assert stores[0].name_zaim is None
+        assert stores[0].category_payment_large == "食費"
+        assert stores[0].category_income is None
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session_with_schema")
+    def test_duplicate(tmp_path: Path) -> None:
+        """Method should report line numbers of duplicated names and insert nothing."""
+        path = tmp_path / "waon.csv"
+        path.write_text("store1\nstore2\nstore1\nstore3\nstore2\n", encoding="UTF-8")
+        with pytest.raises(InvalidConvertTableError) as excinfo:
+            ConvertTableImporter.execute(path)
+        assert [line_number for _, line_number, _ in excinfo.value] == [3, 5]
+        assert str(excinfo.value) == (
+            "waon.csv: line 3: Name has already been defined on line 1. Name = store1\n"
+            "waon.csv: line 5: Name has already been defined on line 2. Name = store2"
+        )
+
+    @staticmethod
+    def test_duplicate_imported(database_session_with_schema: SQLAlchemySession, tmp_path: Path) -> None:
+        """Method should report line numbers of names which have already been imported."""
+        path = tmp_path / "waon.csv"
+        path.write_text("store1\n", encoding="UTF-8")
+        ConvertTableImporter.execute(path)
+        path.write_text("store2\nstore1\n,,,,,,\n", encoding="UTF-8")
+        with pytest.raises(InvalidConvertTableError) as excinfo:
+            ConvertTableImporter.execute(path)
+        assert list(excinfo.value) == [
+            ["waon.csv", 2, "Name has already been imported. Name = store1"],
+            ["waon.csv", 3, "Number of columns should be 1 to 6."],
+        ]
+        assert [store.name for store in database_session_with_schema.query(Store).all()] == ["store1"]
+
+    @staticmethod
+    def test_execute_invalid_over_chunks(database_session_with_schema: SQLAlchemySession, tmp_path: Path) -> None:
+        """Rows of committed chunks should be deleted when convert table CSV is invalid."""
+        path_imported = tmp_path / "waon.json"
+        path_imported.write_text('[["store0"]]', encoding="UTF-8")
+        ConvertTableImporter.execute(path_imported)
+        path = tmp_path / "waon.csv"
+        chunk_size = ConvertTableBulkInserter.DEFAULT_CHUNK_SIZE
+        path.write_text(
+            "".join(f"store{index}\n" for index in range(1, chunk_size + 2)) + "store1\n",
+            encoding="UTF-8",
+        )
+        with pytest.raises(InvalidConvertTableError):
+            ConvertTableImporter.execute(path)
+        assert [store.name for store in database_session_with_schema.query(Store).all()] == ["store0"]
+
+    @staticmethod
+    def test_commit_per_chunk(database_session_with_schema: SQLAlchemySession, tmp_path: Path) -> None:
+        """Chunks before duplicated name should be committed, then rows should no longer be inserted."""
+        path = tmp_path / "waon.csv"
+        path.write_text("store1\nstore2\nstore3\nstore1\nstore5\n", encoding="UTF-8")
+        with pytest.raises(InvalidConvertTableError):
+            ConvertTableBulkInserter(
+                database_session_with_schema,
+                CsvConvertTableSource(path),
+                chunk_size=2,
+                commit_per_chunk=True,
+            ).execute()
+        database_session_with_schema.rollback()
+        assert [store.name for store in database_session_with_schema.query(Store).all()] == ["store1", "store2"]
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session_with_schema")
+    def test_rule(tmp_path: Path) -> None:
+        """Rules should be imported and invalid regular expression should be reported with line number."""
+        path = tmp_path / "sbi_sumishin_net_bank.csv"
+        path.write_text("prefix:ＡＴＭ,,,,,お財布\nregex:振込.*,,,,,普通預金\nregex:(\n", encoding="UTF-8")  # noqa: RUF001
+        with pytest.raises(InvalidConvertTableError) as excinfo:
+            ConvertTableImporter.execute(path)
+        assert [line_number for _, line_number, _ in excinfo.value] == [3]
+        path.write_text("prefix:ＡＴＭ,,,,,お財布\nregex:振込.*,,,,,普通預金\n", encoding="UTF-8")  # noqa: RUF001
+        ConvertTableImporter.reload(path)
+        store = Store.try_to_find(FileCsvConvertId.SBI_SUMISHIN_NET_BANK, "ＡＴＭ　セブン銀行")  # noqa: RUF001
+        assert store.transfer_target == "お財布"
+        assert Store.try_to_find(FileCsvConvertId.SBI_SUMISHIN_NET_BANK, "振込　ヤマダ").transfer_target == "普通預金"
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session_with_schema")
+    def test_rule_combined(tmp_path: Path) -> None:
+        """Regular expression rules which can't be combined with other rules should be reported with line number."""
+        path = tmp_path / "sbi_sumishin_net_bank.csv"
+        path.write_text("regex:(a)b\nregex:(?i)abc\nregex:(a)\\1\nregex:(?P<g>a)\nregex:(?P<g>b)\n", encoding="UTF-8")
+        with pytest.raises(InvalidConvertTableError) as excinfo:
+            ConvertTableImporter.execute(path)
+        assert [line_number for _, line_number, _ in excinfo.value] == [2, 3, 4, 5]
+
+
+class TestConvertTableSqliteCopier:
+    """Tests for ConvertTableSqliteCopier."""
+
+    @staticmethod
+    def create_source(path: Path, list_row: list[tuple[Any, ...]], **columns: str) -> SqliteConvertTableSource:
+        """Create table of external database, then source which maps columns of convert table into it."""
+        with sqlite3.connect(path) as connection:
+            connection.execute("CREATE TABLE store (store_name TEXT, zaim_name TEXT, category TEXT, note TEXT)")
+            connection.executemany("INSERT INTO store VALUES (?, ?, ?, ?)", list_row)
+        connection.close()
+        return SqliteConvertTableSource(ConvertTableSourceConfig("waon", str(path), "store", columns))
+
+    def test_execute(self, database_session_with_schema: SQLAlchemySession, tmp_path: Path) -> None:
+        """Rows should be copied in order of rowid, and empty or unmapped columns should be NULL."""
+        source = self.create_source(
+            tmp_path / "stores.sqlite3",
+            [("store1", "イオン1", "食費", "x"), ("store2", "", None, "y"), (3, None, "日用雑貨", "z")],
+            name="store_name",
+            name_zaim="zaim_name",
+            category_payment_large="category",
+        )
+        ConvertTableImporter.execute_source(source)
+        stores = database_session_with_schema.query(Store).order_by(Store.id.asc()).all()
+        assert [
+            (
+                store.file_csv_convert_id,
+                store.name,
+                store.name_zaim,
+                store.category_payment_large,
+                store.transfer_target,
+            )
+            for store in stores
+        ] == [
+            (FileCsvConvertId.WAON.value, "store1", "イオン1", "食費", None),
+            (FileCsvConvertId.WAON.value, "store2", None, None, None),
+            (FileCsvConvertId.WAON.value, "3", None, "日用雑貨", None),
+        ]
+        assert Store.try_to_find(FileCsvConvertId.WAON, "store1").name_zaim == "イオン1"
+
+    def test_invalid(self, database_session_with_schema: SQLAlchemySession, tmp_path: Path) -> None:
+        """Invalid names should be reported with rowid and nothing should be copied."""
+        path = tmp_path / "waon.csv"
+        path.write_text("store0\n", encoding="UTF-8")
+        ConvertTableImporter.execute(path)
+        source = self.create_source(
+            tmp_path / "stores.sqlite3",
+            [(name, None, None, None) for name in ["store1", "", "store1", "store0", "regex:("]],
+            name="store_name",
+        )
+        assert ConvertTableImporter.try_to_execute_source(source) == [
+            ["stores.sqlite3:store", 2, "Name is empty."],
+            ["stores.sqlite3:store", 3, "Name has already been defined on rowid 1. Name = store1"],
+            ["stores.sqlite3:store", 4, "Name has already been imported. Name = store0"],
+            [
+                "stores.sqlite3:store",
+                5,
+                "Invalid regular expression, missing ), unterminated subpattern at position 0. Name = regex:(",
+            ],
+        ]
+        assert [store.name for store in database_session_with_schema.query(Store).all()] == ["store0"]
+
+    def test_reload(self, database_session_with_schema: SQLAlchemySession, tmp_path: Path) -> None:
+        """Each source should be reloaded or removed without changing rows imported from other sources."""
+        path_database = tmp_path / "stores.sqlite3"
+        source = self.create_source(
+            path_database,
+            [("A店", "A", None, None), ("B店", "B", None, None)],
+            name="store_name",
+            name_zaim="zaim_name",
+        )
+        ConvertTableImporter.execute_source(source)
+        path = tmp_path / "waon.csv"
+        path.write_text("store1\n", encoding="UTF-8")
+        ConvertTableImporter.reload(path)
+        path.write_text("store2\nA店\n", encoding="UTF-8")
+        with pytest.raises(InvalidConvertTableError, match=r"waon\.csv: line 2: Name has already been imported\."):
+            ConvertTableImporter.reload(path)
+        path.write_text("store2\n", encoding="UTF-8")
+        assert ConvertTableImporter.reload(path).list_name_deleted == ["store1"]
+        assert Store.try_to_find(FileCsvConvertId.WAON, "A店").name_zaim == "A"
+        with sqlite3.connect(path_database) as connection:
+            connection.execute("UPDATE store SET store_name = 'C店' WHERE store_name = 'B店'")
+        connection.close()
+        ConvertTableImporter.execute_source(source)
+        assert self.list_name_source(database_session_with_schema) == [
+            ("store2", "waon.csv"),
+            ("A店", "stores.sqlite3:store"),
+            ("C店", "stores.sqlite3:store"),
+        ]
+        ConvertTableImporter.remove_source(source)
+        assert self.list_name_source(database_session_with_schema) == [("store2", "waon.csv")]
+        with pytest.raises(NoResultFound):
+            Store.try_to_find(FileCsvConvertId.WAON, "A店")
+
+    @staticmethod
+    def list_name_source(database_session_with_schema: SQLAlchemySession) -> list[tuple[str, str | None]]:
+        database_session_with_schema.expire_all()
+        stores = database_session_with_schema.query(Store).order_by(Store.id.asc()).all()
+        return [(store.name, store.source) for store in stores]
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session_with_schema")
+    def test_invalid_configuration(tmp_path: Path) -> None:
+        """Unknown columns and database file which doesn't exist should be reported."""
+        path = tmp_path / "stores.sqlite3"
+        source = SqliteConvertTableSource(ConvertTableSourceConfig("waon", str(path), "store", {"note": "note"}))
+        assert ConvertTableImporter.try_to_execute_source(source) == [
+            ["stores.sqlite3:store", "", "Unknown columns: note."],
+        ]
+        source = SqliteConvertTableSource(ConvertTableSourceConfig("waon", str(path), "store"))
+        assert ConvertTableImporter.try_to_execute_source(source) == [
+            ["stores.sqlite3:store", "", "Database file doesn't exist."],
+        ]
+        assert not path.exists()
+
+
+class TestConvertTableImporterExecuteAll:
+    """Tests for ConvertTableImporter.execute_all()."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session_with_schema")
+    def test_report_all(tmp_path: Path) -> None:
+        """Errors of all convert table CSV should be raised at once."""
+        (tmp_path / "waon.csv").write_text("store1\nstore1\n", encoding="UTF-8")
+        (tmp_path / "amazon.csv").write_text("item1\nitem2\nitem1\n", encoding="UTF-8")
+        (tmp_path / "mufg.csv").write_text("store1\n", encoding="UTF-8")
+        with pytest.raises(InvalidConvertTableError) as excinfo:
+            ConvertTableImporter.execute_all(tmp_path)
+        assert str(excinfo.value) == (
+            "amazon.csv: line 3: Name has already been defined on line 1. Name = item1\n"
+            "waon.csv: line 2: Name has already been defined on line 1. Name = store1"
+        )
+
+
+class TestConvertTableReloader:
+    """Tests for ConvertTableReloader."""
+
+    @staticmethod
+    def test_execute(database_session_with_schema: SQLAlchemySession, tmp_path: Path) -> None:
+        """Only inserted, updated and deleted rows should be applied, and index should be updated in place."""
+        path = tmp_path / "waon.csv"
+        path.write_text("store1,イオン1\nstore2,イオン2\nstore3,イオン3\n", encoding="UTF-8")
+        ConvertTableImporter.reload(path)
+        list_id = [store.id for store in database_session_with_schema.query(Store).order_by(Store.id.asc()).all()]
+        with pytest.raises(NoResultFound):
+            Store.try_to_find(FileCsvConvertId.WAON, "store4")
+        dict_convert_table_backend = CONVERT_TABLE_INDEX.backend
+        assert isinstance(dict_convert_table_backend, DictConvertTableBackend)
+        index = dict_convert_table_backend.get(Store)
+        path.write_text("store1,イオン1\nstore2,イオン二\nstore4,イオン4\n", encoding="UTF-8")
+        convert_table_diff = ConvertTableImporter.reload(path)
+        assert [store.name for store in convert_table_diff.list_value_inserted] == ["store4"]
+        assert [store.name_zaim for store in convert_table_diff.list_value_updated] == ["イオン二"]
+        assert convert_table_diff.list_name_deleted == ["store3"]
+        assert dict_convert_table_backend.get(Store) is index
+        assert Store.try_to_find(FileCsvConvertId.WAON, "store4").name_zaim == "イオン4"
+        assert Store.try_to_find(FileCsvConvertId.WAON, "store2").name_zaim == "イオン二"
+        with pytest.raises(NoResultFound):
+            Store.try_to_find(FileCsvConvertId.WAON, "store3")
+        database_session_with_schema.expire_all()
+        stores = database_session_with_schema.query(Store).order_by(Store.id.asc()).all()
+        # Rows which are unchanged or updated should keep their primary keys.
+        assert [(store.id, store.name) for store in stores[:2]] == [(list_id[0], "store1"), (list_id[1], "store2")]
+        assert [store.name for store in stores[2:]] == ["store4"]
+        assert not ConvertTableImporter.reload(path)
+
+    @staticmethod
+    def test_invalid(database_session_with_schema: SQLAlchemySession, tmp_path: Path) -> None:
+        """Invalid convert table CSV should not change imported convert table."""
+        path = tmp_path / "waon.csv"
+        path.write_text("store1\nstore2\n", encoding="UTF-8")
+        ConvertTableImporter.reload(path)
+        path.write_text("store3\nstore3\n", encoding="UTF-8")
+        with pytest.raises(InvalidConvertTableError):
+            ConvertTableImporter.reload(path)
+        assert [store.name for store in database_session_with_schema.query(Store).all()] == ["store1", "store2"]
+
+    @staticmethod
+    def test_removed(database_session_with_schema: SQLAlchemySession, tmp_path: Path) -> None:
+        """Convert table should be emptied when convert table CSV has been removed."""
+        path = tmp_path / "waon.csv"
+        path.write_text("store1\nstore2\n", encoding="UTF-8")
+        ConvertTableImporter.reload(path)
+        path.unlink()
+        assert ConvertTableImporter.reload(path).list_name_deleted == ["store1", "store2"]
+        assert database_session_with_schema.query(Store).all() == []
@@ -0,0 +1,94 @@
+"""Tests for convert_table_index.py."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import NoResultFound
+
+from tests.testlibraries.instance_resource import InstanceResource
+from zaimcsvconverter.config import StoreCategoryConfig
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.convert_table_index import ConvertTablePrefetcher
+from zaimcsvconverter.models import FileCsvConvertId
+from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import StoreRowData
+from zaimcsvconverter.store_classifier import StoreClassifier
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm.session import Session as SQLAlchemySession
+
+
+class TestConvertTableIndex:
+    """Tests for ConvertTableIndex."""
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.parametrize(
+        "database_session_with_schema",
+        [[InstanceResource.FIXTURE_RECORD_STORE_WAON_MAKUHARISHINTOSHIN]],
+        indirect=["database_session_with_schema"],
+    )
+    def test_find(database_session_with_schema: SQLAlchemySession) -> None:
+        """Convert table should be queried only once, then index should be rebuilt after convert table is changed."""
+        list_statement: list[str] = []
+        engine = database_session_with_schema.get_bind()
+        event.listen(engine, "before_cursor_execute", lambda *args: list_statement.append(args[2]))
+        for _ in range(3):
+            assert Store.find(FileCsvConvertId.WAON, "幕張新都心").name_zaim == "イオンモール　幕張新都心"
+            with pytest.raises(NoResultFound):
+                Store.find(FileCsvConvertId.WAON, "上尾")
+        assert len(list_statement) == 1
+        Store.replace_all(
+            FileCsvConvertId.WAON,
+            [Store(FileCsvConvertId.WAON, StoreRowData("上尾", "イオンモール　上尾"))],
+        )
+        assert Store.find(FileCsvConvertId.WAON, "上尾").name_zaim == "イオンモール　上尾"
+        with pytest.raises(NoResultFound):
+            Store.find(FileCsvConvertId.WAON, "幕張新都心")
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "database_session_with_schema",
+        [[InstanceResource.FIXTURE_RECORD_STORE_GOLD_POINT_CARD_PLUS_TOKYO_ELECTRIC]],
+        indirect=["database_session_with_schema"],
+    )
+    @pytest.mark.usefixtures("database_session_with_schema")
+    def test_configure(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Stores should be classified by classifier built once when configured, even after index is cleared."""
+        CONVERT_TABLE_INDEX.configure([StoreCategoryConfig("electricity", pattern="電気料金")])
+        try:
+            with monkeypatch.context() as context:
+                context.setattr(StoreClassifier, "create", pytest.fail)
+                for _ in range(2):
+                    store = Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "東京電力  電気料金等")
+                    assert store.categories == {"electricity"}
+                    CONVERT_TABLE_INDEX.clear()
+        finally:
+            CONVERT_TABLE_INDEX.configure([])
+
+
+class TestConvertTablePrefetcher:
+    """Tests for ConvertTablePrefetcher."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "database_session_with_schema",
+        [[InstanceResource.FIXTURE_RECORD_STORE_WAON_MAKUHARISHINTOSHIN]],
+        indirect=["database_session_with_schema"],
+    )
+    @pytest.mark.usefixtures("database_session_with_schema")
+    def test_execute() -> None:
+        """Distinct requested names should be resolved at once and undefined names should be listed."""
+        convert_table_prefetcher = ConvertTablePrefetcher()
+        for name in ["幕張新都心", "上尾", "幕張新都心", "上尾"]:
+            convert_table_prefetcher.request(Store, FileCsvConvertId.WAON, name)
+        convert_table_prefetcher.execute()
+        store = convert_table_prefetcher.get(Store, FileCsvConvertId.WAON, "幕張新都心")
+        assert store is not None
+        assert store.name_zaim == "イオンモール　幕張新都心"
+        assert convert_table_prefetcher.get(Store, FileCsvConvertId.WAON, "上尾") is None
+        assert convert_table_prefetcher.get(Store, FileCsvConvertId.MUFG, "幕張新都心") is None
+        assert convert_table_prefetcher.list_undefined == [(Store, FileCsvConvertId.WAON.value, "上尾")]
@@ -0,0 +1,95 @@
+"""Tests for convert_table_pattern.py."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from zaimcsvconverter.convert_table_pattern import ConvertTablePattern
+
+
+class TestConvertTablePattern:
+    """Tests for ConvertTablePattern."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("ＡＴＭ　セブン銀行", "prefix:ＡＴＭ"),  # noqa: RUF001
+            ("ＡＴＭ", "prefix:ＡＴＭ"),  # noqa: RUF001
+            ("ＡＴＭ手数料", "prefix:ＡＴＭ手数料"),
+            ("振込＊ヤマダ", r"regex:振込＊.+"),  # noqa: RUF001
+            ("振込＊", None),  # noqa: RUF001
+            ("新宿", "regex:(新宿|渋谷)"),
+            ("渋谷駅", None),
+            ("*", "regex:.*"),
+            ("", "regex:.*"),
+        ],
+    )
+    def test_match(name: str, expected: str | None) -> None:
+        """Longest prefix rule should take priority, then former regular expression rule should match whole name."""
+        list_name_rule = [
+            "prefix:ＡＴＭ",  # noqa: RUF001
+            "prefix:ＡＴＭ手数料",
+            "新宿",
+            r"regex:振込＊.+",  # noqa: RUF001
+            "regex:(新宿|渋谷)",
+            "regex:.*",
+        ]
+        convert_table_pattern = ConvertTablePattern((name_rule, name_rule) for name_rule in list_name_rule)
+        assert convert_table_pattern.match(name) == ("regex:.*" if expected is None else expected)
+
+    @staticmethod
+    @pytest.mark.parametrize("name", ["ＡＴＭ*", "/振込.*/", "本人*", "/"])  # noqa: RUF001
+    def test_literal(name: str) -> None:
+        """Names without marker should not be rules even if they end with "*" or are enclosed by "/"."""
+        assert not ConvertTablePattern.is_prefix(name)
+        assert not ConvertTablePattern.is_regex(name)
+        convert_table_pattern = ConvertTablePattern([(name, name)])
+        assert convert_table_pattern.match("ＡＴＭ　セブン銀行") is None  # noqa: RUF001
+        assert convert_table_pattern.match("振込　ヤマダ") is None
+
+    @staticmethod
+    def test_validate() -> None:
+        """Invalid regular expression rule should raise error."""
+        ConvertTablePattern.validate("regex:(新宿|渋谷)")
+        ConvertTablePattern.validate("(")
+        with pytest.raises(re.error):
+            ConvertTablePattern.validate("regex:(")
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("name", "message"),
+        [
+            ("regex:(?i)abc", "global inline flags can't be used"),
+            ("regex:abc(?i)", "global"),
+            ("regex:(a)\\1", "numbered references to groups can't be used at position 3"),
+            ("regex:(a)?(?(1)b|c)", "numbered references to groups can't be used at position 4"),
+            ("regex:(?P<g>a)b", "named groups can't be used"),
+            ("regex:(?P<g>a)(?P=g)", "named groups can't be used"),
+        ],
+    )
+    def test_validate_combined(name: str, message: str) -> None:
+        """Regular expression rule which breaks combined pattern should raise error."""
+        with pytest.raises(re.error, match=re.escape(message)):
+            ConvertTablePattern.validate(name)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [("ABC", "regex:(?i:abc)"), ("\x01aa", r"regex:[\1](a)a"), ("\\a", r"regex:\\a"), ("S", r"regex:\123")],
+    )
+    def test_validate_combined_valid(name: str, expected: str) -> None:
+        """Scoped flags, escaped backslashes, character sets and octal escapes should be combined with other rules."""
+        list_name_rule = ["regex:(a)b", "regex:(?i:abc)", r"regex:[\1](a)a", r"regex:\\a", r"regex:\123"]
+        for name_rule in list_name_rule:
+            ConvertTablePattern.validate(name_rule)
+        convert_table_pattern = ConvertTablePattern((name_rule, name_rule) for name_rule in list_name_rule)
+        assert convert_table_pattern.match(name) == expected
+
+    @staticmethod
+    def test_invalid_rule() -> None:
+        """Invalid regular expression rule should raise error when rules are built instead of lookup."""
+        with pytest.raises(re.error):
+            ConvertTablePattern([("regex:(?i)abc", None), ("regex:abc", None)])
@@ -0,0 +1,147 @@
+"""Tests for convert_table_source.py."""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import TYPE_CHECKING
+
+import pytest
+
+from zaimcsvconverter.config import ConvertTableSourceConfig
+from zaimcsvconverter.convert_table_source import ConvertTableSourceFactory
+from zaimcsvconverter.convert_table_source import CsvConvertTableSource
+from zaimcsvconverter.convert_table_source import JsonConvertTableSource
+from zaimcsvconverter.convert_table_source import SqliteConvertTableSource
+from zaimcsvconverter.convert_table_source import YamlConvertTableSource
+from zaimcsvconverter.exceptions import InvalidConvertTableError
+from zaimcsvconverter.file_csv_convert import FileCsvConvert
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestJsonConvertTableSource:
+    """Tests for JsonConvertTableSource."""
+
+    @staticmethod
+    def test_iterate_entry(tmp_path: Path) -> None:
+        """Entries of list and object should be converted into rows of convert table CSV."""
+        path = tmp_path / "waon.json"
+        path.write_text(
+            '[["store1", "イオン1", "食費"], {"name": "store2", "category_payment_small": "食料品"}, ["store3", 1]]',
+            encoding="UTF-8",
+        )
+        source = JsonConvertTableSource(path)
+        assert source.file_csv_convert is FileCsvConvert.WAON
+        assert source.name == "waon.json"
+        assert source.iterate_entry() == [
+            (1, ["store1", "イオン1", "食費"]),
+            (2, ["store2", "", "", "食料品", "", ""]),
+            (3, ["store3", "1"]),
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            ("[", [["waon.json", "", "Failed to parse, Expecting value: line 1 column 2 (char 1)"]]),
+            ('{"name": "store1"}', [["waon.json", "", "Top level should be list of entries."]]),
+            (
+                '[["store1"], "store2", {"name": "store3", "store": "x", "note": "y"}]',
+                [
+                    ["waon.json", 2, "Entry should be list or object."],
+                    ["waon.json", 3, "Unknown columns: note, store."],
+                ],
+            ),
+        ],
+    )
+    def test_invalid(tmp_path: Path, content: str, expected: list[list[int | str]]) -> None:
+        """Invalid document should raise error with position of entry."""
+        path = tmp_path / "waon.json"
+        path.write_text(content, encoding="UTF-8")
+        with pytest.raises(InvalidConvertTableError) as excinfo:
+            JsonConvertTableSource(path).iterate_entry()
+        assert list(excinfo.value) == expected
+
+
+class TestYamlConvertTableSource:
+    """Tests for YamlConvertTableSource."""
+
+    @staticmethod
+    def test_iterate_entry(tmp_path: Path) -> None:
+        """Entries of YAML should be converted as same as ones of JSON."""
+        path = tmp_path / "amazon.yml"
+        path.write_text(
+            "- [item1, 通信, その他]\n- name: item2\n  category_payment_large: 大型出費\n",
+            encoding="UTF-8",
+        )
+        assert YamlConvertTableSource(path).iterate_entry() == [
+            (1, ["item1", "通信", "その他"]),
+            (2, ["item2", "大型出費", ""]),
+        ]
+
+    @staticmethod
+    def test_invalid(tmp_path: Path) -> None:
+        """YAML which can't be parsed should raise error."""
+        path = tmp_path / "amazon.yaml"
+        path.write_text("- [item1\n", encoding="UTF-8")
+        with pytest.raises(InvalidConvertTableError, match=r"amazon\.yaml: Failed to parse, "):
+            YamlConvertTableSource(path).iterate_entry()
+
+
+class TestSqliteConvertTableSource:
+    """Tests for SqliteConvertTableSource."""
+
+    @staticmethod
+    def test_fingerprint(tmp_path: Path) -> None:
+        """Fingerprint should change when database is changed and should be None when it doesn't exist."""
+        path = tmp_path / "stores.sqlite3"
+        source = SqliteConvertTableSource(
+            ConvertTableSourceConfig("waon", str(path), "store", {"name_zaim": "store_name"}),
+        )
+        assert source.name == "stores.sqlite3:store"
+        assert source.columns == {"name": "name", "name_zaim": "store_name"}
+        assert source.fingerprint() is None
+        with sqlite3.connect(path) as connection:
+            connection.execute("CREATE TABLE store (name TEXT, store_name TEXT)")
+        fingerprint = source.fingerprint()
+        assert fingerprint is not None
+        with sqlite3.connect(path) as connection:
+            connection.executemany("INSERT INTO store VALUES (?, ?)", [(f"store{index}", "") for index in range(100)])
+        assert source.fingerprint() != fingerprint
+
+
+class TestConvertTableSourceFactory:
+    """Tests for ConvertTableSourceFactory."""
+
+    @staticmethod
+    def test_create_all(tmp_path: Path) -> None:
+        """Files of supported formats should be created in order of file name."""
+        for file_name in ["waon.yaml", "amazon.json", "mufg.csv", "readme.txt", "view_card.yml"]:
+            (tmp_path / file_name).write_text("", encoding="UTF-8")
+        list_source = ConvertTableSourceFactory.create_all(tmp_path)
+        assert [type(source) for source in list_source] == [
+            JsonConvertTableSource,
+            CsvConvertTableSource,
+            YamlConvertTableSource,
+            YamlConvertTableSource,
+        ]
+        assert [source.file_csv_convert for source in list_source] == [
+            FileCsvConvert.AMAZON,
+            FileCsvConvert.MUFG,
+            FileCsvConvert.VIEW_CARD,
+            FileCsvConvert.WAON,
+        ]
+
+    @staticmethod
+    def test_list_path_ignores_unrecognized_name(tmp_path: Path) -> None:
+        """Files which aren't named as convert table should be ignored even if format is supported."""
+        for file_name in ["waon.json", "notes.json", "settings.yml", "waon_backup.csv"]:
+            (tmp_path / file_name).write_text("", encoding="UTF-8")
+        assert ConvertTableSourceFactory.list_path(tmp_path) == [tmp_path / "waon.json"]
+
+    @staticmethod
+    def test_create_unsupported(tmp_path: Path) -> None:
+        """Unsupported format should raise error."""
+        with pytest.raises(ValueError, match=r"Unsupported format of convert table file\."):
+            ConvertTableSourceFactory.create(tmp_path / "waon.txt")
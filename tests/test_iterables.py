@@ -0,0 +1,11 @@
+"""Tests for iterables.py."""
+
+from __future__ import annotations
+
+from zaimcsvconverter.iterables import split
+
+
+def test_split() -> None:
+    """Iterable should be split into lists which have at most size items."""
+    assert list(split(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(split([], 2)) == []
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import FrozenInstanceError
 from typing import TYPE_CHECKING
 
 import pytest
@@ -13,6 +14,8 @@ from zaimcsvconverter.file_csv_convert import FileCsvConvert
 from zaimcsvconverter.models import FileCsvConvertId
 from zaimcsvconverter.models import Store
 from zaimcsvconverter.models import StoreRowData
+from zaimcsvconverter.models import StoreValue
+from zaimcsvconverter.store_classifier import StoreClassifier
 
 if TYPE_CHECKING:
     from sqlalchemy.orm.session import Session as SQLAlchemySession
@@ -77,4 +80,43 @@ class TestModel:
         """Method should raise KeyError when store name is not exist in database."""
         with pytest.raises(NoResultFound) as error:
             Store.try_to_find(FileCsvConvert.WAON.value.id, "上尾")
-        assert str(error) == "<ExceptionInfo NoResultFound('No row was found when one was required') tblen=5>"
+        assert str(error) == "<ExceptionInfo NoResultFound('No row was found when one was required') tblen=4>"
+
+
+class TestStoreValue:
+    """Tests for StoreValue."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session_stores_gold_point_card_plus")
+    def test_try_to_find() -> None:
+        """Found store should be immutable value shared between lookups."""
+        store = Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "ＡＭＡＺＯＮ．ＣＯ．ＪＰ")  # noqa: RUF001
+        assert isinstance(store, StoreValue)
+        assert store is Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "ＡＭＡＺＯＮ．ＣＯ．ＪＰ")  # noqa: RUF001
+        assert not hasattr(store, "__dict__")
+        with pytest.raises(FrozenInstanceError):
+            # Reason: To test immutability.
+            store.name_zaim = "Amazon"  # type: ignore[misc]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("name", "is_amazon", "is_pay_pal", "is_kyash"),
+        [
+            ("ＡＭＡＺＯＮ．ＣＯ．ＪＰ", True, False, False),  # noqa: RUF001
+            ("Ａｍａｚｏｎ　Ｄｏｗｎｌｏａｄｓ", True, False, False),  # noqa: RUF001
+            ("ＰａｙＰａｌ決済", False, True, False),
+            ("PAYPAL *STEAM GAMES", False, True, False),
+            ("ＫＹＡＳＨ", False, False, True),  # noqa: RUF001
+            ("東京電力  電気料金等", False, False, False),
+        ],
+    )
+    def test_predicate(name: str, *, is_amazon: bool, is_pay_pal: bool, is_kyash: bool) -> None:
+        """Predicates should be judged by name."""
+        store = StoreValue(
+            FileCsvConvertId.GOLD_POINT_CARD_PLUS.value,
+            name,
+            categories=StoreClassifier.create([]).classify(name),
+        )
+        assert store.is_amazon == is_amazon
+        assert store.is_pay_pal == is_pay_pal
+        assert store.is_kyash == is_kyash
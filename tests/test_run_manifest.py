@@ -0,0 +1,133 @@
+"""Tests for run_manifest.py."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from zaimcsvconverter import CONFIG
+from zaimcsvconverter.config import StoreCategoryConfig
+from zaimcsvconverter.errorhandling.error_handler import UndefinedContentErrorHandler
+from zaimcsvconverter.errorreporters.convert_result import ConvertResult
+from zaimcsvconverter.run_manifest import RunManifest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestRunManifest:
+    """Tests for RunManifest."""
+
+    @pytest.fixture
+    def directories(self, tmp_path: Path) -> tuple[Path, Path, Path]:
+        """Prepare input CSV file, convert table CSV file and output CSV file of previous run."""
+        directory_csv_input = tmp_path / "csvinput"
+        directory_csv_convert = tmp_path / "csvconverttable"
+        directory_csv_output = tmp_path / "csvoutput"
+        for directory in (directory_csv_input, directory_csv_convert, directory_csv_output):
+            directory.mkdir()
+        (directory_csv_input / "waon201808.csv").write_text("input", encoding="UTF-8")
+        (directory_csv_convert / "waon.csv").write_text("convert table", encoding="UTF-8")
+        (directory_csv_output / "waon201808.csv").write_text("output", encoding="UTF-8")
+        return directory_csv_input, directory_csv_convert, directory_csv_output
+
+    @staticmethod
+    def create_convert_result() -> ConvertResult:
+        undefined_content_error_handler = UndefinedContentErrorHandler()
+        undefined_content_error_handler.extend_list([["waon201808.csv", "板橋前野町", ""]])
+        return ConvertResult(
+            is_invalid=True,
+            list_invalid_row=[["waon201808.csv", 2, "Invalid row."]],
+            undefined_content_error_handler=undefined_content_error_handler,
+        )
+
+    def save_previous_run(self, directories: tuple[Path, Path, Path]) -> None:
+        directory_csv_input, directory_csv_convert, directory_csv_output = directories
+        run_manifest = RunManifest(directory_csv_output, directory_csv_convert)
+        run_manifest.record(directory_csv_input / "waon201808.csv", self.create_convert_result())
+        run_manifest.save()
+
+    @pytest.mark.usefixtures("_yaml_config_load")
+    def test_find(self, directories: tuple[Path, Path, Path]) -> None:
+        """Result of previous run should be restored when nothing is changed."""
+        directory_csv_input, directory_csv_convert, directory_csv_output = directories
+        self.save_previous_run(directories)
+        convert_result = RunManifest(directory_csv_output, directory_csv_convert).find(
+            directory_csv_input / "waon201808.csv",
+        )
+        assert convert_result is not None
+        assert convert_result.is_invalid
+        assert convert_result.list_invalid_row == [["waon201808.csv", 2, "Invalid row."]]
+        assert convert_result.undefined_content_error_handler.list_error == [["waon201808.csv", "板橋前野町", ""]]
+
+    @pytest.mark.usefixtures("_yaml_config_load")
+    def test_find_unrelated_convert_table_changed(self, directories: tuple[Path, Path, Path]) -> None:
+        """Result of previous run should be restored when convert table of other account is changed."""
+        directory_csv_input, directory_csv_convert, directory_csv_output = directories
+        self.save_previous_run(directories)
+        (directory_csv_convert / "amazon.csv").write_text("convert table", encoding="UTF-8")
+        run_manifest = RunManifest(directory_csv_output, directory_csv_convert)
+        assert run_manifest.find(directory_csv_input / "waon201808.csv") is not None
+
+    @pytest.mark.usefixtures("_yaml_config_load")
+    @pytest.mark.parametrize(
+        "path_to_change",
+        ["csvinput/waon201808.csv", "csvconverttable/waon.csv"],
+    )
+    def test_find_changed(self, directories: tuple[Path, Path, Path], tmp_path: Path, path_to_change: str) -> None:
+        """Result of previous run should not be restored when input CSV file or its convert table is changed."""
+        directory_csv_input, directory_csv_convert, directory_csv_output = directories
+        self.save_previous_run(directories)
+        (tmp_path / path_to_change).write_text("changed", encoding="UTF-8")
+        run_manifest = RunManifest(directory_csv_output, directory_csv_convert)
+        assert run_manifest.find(directory_csv_input / "waon201808.csv") is None
+
+    @pytest.mark.usefixtures("_yaml_config_load")
+    def test_find_source_changed(self, directories: tuple[Path, Path, Path], monkeypatch: pytest.MonkeyPatch) -> None:
+        """Result of previous run should not be restored when source code of this package is changed."""
+        directory_csv_input, directory_csv_convert, directory_csv_output = directories
+        self.save_previous_run(directories)
+        monkeypatch.setattr("zaimcsvconverter.run_manifest.hash_package_source", lambda: "changed")
+        run_manifest = RunManifest(directory_csv_output, directory_csv_convert)
+        assert run_manifest.find(directory_csv_input / "waon201808.csv") is None
+
+    @pytest.mark.usefixtures("_yaml_config_load")
+    def test_find_config_changed(self, directories: tuple[Path, Path, Path]) -> None:
+        """Result of previous run should not be restored when configuration for account is changed."""
+        directory_csv_input, directory_csv_convert, directory_csv_output = directories
+        self.save_previous_run(directories)
+        CONFIG.waon.account_name = "changed"
+        run_manifest = RunManifest(directory_csv_output, directory_csv_convert)
+        assert run_manifest.find(directory_csv_input / "waon201808.csv") is None
+
+    @pytest.mark.usefixtures("_yaml_config_load")
+    def test_find_store_categories_changed(self, directories: tuple[Path, Path, Path]) -> None:
+        """Result of previous run should not be restored when categories of store which account uses are changed."""
+        directory_csv_input, directory_csv_convert, directory_csv_output = directories
+        path_csv_file = directory_csv_input / "gold_point_card_plus201808.csv"
+        path_csv_file.write_text("input", encoding="UTF-8")
+        (directory_csv_output / path_csv_file.name).write_text("output", encoding="UTF-8")
+        run_manifest = RunManifest(directory_csv_output, directory_csv_convert)
+        run_manifest.record(path_csv_file, self.create_convert_result())
+        run_manifest.save()
+        assert RunManifest(directory_csv_output, directory_csv_convert).find(path_csv_file) is not None
+        CONFIG.store_categories = [StoreCategoryConfig("electricity", pattern="電気料金")]
+        assert RunManifest(directory_csv_output, directory_csv_convert).find(path_csv_file) is None
+
+    @pytest.mark.usefixtures("_yaml_config_load")
+    def test_find_output_removed(self, directories: tuple[Path, Path, Path]) -> None:
+        """Result of previous run should not be restored when output CSV file has been removed."""
+        directory_csv_input, directory_csv_convert, directory_csv_output = directories
+        self.save_previous_run(directories)
+        (directory_csv_output / "waon201808.csv").unlink()
+        run_manifest = RunManifest(directory_csv_output, directory_csv_convert)
+        assert run_manifest.find(directory_csv_input / "waon201808.csv") is None
+
+    @pytest.mark.usefixtures("_yaml_config_load")
+    def test_find_broken_manifest(self, directories: tuple[Path, Path, Path]) -> None:
+        """Broken manifest should be treated as empty one."""
+        directory_csv_input, directory_csv_convert, directory_csv_output = directories
+        (directory_csv_output / RunManifest.FILE_NAME).write_text("{", encoding="UTF-8")
+        run_manifest = RunManifest(directory_csv_output, directory_csv_convert)
+        assert run_manifest.find(directory_csv_input / "waon201808.csv") is None
@@ -0,0 +1,171 @@
+"""Tests for shared_convert_table.py."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pytest
+from sqlalchemy.exc import NoResultFound
+
+from tests import test_convert_table_backend
+from zaimcsvconverter import Session
+from zaimcsvconverter.convert_table_backend import DictConvertTableBackend
+from zaimcsvconverter.convert_table_importer import ConvertTableImporter
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.models import Base
+from zaimcsvconverter.models import FileCsvConvertId
+from zaimcsvconverter.models import Store
+from zaimcsvconverter.models import StoreRowData
+from zaimcsvconverter.shared_convert_table import SharedConvertTable
+from zaimcsvconverter.shared_convert_table import SharedConvertTableBackend
+from zaimcsvconverter.shared_convert_table import SortedStringTable
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+    from sqlalchemy.orm.session import Session as SQLAlchemySession
+
+    from zaimcsvconverter.convert_table_backend import ConvertTableBackend
+
+
+@pytest.fixture
+def convert_table_backend(
+    tmp_path: Path,
+    database_session: SQLAlchemySession,  # noqa: ARG001
+) -> Generator[ConvertTableBackend[Any], None, None]:
+    """Write convert table in database into file, then select backend which looks up the file."""
+    Base.metadata.create_all(Session.get_bind())
+    test_convert_table_backend.save_stores_for_conformance()
+    path_file_convert_table = tmp_path / "convert_table.sst"
+    SharedConvertTable.write(path_file_convert_table)
+    shared_convert_table_backend = SharedConvertTableBackend(path_file_convert_table)
+    CONVERT_TABLE_INDEX.use(shared_convert_table_backend)
+    try:
+        yield shared_convert_table_backend
+    finally:
+        CONVERT_TABLE_INDEX.use(DictConvertTableBackend())
+
+
+class TestSortedStringTable:
+    """Tests for SortedStringTable."""
+
+    @staticmethod
+    def test_get(tmp_path: Path) -> None:
+        """Value should be found by key, and values should be iterated in order of key by prefix."""
+        path = tmp_path / "table.sst"
+        SortedStringTable.write(
+            path,
+            [(b"b\0" + bytes([i]), bytes([i]) * i) for i in reversed(range(100))] + [(b"a", b"")],
+        )
+        sorted_string_table = SortedStringTable(path)
+        try:
+            assert len(sorted_string_table) == 101  # noqa: PLR2004
+            assert sorted_string_table.get(b"a") == b""
+            assert sorted_string_table.get(b"b\0" + bytes([3])) == bytes([3]) * 3
+            assert sorted_string_table.get(b"b") is None
+            assert sorted_string_table.get(b"c") is None
+            assert list(sorted_string_table.iterate_prefix(b"b\0")) == [bytes([i]) * i for i in range(100)]
+            assert list(sorted_string_table.iterate_prefix(b"c")) == []
+        finally:
+            sorted_string_table.close()
+
+    @staticmethod
+    def test_empty(tmp_path: Path) -> None:
+        """Empty table should find nothing."""
+        path = tmp_path / "table.sst"
+        SortedStringTable.write(path, [])
+        sorted_string_table = SortedStringTable(path)
+        try:
+            assert sorted_string_table.get(b"a") is None
+        finally:
+            sorted_string_table.close()
+
+    @staticmethod
+    def test_write_sorted_unsorted(tmp_path: Path) -> None:
+        """Streamed entries which keys aren't unique and in ascending order should raise error."""
+        with pytest.raises(ValueError, match=r"Keys should be unique and in ascending order\."):
+            SortedStringTable.write_sorted(tmp_path / "table.sst", [(b"b", b""), (b"a", b"")])
+        with pytest.raises(ValueError, match=r"Keys should be unique and in ascending order\."):
+            SortedStringTable.write_sorted(tmp_path / "table.sst", [(b"a", b""), (b"a", b"")])
+
+    @staticmethod
+    def test_invalid(tmp_path: Path) -> None:
+        """File which isn't sorted string table should raise error."""
+        path = tmp_path / "table.sst"
+        path.write_bytes(b"name,name_zaim\n")
+        with pytest.raises(ValueError, match=r"File is not sorted string table\."):
+            SortedStringTable(path)
+
+
+class TestSharedConvertTableBackend(test_convert_table_backend.TestConvertTableBackend):
+    """Conformance tests for SharedConvertTableBackend."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("convert_table_backend")
+    def test_replace_all() -> None:
+        """Convert table written into file should not be changed by database of current process."""
+        Store.replace_all(
+            FileCsvConvertId.GOLD_POINT_CARD_PLUS,
+            [Store(FileCsvConvertId.GOLD_POINT_CARD_PLUS, StoreRowData("ＡＴＭ　セブン", "Seven Bank"))],  # noqa: RUF001
+        )
+        assert Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "ＡＴＭ　セブン").name_zaim == "ATM"  # noqa: RUF001
+        assert Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "東京駅").name_zaim == "station"
+
+    @staticmethod
+    @pytest.mark.usefixtures("convert_table_backend")
+    def test_reload(tmp_path: Path) -> None:
+        """Convert table written into file should not be changed by reloading convert table CSV on current process."""
+        path = tmp_path / "gold_point_card_plus.csv"
+        path.write_text("東京,Tokyo\n", encoding="UTF-8")
+        ConvertTableImporter.reload(path)
+        with pytest.raises(NoResultFound):
+            Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "東京")
+        assert Store.try_to_find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "東京駅").name_zaim == "station"
+
+    @staticmethod
+    def test_get(convert_table_backend: SharedConvertTableBackend, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Value which has been decoded, including undefined name, should be found without reading file again."""
+        list_key: list[bytes] = []
+        get = convert_table_backend.sorted_string_table.get
+
+        def get_recording(key: bytes) -> bytes | None:
+            list_key.append(key)
+            return get(key)
+
+        monkeypatch.setattr(convert_table_backend.sorted_string_table, "get", get_recording)
+        for _ in range(3):
+            assert Store.find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "セブンーイレブン").name_zaim == "7-Eleven"
+            with pytest.raises(NoResultFound):
+                Store.find(FileCsvConvertId.GOLD_POINT_CARD_PLUS, "東京")
+        assert len(list_key) == 2  # noqa: PLR2004
+
+
+class TestSharedConvertTable:
+    """Tests for SharedConvertTable."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session_with_schema")
+    def test_write(tmp_path: Path) -> None:
+        """Rows streamed by chunk across convert table CSVs should be written in order of key."""
+        list_file_csv_convert_id = [FileCsvConvertId.WAON, FileCsvConvertId.MOBILE_SUICA, FileCsvConvertId.MUFG]
+        list_name = ["b", "a", "ｂ", "あ", "prefix:A", "regex:.*", "B", "a b"] * 150  # noqa: RUF001
+        Store.save_all(
+            [
+                Store(file_csv_convert_id, StoreRowData(f"{name}{index}", file_csv_convert_id.name))
+                for file_csv_convert_id in list_file_csv_convert_id
+                for index, name in enumerate(list_name)
+            ],
+        )
+        path = tmp_path / "convert_table.sst"
+        SharedConvertTable.write(path)
+        shared_convert_table_backend = SharedConvertTableBackend(path)
+        try:
+            for file_csv_convert_id in list_file_csv_convert_id:
+                for index, name in enumerate(list_name):
+                    value = shared_convert_table_backend.find(Store, file_csv_convert_id.value, f"{name}{index}")
+                    assert value is not None
+                    assert value.name_zaim == file_csv_convert_id.name
+        finally:
+            shared_convert_table_backend.close()
@@ -0,0 +1,71 @@
+"""Tests for spool.py."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from zaimcsvconverter.spool import LeaseRenewer
+from zaimcsvconverter.spool import Spool
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestSpool:
+    """Tests for Spool."""
+
+    @staticmethod
+    def test_claim(tmp_path: Path) -> None:
+        """Each input CSV file should be claimed by only one worker."""
+        set_name = {f"waon{index:03}.csv" for index in range(100)}
+        for name in set_name:
+            (tmp_path / name).write_text("", encoding="UTF-8")
+        spool = Spool(tmp_path)
+
+        def claim_all(worker_id: str) -> list[str]:
+            list_name = []
+            while (path_lease := spool.claim(worker_id)) is not None:
+                list_name.append(path_lease.name)
+            return list_name
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list_list_name = list(executor.map(claim_all, [f"worker{index}" for index in range(4)]))
+        list_name_claimed = [name for list_name in list_list_name for name in list_name]
+        assert sorted(list_name_claimed) == sorted(set_name)
+        assert len(spool.list_lease()) == len(set_name)
+
+    @staticmethod
+    def test_reclaim_expired(tmp_path: Path) -> None:
+        """Expired lease should be returned into spool and its worker should fail to complete."""
+        (tmp_path / "waon201808.csv").write_text("", encoding="UTF-8")
+        spool = Spool(tmp_path)
+        path_lease = spool.claim("crashed")
+        assert path_lease is not None
+        assert spool.reclaim_expired(60.0) == []
+        os.utime(path_lease, (0, 0))
+        assert spool.reclaim_expired(60.0) == [tmp_path / "waon201808.csv"]
+        assert not spool.complete(path_lease)
+        path_lease = spool.claim("worker")
+        assert path_lease is not None
+        assert spool.complete(path_lease)
+        assert (tmp_path / Spool.DIRECTORY_NAME_DONE / "waon201808.csv").is_file()
+        assert spool.claim("worker") is None
+
+
+class TestLeaseRenewer:
+    """Tests for LeaseRenewer."""
+
+    @staticmethod
+    def test(tmp_path: Path) -> None:
+        """Lease should be renewed while converting."""
+        (tmp_path / "waon201808.csv").write_text("", encoding="UTF-8")
+        spool = Spool(tmp_path)
+        path_lease = spool.claim("worker")
+        assert path_lease is not None
+        os.utime(path_lease, (0, 0))
+        with LeaseRenewer(path_lease, 0.01):
+            while path_lease.stat().st_mtime == 0:
+                pass
+        assert spool.reclaim_expired(60.0) == []
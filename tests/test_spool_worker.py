@@ -0,0 +1,96 @@
+"""Tests for spool_worker.py."""
+
+from __future__ import annotations
+
+import json
+import shutil
+from typing import TYPE_CHECKING
+
+import pytest
+
+from zaimcsvconverter import CONFIG
+from zaimcsvconverter.convert_table_cache import ConvertTableCache
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.errorreporters.convert_result import ConvertResult
+from zaimcsvconverter.exceptions import SomeInvalidInputCsvError
+from zaimcsvconverter.models import initialize_database
+from zaimcsvconverter.spool import Spool
+from zaimcsvconverter.spool_worker import ErrorFragments
+from zaimcsvconverter.spool_worker import SpoolWorker
+from zaimcsvconverter.workspace import Workspace
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestSpoolWorker:
+    """Tests for SpoolWorker."""
+
+    @pytest.fixture
+    def workspace(self, resource_path_root: Path, tmp_path: Path) -> Workspace:
+        """Prepare copy of workspace which spool has valid and invalid input CSV files."""
+        shutil.copytree(resource_path_root / "test_spool_worker", tmp_path, dirs_exist_ok=True)
+        shutil.copyfile(resource_path_root / "config.yml.dist", tmp_path / "config.yml")
+        workspace = Workspace.create(tmp_path)
+        workspace.directory_csv_output.mkdir()
+        return workspace
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_run(workspace: Workspace) -> None:
+        """All input CSV files should be converted, then errors should be reported by merging fragments."""
+        spool_worker = SpoolWorker(workspace, worker_id="worker")
+        assert spool_worker.run(interval=0.01) == [
+            workspace.directory_csv_input / "waon201808.csv",
+            workspace.directory_csv_input / "waon201809.csv",
+        ]
+        assert "イオンスタイル　板橋前野町" in (workspace.directory_csv_output / "waon201808.csv").read_text("UTF-8")
+        assert sorted(path.name for path in (workspace.directory_csv_input / Spool.DIRECTORY_NAME_DONE).iterdir()) == [
+            "waon201808.csv",
+            "waon201809.csv",
+        ]
+        error_fragments = ErrorFragments(workspace.directory_csv_output)
+        with pytest.raises(SomeInvalidInputCsvError):
+            error_fragments.report()
+        path_error_csv = workspace.directory_csv_output / "error_undefined_content.csv"
+        error_undefined_content = path_error_csv.read_text("UTF-8")
+        assert "未定義店舗" in error_undefined_content
+        assert "板橋前野町" not in error_undefined_content
+        assert list(error_fragments.directory.iterdir()) == []
+        error_fragments.report()
+        assert not path_error_csv.exists()
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_convert_lease_expired(workspace: Workspace, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Worker whose lease has expired should not overwrite error fragment of worker which claimed again."""
+        spool_worker = SpoolWorker(workspace, worker_id="worker")
+        CONFIG.load(workspace.path_file_config)
+        CONVERT_TABLE_INDEX.configure(CONFIG.store_categories)
+        initialize_database()
+        ConvertTableCache(workspace.directory_csv_convert).execute()
+        path_lease = spool_worker.spool.claim("worker")
+        assert path_lease is not None
+        path_fragment = spool_worker.error_fragments.directory / f"{path_lease.name}.json"
+        convert_result = ConvertResult(is_invalid=True, list_invalid_row=[[path_lease.name, 2, "Reported by other."]])
+        spool_worker.error_fragments.publish(
+            path_lease.name,
+            spool_worker.error_fragments.write(path_lease.name, convert_result, "other"),
+        )
+        monkeypatch.setattr(spool_worker.spool, "complete", lambda _path_lease: False)
+        assert not spool_worker.convert(path_lease)
+        assert json.loads(path_fragment.read_text(encoding="UTF-8")) == convert_result.to_dict()
+        assert list(spool_worker.error_fragments.directory.iterdir()) == [path_fragment]
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_run_expired(workspace: Workspace) -> None:
+        """Input CSV file of crashed worker should be converted after its lease expires."""
+        path_lease = Spool(workspace.directory_csv_input).claim("crashed")
+        assert path_lease is not None
+        spool_worker = SpoolWorker(workspace, worker_id="worker", lease_seconds=0.2)
+        assert spool_worker.run(interval=0.01) == [
+            workspace.directory_csv_input / "waon201809.csv",
+            workspace.directory_csv_input / "waon201808.csv",
+        ]
+        assert not path_lease.exists()
@@ -0,0 +1,22 @@
+"""Tests for store_classifier.py."""
+
+from __future__ import annotations
+
+from zaimcsvconverter.config import StoreCategoryConfig
+from zaimcsvconverter.store_classifier import StoreClassifier
+
+
+class TestStoreClassifier:
+    """Tests for StoreClassifier."""
+
+    @staticmethod
+    def test_classify() -> None:
+        """Store should be classified by built-in rules and rules in configuration."""
+        store_classifier = StoreClassifier.create(
+            [StoreCategoryConfig("steam", ["ＳＴＥＡＭ"], r"STEAM\s*GAMES"), StoreCategoryConfig("kyash", ["Kyash"])],  # noqa: RUF001
+        )
+        assert store_classifier.classify("PAYPAL *STEAM GAMES") == {"pay_pal", "steam"}
+        assert store_classifier.classify("ＳＴＥＡＭ") == {"steam"}  # noqa: RUF001
+        assert store_classifier.classify("Kyash") == {"kyash"}
+        assert store_classifier.classify("ＫＹＡＳＨ") == {"kyash"}  # noqa: RUF001
+        assert store_classifier.classify("東京電力  電気料金等") == frozenset()
@@ -0,0 +1,49 @@
+"""Tests for zaim_csv_batch_converter.py."""
+
+from __future__ import annotations
+
+import shutil
+from typing import TYPE_CHECKING
+
+import pytest
+
+from zaimcsvconverter.exceptions import SomeInvalidInputCsvError
+from zaimcsvconverter.workspace import Workspace
+from zaimcsvconverter.zaim_csv_batch_converter import ZaimCsvBatchConverter
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestZaimCsvBatchConverter:
+    """Tests for ZaimCsvBatchConverter."""
+
+    @pytest.fixture
+    def list_workspace(self, resource_path_root: Path, tmp_path: Path) -> list[Workspace]:
+        """Prepare copy of workspaces which have different configuration and convert tables."""
+        shutil.copytree(resource_path_root / "test_zaim_csv_batch_converter", tmp_path, dirs_exist_ok=True)
+        list_workspace = [Workspace.create(tmp_path / "household_a"), Workspace.create(tmp_path / "household_b")]
+        for workspace in list_workspace:
+            workspace.directory_csv_output.mkdir()
+        return list_workspace
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test(list_workspace: list[Workspace], *, parallel: bool) -> None:
+        """Each workspace should be converted by its own configuration and convert tables.
+
+        Invalid input CSV file of one workspace should not affect other workspace.
+        """
+        workspace_a, workspace_b = list_workspace
+        with pytest.raises(SomeInvalidInputCsvError) as excinfo:
+            ZaimCsvBatchConverter(list_workspace, parallel=parallel, max_workers=2).execute()
+        assert str(workspace_b.directory_csv_output) in str(excinfo.value)
+        assert str(workspace_a.directory_csv_output) not in str(excinfo.value)
+        zaim_csv_a = (workspace_a.directory_csv_output / "waon201808.csv").read_text("UTF-8")
+        assert "WAON_A" in zaim_csv_a
+        assert "イオンスタイル　板橋前野町" in zaim_csv_a
+        assert not (workspace_a.directory_csv_output / "error_undefined_content.csv").exists()
+        zaim_csv_b = (workspace_b.directory_csv_output / "waon201808.csv").read_text("UTF-8")
+        assert "WAON_B" in zaim_csv_b
+        assert "板橋前野町" in (workspace_b.directory_csv_output / "error_undefined_content.csv").read_text("UTF-8")
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import csv
+import shutil
 from logging import getLogger
 from pathlib import Path
 
@@ -42,8 +43,15 @@ from tests.testlibraries.integration_test_expected_factory import create_zaim_ro
 from tests.testlibraries.output_csv_file_checker import ErrorCsvFileChecker
 from tests.testlibraries.output_csv_file_checker import ZaimCsvFileChecker
 from tests.testlibraries.row_data import InvalidRowErrorRowData
+from zaimcsvconverter.convert_table_importer import ConvertTableImporter
+from zaimcsvconverter.csvconverter.process_pool_csv_converter import bind_new_database_engine
+from zaimcsvconverter.errorreporters.error_totalizer import FileNameForError
+from zaimcsvconverter.exceptions import InvalidConvertTableError
 from zaimcsvconverter.exceptions import SomeInvalidInputCsvError
+from zaimcsvconverter.workspace import Workspace
+from zaimcsvconverter.zaim_csv_converter import MergeMode
 from zaimcsvconverter.zaim_csv_converter import ZaimCsvConverter
+from zaimcsvconverter.zaim_csv_merger import ZaimCsvMerger
 
 
 def create_relative_deploy_file_path(
@@ -179,3 +187,296 @@ class TestZaimCsvConverter:
                 ),
             ],
         )
+
+
+class TestZaimCsvConverterParallel:
+    """Tests for ZaimCsvConverter in parallel mode."""
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.usefixtures(
+        "_yaml_config_file",
+        "directory_csv_convert_table",
+        "directory_csv_input",
+        "database_session",
+    )
+    def test_success(directory_csv_output: RelativeDeployFilePath) -> None:
+        """Output CSV files should be byte-identical to the ones of sequential mode."""
+        ZaimCsvConverter.execute()
+        expected = TestZaimCsvConverterParallel.read_files(directory_csv_output)
+        TestZaimCsvConverterParallel.remove_files(directory_csv_output)
+        ZaimCsvConverter.execute(parallel=True, max_workers=2)
+        assert TestZaimCsvConverterParallel.read_files(directory_csv_output) == expected
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.usefixtures(
+        "_yaml_config_file",
+        "directory_csv_convert_table",
+        "directory_csv_input",
+        "database_session",
+    )
+    def test_fail(directory_csv_output: RelativeDeployFilePath) -> None:
+        """Output CSV files and error CSV files should be byte-identical to the ones of sequential mode."""
+        with pytest.raises(SomeInvalidInputCsvError):
+            ZaimCsvConverter.execute()
+        expected = TestZaimCsvConverterParallel.read_files(directory_csv_output)
+        TestZaimCsvConverterParallel.remove_files(directory_csv_output)
+        with pytest.raises(SomeInvalidInputCsvError) as error:
+            ZaimCsvConverter.execute(parallel=True, max_workers=2)
+        assert str(error.value) == "Some invalid input CSV file exists. Please check error_invalid_row.csv."
+        assert TestZaimCsvConverterParallel.read_files(directory_csv_output) == expected
+
+    @staticmethod
+    def read_files(directory_csv_output: RelativeDeployFilePath) -> dict[str, bytes]:
+        return {path.name: path.read_bytes() for path in sorted(directory_csv_output.target.glob("*.csv"))}
+
+    @staticmethod
+    def remove_files(directory_csv_output: RelativeDeployFilePath) -> None:
+        for path in directory_csv_output.target.glob("*.csv"):
+            path.unlink()
+
+
+class TestZaimCsvConverterPipelined:
+    """Tests for ZaimCsvConverter in pipelined mode."""
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.usefixtures(
+        "_yaml_config_file",
+        "directory_csv_convert_table",
+        "directory_csv_input",
+        "database_session",
+    )
+    def test_success(directory_csv_output: RelativeDeployFilePath) -> None:
+        """Output CSV files should be byte-identical to the ones of sequential mode."""
+        ZaimCsvConverter.execute()
+        expected = TestZaimCsvConverterParallel.read_files(directory_csv_output)
+        TestZaimCsvConverterParallel.remove_files(directory_csv_output)
+        ZaimCsvConverter.execute(pipelined=True)
+        assert TestZaimCsvConverterParallel.read_files(directory_csv_output) == expected
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.usefixtures(
+        "_yaml_config_file",
+        "directory_csv_convert_table",
+        "directory_csv_input",
+        "database_session",
+    )
+    def test_fail(directory_csv_output: RelativeDeployFilePath) -> None:
+        """Output CSV files and error CSV files should be byte-identical to the ones of sequential mode."""
+        with pytest.raises(SomeInvalidInputCsvError):
+            ZaimCsvConverter.execute()
+        expected = TestZaimCsvConverterParallel.read_files(directory_csv_output)
+        TestZaimCsvConverterParallel.remove_files(directory_csv_output)
+        with pytest.raises(SomeInvalidInputCsvError):
+            ZaimCsvConverter.execute(pipelined=True)
+        assert TestZaimCsvConverterParallel.read_files(directory_csv_output) == expected
+
+
+class TestZaimCsvConverterIncremental:
+    """Tests for ZaimCsvConverter in incremental mode."""
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.usefixtures(
+        "_yaml_config_file",
+        "directory_csv_convert_table",
+        "directory_csv_input",
+        "database_session",
+    )
+    def test_success(directory_csv_output: RelativeDeployFilePath, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Unchanged input CSV files should be skipped without importing convert tables."""
+        ZaimCsvConverter.execute(incremental=True)
+        expected = TestZaimCsvConverterParallel.read_files(directory_csv_output)
+        monkeypatch.setattr(ConvertTableImporter, "execute_all", TestZaimCsvConverterIncremental.fail)
+        ZaimCsvConverter.execute(incremental=True)
+        assert TestZaimCsvConverterParallel.read_files(directory_csv_output) == expected
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.usefixtures(
+        "_yaml_config_file",
+        "directory_csv_convert_table",
+        "directory_csv_input",
+        "database_session",
+    )
+    def test_fail(directory_csv_output: RelativeDeployFilePath, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Errors of skipped input CSV files should be reported again."""
+        with pytest.raises(SomeInvalidInputCsvError):
+            ZaimCsvConverter.execute(incremental=True)
+        expected = TestZaimCsvConverterParallel.read_files(directory_csv_output)
+        for path in directory_csv_output.target.glob("error_*.csv"):
+            path.unlink()
+        monkeypatch.setattr(ConvertTableImporter, "execute_all", TestZaimCsvConverterIncremental.fail)
+        with pytest.raises(SomeInvalidInputCsvError):
+            ZaimCsvConverter.execute(incremental=True)
+        assert TestZaimCsvConverterParallel.read_files(directory_csv_output) == expected
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.usefixtures(
+        "_yaml_config_file",
+        "directory_csv_convert_table",
+        "directory_csv_input",
+        "database_session",
+    )
+    def test_fail_undefined_content(directory_csv_output: RelativeDeployFilePath) -> None:
+        """Undefined contents of skipped input CSV files should be reported with suggestions on new process."""
+        with pytest.raises(SomeInvalidInputCsvError):
+            ZaimCsvConverter.execute(incremental=True)
+        expected = TestZaimCsvConverterParallel.read_files(directory_csv_output)
+        assert "ファミリーマートかぶと町永代" in expected[FileNameForError.UNDEFINED_CONTENT.value].decode("UTF-8")
+        for path in directory_csv_output.target.glob("error_*.csv"):
+            path.unlink()
+        # Database of new process has no table until convert tables are imported.
+        bind_new_database_engine()
+        with pytest.raises(SomeInvalidInputCsvError):
+            ZaimCsvConverter.execute(incremental=True)
+        assert TestZaimCsvConverterParallel.read_files(directory_csv_output) == expected
+
+    @staticmethod
+    def fail(directory_csv_convert: Path) -> None:
+        msg = f"Convert tables should not be imported: {directory_csv_convert}"
+        raise AssertionError(msg)
+
+
+class TestZaimCsvConverterSharded:
+    """Tests for ZaimCsvConverter in sharded mode."""
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.usefixtures(
+        "_yaml_config_file",
+        "directory_csv_convert_table",
+        "directory_csv_input",
+        "database_session",
+    )
+    def test_success(directory_csv_output: RelativeDeployFilePath) -> None:
+        """Output CSV files should be byte-identical to the ones of sequential mode."""
+        ZaimCsvConverter.execute()
+        expected = TestZaimCsvConverterParallel.read_files(directory_csv_output)
+        TestZaimCsvConverterParallel.remove_files(directory_csv_output)
+        ZaimCsvConverter.execute(shard_size=2, max_workers=2)
+        assert TestZaimCsvConverterParallel.read_files(directory_csv_output) == expected
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.usefixtures(
+        "_yaml_config_file",
+        "directory_csv_convert_table",
+        "directory_csv_input",
+        "database_session",
+    )
+    def test_fail(directory_csv_output: RelativeDeployFilePath) -> None:
+        """Output CSV files and error CSV files should be byte-identical to the ones of sequential mode."""
+        with pytest.raises(SomeInvalidInputCsvError):
+            ZaimCsvConverter.execute()
+        expected = TestZaimCsvConverterParallel.read_files(directory_csv_output)
+        TestZaimCsvConverterParallel.remove_files(directory_csv_output)
+        with pytest.raises(SomeInvalidInputCsvError):
+            ZaimCsvConverter.execute(shard_size=2, max_workers=2)
+        assert TestZaimCsvConverterParallel.read_files(directory_csv_output) == expected
+
+    @staticmethod
+    def test_parallel() -> None:
+        """Sharding should not be used with parallel mode."""
+        with pytest.raises(ValueError, match=r"can't be used together"):
+            ZaimCsvConverter.execute(parallel=True, shard_size=2)
+
+
+class TestZaimCsvConverterMerged:
+    """Tests for ZaimCsvConverter which merges Zaim CSV files."""
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.usefixtures(
+        "_yaml_config_file",
+        "directory_csv_convert_table",
+        "directory_csv_input",
+        "database_session",
+    )
+    def test_success(directory_csv_output: RelativeDeployFilePath, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Merged Zaim CSV file should consist rows of all Zaim CSV files ordered by date.
+
+        Already converted files should be merged without converting again in incremental mode.
+        """
+        ZaimCsvConverter.execute(parallel=True, max_workers=2, incremental=True, merge_mode=MergeMode.ALSO)
+        path_merged = directory_csv_output.target / ZaimCsvMerger.FILE_NAME
+        list_row = TestZaimCsvConverterMerged.read_rows(path_merged)
+        list_path = [path for path in directory_csv_output.target.glob("*.csv") if path != path_merged]
+        assert sorted(list_row) == sorted(
+            row for path in list_path for row in TestZaimCsvConverterMerged.read_rows(path)
+        )
+        assert [row[0] for row in list_row] == sorted(row[0] for row in list_row)
+        expected = path_merged.read_bytes()
+        path_merged.unlink()
+        monkeypatch.setattr(ConvertTableImporter, "execute_all", TestZaimCsvConverterIncremental.fail)
+        ZaimCsvConverter.execute(parallel=True, max_workers=2, incremental=True, merge_mode=MergeMode.ALSO)
+        assert path_merged.read_bytes() == expected
+
+    @staticmethod
+    def read_rows(path: Path) -> list[list[str]]:
+        with path.open("r", encoding="UTF-8", newline="") as file:
+            reader = csv.reader(file)
+            next(reader)
+            return list(reader)
+
+
+class TestZaimCsvConverterMergedInstead:
+    """Tests for ZaimCsvConverter which outputs only merged Zaim CSV file."""
+
+    # pylint: disable=unused-argument
+    @staticmethod
+    @pytest.mark.usefixtures(
+        "_yaml_config_file",
+        "directory_csv_convert_table",
+        "directory_csv_input",
+        "database_session",
+    )
+    def test_fail(directory_csv_output: RelativeDeployFilePath) -> None:
+        """Zaim CSV file of each input CSV file should be output into subdirectory.
+
+        Rows of invalid input CSV files which have been converted should be merged, and errors should be reported.
+        """
+        with pytest.raises(SomeInvalidInputCsvError):
+            ZaimCsvConverter.execute()
+        expected = TestZaimCsvConverterParallel.read_files(directory_csv_output)
+        TestZaimCsvConverterParallel.remove_files(directory_csv_output)
+        with pytest.raises(SomeInvalidInputCsvError):
+            ZaimCsvConverter.execute(merge_mode=MergeMode.INSTEAD)
+        directory_each = directory_csv_output.target / ZaimCsvConverter.DIRECTORY_NAME_EACH
+        assert {path.name for path in directory_csv_output.target.glob("*.csv")} == {
+            ZaimCsvMerger.FILE_NAME,
+            *(name for name in expected if name.startswith("error_")),
+        }
+        assert {path.name: path.read_bytes() for path in sorted(directory_each.glob("*.csv"))} == {
+            name: content for name, content in expected.items() if not name.startswith("error_")
+        }
+
+
+class TestZaimCsvConverterInvalidConvertTable:
+    """Tests for ZaimCsvConverter when convert table CSV is invalid."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_fail(resource_path_root: Path, tmp_path: Path) -> None:
+        """Errors of convert table CSV should be exported into CSV with file name and line number until fixed."""
+        workspace = Workspace.create(tmp_path)
+        shutil.copy(resource_path_root / "config.yml.dist", workspace.path_file_config)
+        shutil.copytree(resource_path_root / "test_spool_worker" / "csvinput", workspace.directory_csv_input)
+        workspace.directory_csv_convert.mkdir()
+        workspace.directory_csv_output.mkdir()
+        (workspace.directory_csv_convert / "waon.csv").write_text("store1\nstore2\nstore1\n", encoding="UTF-8")
+        with pytest.raises(InvalidConvertTableError):
+            ZaimCsvConverter.execute(workspace=workspace)
+        path_report = workspace.directory_csv_output / FileNameForError.CONVERT_TABLE.value
+        with path_report.open(encoding="UTF-8") as file:
+            assert list(csv.reader(file)) == [
+                ["waon.csv", "3", "Name has already been defined on line 1. Name = store1"],
+            ]
+        (workspace.directory_csv_convert / "waon.csv").write_text("store1\nstore2\n", encoding="UTF-8")
+        with pytest.raises(SomeInvalidInputCsvError):
+            ZaimCsvConverter.execute(workspace=workspace)
+        assert not path_report.exists()
@@ -0,0 +1,202 @@
+"""Tests for zaim_csv_converter_watcher.py."""
+
+from __future__ import annotations
+
+import shutil
+import sqlite3
+from threading import Event
+from threading import Thread
+from typing import TYPE_CHECKING
+
+import pytest
+
+from zaimcsvconverter.models import FileCsvConvertId
+from zaimcsvconverter.models import Store
+from zaimcsvconverter.zaim_csv_converter_watcher import ZaimCsvConverterWatcher
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestZaimCsvConverterWatcher:
+    """Tests for ZaimCsvConverterWatcher."""
+
+    @pytest.fixture
+    def watcher(self, resource_path_root: Path, tmp_path: Path) -> ZaimCsvConverterWatcher:
+        """Prepare watcher which watches copy of convert table CSV and input CSV."""
+        shutil.copytree(resource_path_root / "test_zaim_csv_converter_watcher", tmp_path, dirs_exist_ok=True)
+        (tmp_path / "csvoutput").mkdir()
+        return ZaimCsvConverterWatcher(
+            tmp_path / "csvinput",
+            tmp_path / "csvconverttable",
+            tmp_path / "csvoutput",
+            resource_path_root / "config.yml.dist",
+        )
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_start(watcher: ZaimCsvConverterWatcher) -> None:
+        """All input CSV files should be converted when watching starts, nothing should be converted by polling."""
+        assert watcher.start() == [watcher.directory_csv_input / "waon201808.csv"]
+        assert "イオンスタイル　板橋前野町" in (watcher.directory_csv_output / "waon201808.csv").read_text("UTF-8")
+        assert watcher.poll() == []
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_poll_input_csv(watcher: ZaimCsvConverterWatcher) -> None:
+        """Only added or changed input CSV files should be converted."""
+        watcher.start()
+        path_csv_file = watcher.directory_csv_input / "waon201809.csv"
+        shutil.copyfile(watcher.directory_csv_input / "waon201808.csv", path_csv_file)
+        assert watcher.poll() == [path_csv_file]
+        assert (watcher.directory_csv_output / "waon201809.csv").is_file()
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_poll_convert_table_csv(watcher: ZaimCsvConverterWatcher) -> None:
+        """Input CSV files should be converted again by reloaded convert table only when they depend on it."""
+        watcher.start()
+        (watcher.directory_csv_convert / "amazon.csv").write_text("Echo Dot,大型出費,家電\n", encoding="UTF-8")
+        assert watcher.poll() == []
+        path_csv_convert = watcher.directory_csv_convert / "waon.csv"
+        path_csv_convert.write_text(
+            path_csv_convert.read_text("UTF-8").replace("イオンスタイル　板橋前野町", "イオン板橋前野町店"),
+            encoding="UTF-8",
+        )
+        assert watcher.poll() == [watcher.directory_csv_input / "waon201808.csv"]
+        assert "イオン板橋前野町店" in (watcher.directory_csv_output / "waon201808.csv").read_text("UTF-8")
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_poll_convert_table_csv_removed(watcher: ZaimCsvConverterWatcher) -> None:
+        """Errors should be reported into error CSV when convert table CSV is removed."""
+        watcher.start()
+        (watcher.directory_csv_convert / "waon.csv").unlink()
+        assert watcher.poll() == [watcher.directory_csv_input / "waon201808.csv"]
+        assert "板橋前野町" in (watcher.directory_csv_output / "error_undefined_content.csv").read_text("UTF-8")
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_poll_error_of_unchanged_input_csv(watcher: ZaimCsvConverterWatcher) -> None:
+        """Errors of input CSV files which aren't changed should be kept, error CSV should be removed once fixed."""
+        watcher.start()
+        path_csv_file_unchanged = watcher.directory_csv_input / "waon201808.csv"
+        path_csv_file = watcher.directory_csv_input / "waon201809.csv"
+        path_csv_file.write_text(
+            path_csv_file_unchanged.read_text("UTF-8").replace("板橋前野町", "ファミリーマートかぶと町永大"),
+            encoding="UTF-8",
+        )
+        path_error_csv = watcher.directory_csv_output / "error_undefined_content.csv"
+        assert watcher.poll() == [path_csv_file]
+        assert "ファミリーマートかぶと町永大" in path_error_csv.read_text("UTF-8")
+        path_csv_file_unchanged.write_text(path_csv_file_unchanged.read_text("UTF-8") + "\n", encoding="UTF-8")
+        assert watcher.poll() == [path_csv_file_unchanged]
+        assert "ファミリーマートかぶと町永大" in path_error_csv.read_text("UTF-8")
+        path_csv_file.unlink()
+        assert watcher.poll() == []
+        assert not path_error_csv.exists()
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_poll_convert_table_csv_invalid(watcher: ZaimCsvConverterWatcher) -> None:
+        """Invalid convert table CSV should not prevent others from reloading, and should be reloaded once fixed."""
+        watcher.start()
+        path_csv_convert_invalid = watcher.directory_csv_convert / "amazon.csv"
+        path_csv_convert_invalid.write_text("Echo Dot\nEcho Dot\n", encoding="UTF-8")
+        path_csv_convert = watcher.directory_csv_convert / "waon.csv"
+        path_csv_convert.write_text(
+            path_csv_convert.read_text("UTF-8").replace("イオンスタイル　板橋前野町", "イオン板橋前野町店"),
+            encoding="UTF-8",
+        )
+        assert watcher.poll() == [watcher.directory_csv_input / "waon201808.csv"]
+        assert "イオン板橋前野町店" in (watcher.directory_csv_output / "waon201808.csv").read_text("UTF-8")
+        assert path_csv_convert_invalid not in watcher.snapshot_convert
+        assert watcher.poll() == []
+        path_csv_convert_invalid.write_text("Echo Dot,大型出費,家電\n", encoding="UTF-8")
+        watcher.poll()
+        assert path_csv_convert_invalid in watcher.snapshot_convert
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_poll_convert_table_source(resource_path_root: Path, tmp_path: Path) -> None:
+        """Table in configuration should be reloaded when it is changed or removed from configuration.
+
+        Reloading convert table CSV should keep rows imported from table.
+        """
+        shutil.copytree(resource_path_root / "test_zaim_csv_converter_watcher", tmp_path, dirs_exist_ok=True)
+        (tmp_path / "csvoutput").mkdir()
+        path_csv_convert = tmp_path / "csvconverttable" / "waon.csv"
+        path_csv_convert.write_text(
+            "".join(line for line in path_csv_convert.open(encoding="UTF-8") if not line.startswith("板橋前野町")),
+            encoding="UTF-8",
+        )
+        path_database = tmp_path / "master.sqlite3"
+        with sqlite3.connect(path_database) as connection:
+            connection.execute("CREATE TABLE store (name TEXT, name_zaim TEXT)")
+            connection.execute("INSERT INTO store VALUES ('板橋前野町', 'イオン板橋')")
+        connection.close()
+        config = (resource_path_root / "config.yml.dist").read_text(encoding="UTF-8")
+        path_file_config = tmp_path / "config.yml"
+        path_file_config.write_text(
+            f"{config}\nconvert_table_sources:\n"
+            f"  - {{convert_table: waon, path: '{path_database}', table: store, columns: {{name_zaim: name_zaim}}}}\n",
+            encoding="UTF-8",
+        )
+        watcher = ZaimCsvConverterWatcher(
+            tmp_path / "csvinput",
+            tmp_path / "csvconverttable",
+            tmp_path / "csvoutput",
+            path_file_config,
+        )
+        path_csv_file = watcher.directory_csv_input / "waon201808.csv"
+        path_zaim_csv = watcher.directory_csv_output / "waon201808.csv"
+        watcher.start()
+        assert "イオン板橋" in path_zaim_csv.read_text("UTF-8")
+        assert watcher.poll() == []
+        with sqlite3.connect(path_database) as connection:
+            connection.execute("UPDATE store SET name_zaim = 'イオン板橋前野町店'")
+        connection.close()
+        assert watcher.poll() == [path_csv_file]
+        assert "イオン板橋前野町店" in path_zaim_csv.read_text("UTF-8")
+        path_csv_convert.write_text("幕張新都心,イオンモール幕張新都心,食費,食料品,その他\n", encoding="UTF-8")
+        assert watcher.poll() == [path_csv_file]
+        assert "イオン板橋前野町店" in path_zaim_csv.read_text("UTF-8")
+        path_file_config.write_text(config, encoding="UTF-8")
+        assert watcher.poll() == [path_csv_file]
+        assert "板橋前野町" in (watcher.directory_csv_output / "error_undefined_content.csv").read_text("UTF-8")
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_poll_config_store_categories(resource_path_root: Path, tmp_path: Path) -> None:
+        """Stores should be classified again by categories in configuration when configuration is reloaded."""
+        shutil.copytree(resource_path_root / "test_zaim_csv_converter_watcher", tmp_path, dirs_exist_ok=True)
+        (tmp_path / "csvoutput").mkdir()
+        config = (resource_path_root / "config.yml.dist").read_text(encoding="UTF-8")
+        path_file_config = tmp_path / "config.yml"
+        path_file_config.write_text(config, encoding="UTF-8")
+        watcher = ZaimCsvConverterWatcher(
+            tmp_path / "csvinput",
+            tmp_path / "csvconverttable",
+            tmp_path / "csvoutput",
+            path_file_config,
+        )
+        watcher.start()
+        assert Store.try_to_find(FileCsvConvertId.WAON, "板橋前野町").categories == frozenset()
+        path_file_config.write_text(
+            f"{config}\nstore_categories:\n  - {{category: aeon, pattern: 前野町}}\n",
+            encoding="UTF-8",
+        )
+        assert watcher.poll() == [watcher.directory_csv_input / "waon201808.csv"]
+        assert Store.try_to_find(FileCsvConvertId.WAON, "板橋前野町").categories == frozenset(["aeon"])
+
+    @staticmethod
+    @pytest.mark.usefixtures("database_session")
+    def test_watch(watcher: ZaimCsvConverterWatcher) -> None:
+        """Watching should stop when stop event is set."""
+        stop_event = Event()
+        thread = Thread(target=watcher.watch, args=(0.01, stop_event))
+        thread.start()
+        stop_event.set()
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+        assert (watcher.directory_csv_output / "waon201808.csv").is_file()
@@ -0,0 +1,84 @@
+"""Tests for zaim_csv_merger.py."""
+
+from __future__ import annotations
+
+import csv
+from typing import TYPE_CHECKING
+
+from zaimcsvconverter.inputtooutput.exporters.zaim.csvfile.zaim_csv_format import ZaimCsvFormat
+from zaimcsvconverter.zaim_csv_merger import ZaimCsvMerger
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestZaimCsvMerger:
+    """Tests for ZaimCsvMerger."""
+
+    @staticmethod
+    def test_sorted(tmp_path: Path) -> None:
+        """Rows should be ordered by date and rows of same date should keep order of files."""
+        path_a = TestZaimCsvMerger.write(tmp_path / "a.csv", [("2018-08-01", "a1"), ("2018-08-03", "a2")])
+        path_b = TestZaimCsvMerger.write(tmp_path / "b.csv", [("2018-08-01", "b1"), ("2018-08-02", "b2")])
+        path_output = tmp_path / ZaimCsvMerger.FILE_NAME
+        ZaimCsvMerger().execute([path_a, path_b], path_output)
+        assert TestZaimCsvMerger.read(path_output) == [
+            ("2018-08-01", "a1"),
+            ("2018-08-01", "b1"),
+            ("2018-08-02", "b2"),
+            ("2018-08-03", "a2"),
+        ]
+
+    @staticmethod
+    def test_unsorted(tmp_path: Path) -> None:
+        """File which isn't ordered by date should be split into sorted runs and merged stably."""
+        list_row = [
+            ("2018-08-05", "a1"),
+            ("2018-08-01", "a2"),
+            ("2018-08-03", "a3"),
+            ("2018-08-01", "a4"),
+            ("2018-08-02", "a5"),
+        ]
+        path_a = TestZaimCsvMerger.write(tmp_path / "a.csv", list_row)
+        path_b = TestZaimCsvMerger.write(tmp_path / "b.csv", [("2018-08-02", "b1")])
+        path_output = tmp_path / ZaimCsvMerger.FILE_NAME
+        ZaimCsvMerger(chunk_size=2).execute([path_a, path_b], path_output)
+        assert TestZaimCsvMerger.read(path_output) == [
+            ("2018-08-01", "a2"),
+            ("2018-08-01", "a4"),
+            ("2018-08-02", "a5"),
+            ("2018-08-02", "b1"),
+            ("2018-08-03", "a3"),
+            ("2018-08-05", "a1"),
+        ]
+        assert TestZaimCsvMerger.read(path_a) == list_row
+
+    @staticmethod
+    def test_empty(tmp_path: Path) -> None:
+        """Output should consist only of header when there are no Zaim CSV files."""
+        path_output = tmp_path / ZaimCsvMerger.FILE_NAME
+        ZaimCsvMerger().execute([], path_output)
+        assert path_output.read_text(encoding="UTF-8") == ",".join(ZaimCsvFormat.HEADER) + "\n"
+
+    @staticmethod
+    def write(path: Path, list_row: list[tuple[str, str]]) -> Path:
+        """Write Zaim CSV file which has date and note of each row."""
+        index_note = ZaimCsvFormat.HEADER.index("メモ")
+        with path.open("w", encoding="UTF-8", newline="\n") as file:
+            writer = csv.writer(file)
+            writer.writerow(ZaimCsvFormat.HEADER)
+            for date, note in list_row:
+                row = [""] * len(ZaimCsvFormat.HEADER)
+                row[ZaimCsvMerger.INDEX_DATE] = date
+                row[index_note] = note
+                writer.writerow(row)
+        return path
+
+    @staticmethod
+    def read(path: Path) -> list[tuple[str, str]]:
+        """Read date and note of each row of Zaim CSV file."""
+        index_note = ZaimCsvFormat.HEADER.index("メモ")
+        with path.open("r", encoding="UTF-8", newline="") as file:
+            reader = csv.reader(file)
+            next(reader)
+            return [(row[ZaimCsvMerger.INDEX_DATE], row[index_note]) for row in reader]
@@ -5,9 +5,10 @@ from __future__ import annotations
 import contextlib
 from typing import TYPE_CHECKING
 
-import sqlalchemy
 from sqlalchemy.engine.base import Engine
 
+from zaimcsvconverter import create_database_engine
+
 if TYPE_CHECKING:
     from types import TracebackType
 
@@ -25,7 +26,7 @@ class DatabaseEngineManager(contextlib.AbstractContextManager[Engine]):
 
     def __init__(self, argument_scoped_session: scoped_session[Session]) -> None:
         self.scoped_session = argument_scoped_session
-        self.engine = sqlalchemy.create_engine("sqlite://")
+        self.engine = create_database_engine()
 
     def __enter__(self) -> Engine:
         self.scoped_session.configure(bind=self.engine)
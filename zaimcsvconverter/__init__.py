@@ -4,16 +4,34 @@ from enum import Enum
 from pathlib import Path
 from types import DynamicClassAttribute
 
+from sqlalchemy import Engine
 from sqlalchemy import create_engine
 from sqlalchemy.orm import scoped_session
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from zaimcsvconverter.config import Config
 
+
+def create_database_engine() -> Engine:
+    """Create engine of in-memory SQLite database which is shared between threads.
+
+    Single connection is shared so that every thread sees the same in-memory database,
+    e.g. threads of pipelined workflow and threads which handle requests of conversion server.
+    SQLite connection can't be used by threads at once, so that threads only look up convert tables
+    through CONVERT_TABLE_INDEX which serializes queries, and convert tables are imported before threads start.
+
+    see:
+    - Using a Memory Database in Multiple Threads | SQLAlchemy 2.0 Documentation
+      https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#using-a-memory-database-in-multiple-threads
+    """
+    return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
 # Reason: SWLAlchemy offcial documentation named as "Session".
 # - Contextual/Thread-local Sessions | SQLAlchemy 2.0 Documentation
 #   http://docs.sqlalchemy.org/en/latest/orm/contextual.html
-Session = scoped_session(sessionmaker(bind=create_engine("sqlite://")))  # pylint: disable=invalid-name
+Session = scoped_session(sessionmaker(bind=create_database_engine()))  # pylint: disable=invalid-name
 CONFIG: Config = Config.create()
 
 
@@ -13,6 +13,7 @@ from zaimcsvconverter.inputtooutput.datasources.csvfile.data import TypeVarInput
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records import TypeVarInputRow
 
 if TYPE_CHECKING:
+    from zaimcsvconverter.file_csv_convert import FileCsvConvert
     from zaimcsvconverter.inputtooutput.converters.recordtozaim import CsvRecordToZaimRowConverterFactory
     from zaimcsvconverter.inputtooutput.datasources.csvfile.converters import InputRowFactory
 
@@ -52,3 +53,6 @@ class AccountContext(Generic[TypeVarInputRowData, TypeVarInputRow]):
     input_row_data_class: type[TypeVarInputRowData]
     input_row_factory: InputRowFactory[TypeVarInputRowData, TypeVarInputRow]
     zaim_row_converter_factory: CsvRecordToZaimRowConverterFactory[TypeVarInputRow, TypeVarInputRowData]
+    # Convert table CSV files and sections of configuration which converting steps depend on
+    list_file_csv_convert: list[FileCsvConvert] = field(default_factory=list)
+    list_config_key: list[str] = field(default_factory=list)
@@ -10,6 +10,7 @@ from godslayer.god_slayer_factory import GodSlayerFactory
 
 from zaimcsvconverter import CONFIG
 from zaimcsvconverter.accounts.context import AccountContext
+from zaimcsvconverter.file_csv_convert import FileCsvConvert
 from zaimcsvconverter.inputtooutput.converters.recordtozaim.amazon import AmazonZaimRowConverterFactory
 from zaimcsvconverter.inputtooutput.converters.recordtozaim.amazon_201911 import Amazon201911ZaimRowConverterFactory
 from zaimcsvconverter.inputtooutput.converters.recordtozaim.gold_point_card_plus import (
@@ -83,6 +84,8 @@ class Account(Enum):
         WaonRowData,
         WaonRowFactory(),
         WaonZaimRowConverterFactory(),
+        list_file_csv_convert=[FileCsvConvert.WAON],
+        list_config_key=["waon"],
     )
     GOLD_POINT_CARD_PLUS = AccountContext(
         r".*gold_point_card_plus.*\.csv",
@@ -90,6 +93,8 @@ class Account(Enum):
         GoldPointCardPlusRowData,
         GoldPointCardPlusRowFactory(),
         GoldPointCardPlusZaimRowConverterFactory(),
+        list_file_csv_convert=[FileCsvConvert.GOLD_POINT_CARD_PLUS],
+        list_config_key=["gold_point_card_plus", "store_categories"],
     )
     GOLD_POINT_CARD_PLUS_201912 = AccountContext(
         r".*gold_point_card_plus_201912.*\.csv",
@@ -101,6 +106,8 @@ class Account(Enum):
         GoldPointCardPlus201912RowData,
         GoldPointCardPlus201912RowFactory(),
         GoldPointCardPlus201912ZaimRowConverterFactory(),
+        list_file_csv_convert=[FileCsvConvert.GOLD_POINT_CARD_PLUS],
+        list_config_key=["gold_point_card_plus", "store_categories"],
     )
     # fmt: off
     GOLD_POINT_CARD_PLUS_202009 = AccountContext(
@@ -116,6 +123,8 @@ class Account(Enum):
         GoldPointCardPlus201912RowData,
         GoldPointCardPlus201912RowFactory(),
         GoldPointCardPlus201912ZaimRowConverterFactory(),
+        list_file_csv_convert=[FileCsvConvert.GOLD_POINT_CARD_PLUS],
+        list_config_key=["gold_point_card_plus", "store_categories"],
     )
     MUFG = AccountContext(
         r".*mufg.*\.csv",
@@ -129,6 +138,8 @@ class Account(Enum):
         MufgRowData,
         MufgRowFactory(),
         MufgZaimRowConverterFactory(),
+        list_file_csv_convert=[FileCsvConvert.MUFG],
+        list_config_key=["mufg"],
     )
     # fmt: on
     PASMO = AccountContext(
@@ -138,6 +149,8 @@ class Account(Enum):
         # On this timing, CONFIG is not loaded. So we wrap CONFIG by lambda.
         SFCardViewerRowFactory(lambda: CONFIG.pasmo),
         SFCardViewerZaimRowConverterFactory(lambda: CONFIG.pasmo),
+        list_file_csv_convert=[FileCsvConvert.SF_CARD_VIEWER],
+        list_config_key=["pasmo"],
     )
     AMAZON = AccountContext(
         r".*amazon.*\.csv",
@@ -145,6 +158,8 @@ class Account(Enum):
         AmazonRowData,
         AmazonRowFactory(),
         AmazonZaimRowConverterFactory(),
+        list_file_csv_convert=[FileCsvConvert.AMAZON],
+        list_config_key=["amazon"],
     )
     AMAZON_201911 = AccountContext(
         r".*amazon_201911.*\.csv",
@@ -152,6 +167,8 @@ class Account(Enum):
         Amazon201911RowData,
         Amazon201911RowFactory(),
         Amazon201911ZaimRowConverterFactory(),
+        list_file_csv_convert=[FileCsvConvert.AMAZON],
+        list_config_key=["amazon"],
     )
     VIEW_CARD = AccountContext(
         r".*view_card.*\.csv",
@@ -178,6 +195,8 @@ class Account(Enum):
         ViewCardRowData,
         ViewCardRowFactory(),
         ViewCardZaimRowConverterFactory(),
+        list_file_csv_convert=[FileCsvConvert.VIEW_CARD],
+        list_config_key=["view_card"],
     )
     SUICA = AccountContext(
         r".*suica.*\.csv",
@@ -186,6 +205,8 @@ class Account(Enum):
         # On this timing, CONFIG is not loaded. So we wrap CONFIG by lambda.
         SFCardViewerRowFactory(lambda: CONFIG.suica),
         SFCardViewerZaimRowConverterFactory(lambda: CONFIG.suica),
+        list_file_csv_convert=[FileCsvConvert.SF_CARD_VIEWER],
+        list_config_key=["suica"],
     )
     PAY_PAL = AccountContext(
         r".*pay_pal.*\.csv",
@@ -193,6 +214,8 @@ class Account(Enum):
         PayPalRowData,
         PayPalRowFactory(),
         PayPalZaimRowConverterFactory(),
+        list_file_csv_convert=[FileCsvConvert.PAY_PAL_STORE, FileCsvConvert.PAY_PAL_ITEM],
+        list_config_key=["pay_pal"],
     )
     SBI_SUMISHIN_NET_BANK = AccountContext(
         r".*sbi_sumishin_net_bank.*\.csv",
@@ -203,6 +226,8 @@ class Account(Enum):
         SBISumishinNetBankRowData,
         SBISumishinNetBankRowFactory(),
         SBISumishinNetBankZaimRowConverterFactory(),
+        list_file_csv_convert=[FileCsvConvert.SBI_SUMISHIN_NET_BANK],
+        list_config_key=["sbi_sumishin_net_bank"],
     )
     # fmt: off
     PAY_PAY_CARD = AccountContext(
@@ -216,6 +241,8 @@ class Account(Enum):
         PayPayCardRowData,
         PayPayCardRowFactory(),
         PayPayCardZaimRowConverterFactory(),
+        list_file_csv_convert=[FileCsvConvert.PAY_PAY_CARD],
+        list_config_key=["pay_pay_card"],
     )
     # fmt: on
     MOBILE_SUICA = AccountContext(
@@ -225,6 +252,8 @@ class Account(Enum):
         # On this timing, CONFIG is not loaded. So we wrap CONFIG by lambda.
         MobileSuicaRowFactory(lambda: CONFIG.suica),
         MobileSuicaZaimRowConverterFactory(lambda: CONFIG.suica),
+        list_file_csv_convert=[FileCsvConvert.MOBILE_SUICA],
+        list_config_key=["suica"],
     )
 
     @staticmethod
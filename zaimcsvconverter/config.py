@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from dataclasses import field
 
 from dataclasses_json import DataClassJsonMixin
+from marshmallow import fields
 from yamldataclassconfig.config import YamlDataClassConfig
 
 
@@ -19,6 +20,46 @@ class WaonConfig(DataClassJsonMixin):
     auto_charge_source_type: str
 
 
+@dataclass
+class StoreCategoryConfig(DataClassJsonMixin):
+    """This class implements configuration for category of store which is classified when convert table is loaded."""
+
+    category: str = field(metadata={"dataclasses_json": {"mm_field": fields.String()}})
+    names: list[str] = field(
+        default_factory=list,
+        metadata={"dataclasses_json": {"mm_field": fields.List(fields.String())}},
+    )
+    pattern: str | None = field(
+        default=None,
+        metadata={"dataclasses_json": {"mm_field": fields.String(allow_none=True)}},
+    )
+
+
+@dataclass
+class ConvertTableBackendConfig(DataClassJsonMixin):
+    """This class implements configuration for backend which looks up convert tables."""
+
+    kind: str = field(default="dict", metadata={"dataclasses_json": {"mm_field": fields.String()}})
+    directory: str | None = field(
+        default=None,
+        metadata={"dataclasses_json": {"mm_field": fields.String(allow_none=True)}},
+    )
+    cache_size: int = field(default=65_536, metadata={"dataclasses_json": {"mm_field": fields.Integer()}})
+
+
+@dataclass
+class ConvertTableSourceConfig(DataClassJsonMixin):
+    """This class implements configuration for table of external SQLite database which is imported as convert table."""
+
+    convert_table: str = field(metadata={"dataclasses_json": {"mm_field": fields.String()}})
+    path: str = field(metadata={"dataclasses_json": {"mm_field": fields.String()}})
+    table: str = field(metadata={"dataclasses_json": {"mm_field": fields.String()}})
+    columns: dict[str, str] = field(
+        default_factory=dict,
+        metadata={"dataclasses_json": {"mm_field": fields.Dict(keys=fields.String(), values=fields.String())}},
+    )
+
+
 @dataclass
 class GoldPointCardPlusConfig(DataClassJsonMixin):
     """This class implements configuration for GOLD POINT CARD+."""
@@ -27,6 +68,10 @@ class GoldPointCardPlusConfig(DataClassJsonMixin):
     skip_amazon_row: bool
     skip_pay_pal_row: bool
     skip_kyash_row: bool
+    skip_store_categories: list[str] = field(
+        default_factory=list,
+        metadata={"dataclasses_json": {"mm_field": fields.List(fields.String())}},
+    )
 
 
 @dataclass
@@ -141,3 +186,15 @@ class Config(YamlDataClassConfig):
         default=None,
         metadata={"dataclasses_json": {"mm_field": PayPayCardConfig}},
     )
+    store_categories: list[StoreCategoryConfig] = field(
+        default_factory=list,
+        metadata={"dataclasses_json": {"mm_field": fields.List(fields.Nested(StoreCategoryConfig.schema()))}},
+    )
+    convert_table_backend: ConvertTableBackendConfig = field(
+        default_factory=ConvertTableBackendConfig,
+        metadata={"dataclasses_json": {"mm_field": fields.Nested(ConvertTableBackendConfig.schema())}},
+    )
+    convert_table_sources: list[ConvertTableSourceConfig] = field(
+        default_factory=list,
+        metadata={"dataclasses_json": {"mm_field": fields.List(fields.Nested(ConvertTableSourceConfig.schema()))}},
+    )
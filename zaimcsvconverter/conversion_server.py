@@ -0,0 +1,153 @@
+"""This module implements HTTP server which converts uploaded account CSV into Zaim CSV."""
+
+from __future__ import annotations
+
+import json
+import shutil
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+from typing import Any
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+from zaimcsvconverter import CONFIG
+from zaimcsvconverter import Session
+from zaimcsvconverter.accounts.enum import Account
+from zaimcsvconverter.convert_table_cache import ConvertTableCache
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.errorreporters.convert_result import ConvertResult
+from zaimcsvconverter.errorreporters.error_totalizer import FileNameForError
+from zaimcsvconverter.models import initialize_database
+
+if TYPE_CHECKING:
+    from typing import BinaryIO
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """This class implements handling request to convert uploaded account CSV into Zaim CSV.
+
+    Request:
+        POST /convert?account=<name of Account>
+        POST /convert?file_name=<file name of account CSV to detect account>
+        Body is content of account CSV.
+    Response:
+        200: Zaim CSV.
+        422: JSON which contains rows of error CSVs.
+    """
+
+    PATH = "/convert"
+    CHUNK_SIZE = 64 * 1024
+
+    # Reason: Method name is specified by BaseHTTPRequestHandler.
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Convert uploaded account CSV."""
+        try:
+            self.convert()
+        finally:
+            # Each request is handled on new thread.
+            Session.remove()
+
+    def convert(self) -> None:
+        """Convert uploaded account CSV and send Zaim CSV or errors."""
+        url = urlsplit(self.path)
+        if url.path != self.PATH:
+            self.send_json(HTTPStatus.NOT_FOUND, {"message": f"Not found: {url.path}"})
+            return
+        if self.headers["Content-Length"] is None:
+            self.send_json(HTTPStatus.LENGTH_REQUIRED, {"message": "Content-Length is required."})
+            return
+        try:
+            file_name = self.build_file_name(parse_qs(url.query))
+            content_length = int(self.headers["Content-Length"])
+        except ValueError as error:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"message": str(error)})
+            return
+        with TemporaryDirectory() as directory:
+            directory_csv_input = Path(directory) / "csvinput"
+            directory_csv_output = Path(directory) / "csvoutput"
+            directory_csv_input.mkdir()
+            directory_csv_output.mkdir()
+            path_csv_file = directory_csv_input / file_name
+            with path_csv_file.open("wb") as file_input:
+                self.receive(file_input, content_length)
+            convert_result = ConvertResult.convert(path_csv_file, directory_csv_output)
+            if convert_result.is_invalid:
+                self.send_json(HTTPStatus.UNPROCESSABLE_ENTITY, self.build_error(convert_result))
+                return
+            self.send_csv(directory_csv_output / file_name)
+
+    @staticmethod
+    def build_file_name(query: dict[str, list[str]]) -> str:
+        """Build file name of account CSV which account is detected from."""
+        if "account" in query:
+            name = query["account"][0].upper()
+            if name not in Account.__members__:
+                msg = f"Unknown account: {query['account'][0]}"
+                raise ValueError(msg)
+            # File name which is same as name of Account is always detected as the Account.
+            return f"{name.lower()}.csv"
+        if "file_name" in query:
+            file_name = Path(query["file_name"][0]).name
+            Account.create_by_path_csv_input(Path(file_name))
+            return file_name
+        msg = "Either account or file_name is required as query parameter."
+        raise ValueError(msg)
+
+    def receive(self, file_input: BinaryIO, content_length: int) -> None:
+        """Receive request body into file by chunk."""
+        remaining = content_length
+        while remaining > 0:
+            chunk = self.rfile.read(min(self.CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            file_input.write(chunk)
+            remaining -= len(chunk)
+
+    @staticmethod
+    def build_error(convert_result: ConvertResult) -> dict[str, Any]:
+        return {
+            "message": "Some invalid row exists in input CSV.",
+            # Same as names of error CSVs
+            Path(FileNameForError.INVALID_ROW.value).stem: convert_result.list_invalid_row,
+            Path(FileNameForError.UNDEFINED_CONTENT.value).stem: (
+                convert_result.undefined_content_error_handler.list_error
+            ),
+        }
+
+    def send_csv(self, path_csv_output: Path) -> None:
+        """Send Zaim CSV by chunk."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Length", str(path_csv_output.stat().st_size))
+        self.end_headers()
+        with path_csv_output.open("rb") as file_output:
+            shutil.copyfileobj(file_output, self.wfile, self.CHUNK_SIZE)
+
+    def send_json(self, status: HTTPStatus, body: dict[str, Any]) -> None:
+        content = json.dumps(body, ensure_ascii=False).encode("UTF-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class ConversionServer(ThreadingHTTPServer):
+    """This class implements HTTP server which converts uploaded account CSV into Zaim CSV.
+
+    Configuration and convert tables are loaded once when server is created and shared between requests.
+    Each request is handled on separate thread.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, server_address: tuple[str, int], path_file_config: Path, directory_csv_convert: Path) -> None:
+        CONFIG.load(path_file_config)
+        CONVERT_TABLE_INDEX.configure(CONFIG.store_categories)
+        initialize_database()
+        ConvertTableCache(directory_csv_convert).execute()
+        super().__init__(server_address, ConversionRequestHandler)
@@ -0,0 +1,567 @@
+"""This module implements backends which look up convert tables saved into database."""
+
+from __future__ import annotations
+
+import os
+from abc import abstractmethod
+from collections import OrderedDict
+from contextlib import AbstractContextManager
+from contextlib import nullcontext
+from dataclasses import dataclass
+from dataclasses import field
+from enum import Enum
+from pathlib import Path
+from tempfile import mkstemp
+from threading import Lock
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import ClassVar
+from typing import Generic
+from typing import TypeVar
+from typing import cast
+from weakref import WeakKeyDictionary
+from weakref import finalize
+
+from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy import or_
+from sqlalchemy import select
+from yamldataclassconfig.exceptions import ConfigNotLoadedError
+
+from zaimcsvconverter import CONFIG
+from zaimcsvconverter import Session
+from zaimcsvconverter.convert_table_pattern import ConvertTablePattern
+from zaimcsvconverter.store_classifier import StoreClassifier
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Hashable
+    from collections.abc import Iterable
+
+    from sqlalchemy import Connection
+    from sqlalchemy import Engine
+    from sqlalchemy import Select
+
+    from zaimcsvconverter.config import ConvertTableBackendConfig
+    from zaimcsvconverter.models import ConvertTableValue
+
+
+@dataclass(frozen=True)
+class ConvertTableDiff:
+    """This class implements difference of convert table of one convert table CSV from loaded state."""
+
+    list_value_inserted: list[Any] = field(default_factory=list)
+    list_value_updated: list[Any] = field(default_factory=list)
+    list_name_deleted: list[str] = field(default_factory=list)
+
+    @property
+    def list_value_upserted(self) -> list[Any]:
+        return [*self.list_value_inserted, *self.list_value_updated]
+
+    @property
+    def set_name(self) -> set[str]:
+        """Names of all changed entries."""
+        return {value.name for value in self.list_value_upserted} | set(self.list_name_deleted)
+
+    @property
+    def set_name_normalized(self) -> set[str]:
+        return {IndexedConvertTable.normalize(name) for name in self.set_name}
+
+    @property
+    def is_rule_changed(self) -> bool:
+        """Whether prefix or regular expression rule is changed, then any name can match differently."""
+        return any(ConvertTablePattern.is_prefix(name) or ConvertTablePattern.is_regex(name) for name in self.set_name)
+
+    def __bool__(self) -> bool:
+        return bool(self.list_value_inserted or self.list_value_updated or self.list_name_deleted)
+
+
+class IndexedConvertTable:
+    """This class implements convert table indexed by name normalized for Shift JIS.
+
+    Names are grouped by normalized name so that both original name and normalized name are found by single probe.
+    Exact names take priority over prefix and regular expression rules.
+    Names which match nothing are cached since undefined content appears on many rows,
+    and so are names which match rules.
+    Models are held as immutable values detached from database session.
+    """
+
+    def __init__(self, iterable_value: Iterable[ConvertTableValue]) -> None:
+        self.dictionary_group: dict[tuple[int, str], dict[str, Any]] = {}
+        dictionary_list_rule: dict[int, list[tuple[str, Any]]] = {}
+        for value in iterable_value:
+            key = (value.file_csv_convert_id, self.normalize(value.name))
+            self.dictionary_group.setdefault(key, {})[value.name] = value
+            dictionary_list_rule.setdefault(value.file_csv_convert_id, []).append((value.name, value))
+        self.dictionary_pattern: dict[int, ConvertTablePattern] = {
+            file_csv_convert_id: ConvertTablePattern(list_rule)
+            for file_csv_convert_id, list_rule in dictionary_list_rule.items()
+        }
+        self.set_undefined: set[tuple[int, str]] = set()
+        self.dictionary_matched: dict[tuple[int, str], Any] = {}
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        # ↓ To support Shift JIS. Reason: Specification.
+        return name.replace("−", "ー")  # noqa: RUF001
+
+    def find(self, file_csv_convert_id: int, name: str) -> Any | None:  # noqa: ANN401
+        """Find model which name is exactly same as argument."""
+        return self.dictionary_group.get((file_csv_convert_id, self.normalize(name)), {}).get(name)
+
+    def try_to_find(self, file_csv_convert_id: int, name: str) -> Any | None:  # noqa: ANN401
+        """Find model which name is same as argument, or as normalized argument when it isn't exist.
+
+        When neither exists, find model of rule which matches argument or normalized argument.
+        """
+        key = (file_csv_convert_id, name)
+        if key in self.set_undefined:
+            return None
+        name_normalized = self.normalize(name)
+        group = self.dictionary_group.get((file_csv_convert_id, name_normalized), {})
+        model = group.get(name, group.get(name_normalized))
+        if model is not None:
+            return model
+        if key in self.dictionary_matched:
+            return self.dictionary_matched[key]
+        model = self.match(file_csv_convert_id, name, name_normalized)
+        if model is None:
+            self.set_undefined.add(key)
+        else:
+            self.dictionary_matched[key] = model
+        return model
+
+    def match(self, file_csv_convert_id: int, name: str, name_normalized: str) -> Any | None:  # noqa: ANN401
+        convert_table_pattern = self.dictionary_pattern.get(file_csv_convert_id)
+        return None if convert_table_pattern is None else convert_table_pattern.match_either(name, name_normalized)
+
+    def try_to_find_all(self, file_csv_convert_id: int, iterable_name: Iterable[str]) -> dict[str, Any | None]:
+        """Find models of distinct names at once, value is None when name isn't defined."""
+        return {name: self.try_to_find(file_csv_convert_id, name) for name in set(iterable_name)}
+
+    def apply(self, file_csv_convert_id: int, convert_table_diff: ConvertTableDiff) -> None:
+        """Apply difference of convert table, then invalidate cached lookups which can be affected by it.
+
+        Cached lookups of changed names are invalidated,
+        and all cached lookups of convert table CSV are invalidated when rule is changed.
+        """
+        for name in convert_table_diff.list_name_deleted:
+            key = (file_csv_convert_id, self.normalize(name))
+            group = self.dictionary_group.get(key, {})
+            group.pop(name, None)
+            if not group:
+                self.dictionary_group.pop(key, None)
+        for value in convert_table_diff.list_value_upserted:
+            self.dictionary_group.setdefault((file_csv_convert_id, self.normalize(value.name)), {})[value.name] = value
+        if convert_table_diff.is_rule_changed:
+            self.dictionary_pattern[file_csv_convert_id] = self.create_pattern(file_csv_convert_id)
+            self.set_undefined = {key for key in self.set_undefined if key[0] != file_csv_convert_id}
+            self.dictionary_matched = {
+                key: value for key, value in self.dictionary_matched.items() if key[0] != file_csv_convert_id
+            }
+            return
+        set_key = {(file_csv_convert_id, name) for name in convert_table_diff.set_name_normalized}
+        self.set_undefined = {key for key in self.set_undefined if (key[0], self.normalize(key[1])) not in set_key}
+        self.dictionary_matched = {
+            key: value
+            for key, value in self.dictionary_matched.items()
+            if (key[0], self.normalize(key[1])) not in set_key
+        }
+
+    def create_pattern(self, file_csv_convert_id: int) -> ConvertTablePattern:
+        """Create rules of convert table CSV in order of insertion."""
+        list_value = [
+            value
+            for (file_csv_convert_id_group, _), group in self.dictionary_group.items()
+            if file_csv_convert_id_group == file_csv_convert_id
+            for value in group.values()
+        ]
+        return ConvertTablePattern((value.name, value) for value in sorted(list_value, key=lambda value: value.id))
+
+
+class LruCache:
+    """This class implements bounded cache which discards least recently used entry when it is full.
+
+    None can be cached as value, so that missing entry is distinguished by MISSING.
+    """
+
+    MISSING: ClassVar[object] = object()
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.lock = Lock()
+        self.ordered_dict: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:  # noqa: ANN401
+        """Return cached value, or MISSING when it isn't cached."""
+        with self.lock:
+            value = self.ordered_dict.get(key, self.MISSING)
+            if value is not self.MISSING:
+                self.ordered_dict.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:  # noqa: ANN401
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.ordered_dict[key] = value
+            self.ordered_dict.move_to_end(key)
+            if len(self.ordered_dict) > self.maxsize:
+                self.ordered_dict.popitem(last=False)
+
+    def discard_if(self, predicate: Callable[[Any], bool]) -> None:
+        """Discard entries which key satisfies predicate."""
+        with self.lock:
+            for key in [key for key in self.ordered_dict if predicate(key)]:
+                del self.ordered_dict[key]
+
+    def __len__(self) -> int:
+        return len(self.ordered_dict)
+
+
+TypeVarState = TypeVar("TypeVarState")
+
+
+class ConvertTableBackend(Generic[TypeVarState]):
+    """This class implements interface of backend which looks up convert tables.
+
+    Convert tables are always saved into database, and backend looks them up in its own way.
+    State for lookup is held for each database engine and cleared whenever convert table is changed.
+    Stores are classified by classifier which is built once when configuration is loaded,
+    so that lookup depends on neither configuration nor compiling rules of categories.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.dictionary_state: WeakKeyDictionary[Engine | Connection, TypeVarState] = WeakKeyDictionary()
+        self.store_classifier = StoreClassifier.create([])
+
+    @abstractmethod
+    def find(self, model: type[Any], file_csv_convert_id: int, name: str) -> Any | None:  # noqa: ANN401
+        """Find value which name is exactly same as argument."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def try_to_find(self, model: type[Any], file_csv_convert_id: int, name: str) -> Any | None:  # noqa: ANN401
+        """Find value by name, name normalized for Shift JIS, or rule which matches either of them."""
+        raise NotImplementedError
+
+    def try_to_find_all(
+        self,
+        model: type[Any],
+        file_csv_convert_id: int,
+        iterable_name: Iterable[str],
+    ) -> dict[str, Any | None]:
+        """Find values of distinct names at once, value is None when name isn't defined."""
+        return {name: self.try_to_find(model, file_csv_convert_id, name) for name in set(iterable_name)}
+
+    @abstractmethod
+    def create_state(self) -> TypeVarState:
+        raise NotImplementedError
+
+    def get_state(self) -> TypeVarState:
+        """Return state of current database engine, create it when it isn't created yet."""
+        engine = Session.get_bind()
+        state = self.dictionary_state.get(engine)
+        if state is not None:
+            return state
+        with self.lock:
+            if engine not in self.dictionary_state:
+                self.dictionary_state[engine] = self.create_state()
+            return self.dictionary_state[engine]
+
+    def build(self, model: type[Any]) -> None:
+        """Prepare lookup of model in advance so that converting rows only looks up."""
+
+    def apply(self, model: type[Any], file_csv_convert_id: int, convert_table_diff: ConvertTableDiff) -> None:  # noqa: ARG002
+        """Apply difference of convert table which has been applied to database of current engine."""
+        self.clear()
+
+    def configure(self, store_classifier: StoreClassifier) -> None:
+        """Classify stores by store_classifier, values which have been classified by previous one are cleared."""
+        self.store_classifier = store_classifier
+        self.clear()
+
+    def create_values(self, model: type[Any], iterable_model: Iterable[Any]) -> list[Any]:
+        """Create immutable values detached from database session."""
+        return cast("list[Any]", model.create_values(iterable_model, self.store_classifier))
+
+    def bind(self) -> None:
+        """Bind database session to engine which this backend requires when it is selected."""
+
+    def close(self) -> None:
+        """Release resources of this backend when another backend is selected."""
+        self.clear()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.dictionary_state.clear()
+
+
+class DictConvertTableBackend(ConvertTableBackend[dict[type[Any], IndexedConvertTable]]):
+    """This class implements backend which looks up convert tables in dictionaries.
+
+    Each convert table is loaded from database into dictionary at once on first lookup,
+    then each row is looked up in O(1) instead of querying database for each row.
+    Loading is serialized by lock since connection to in-memory database is shared between threads.
+    """
+
+    def find(self, model: type[Any], file_csv_convert_id: int, name: str) -> Any | None:  # noqa: ANN401
+        return self.get(model).find(file_csv_convert_id, name)
+
+    def try_to_find(self, model: type[Any], file_csv_convert_id: int, name: str) -> Any | None:  # noqa: ANN401
+        return self.get(model).try_to_find(file_csv_convert_id, name)
+
+    def try_to_find_all(
+        self,
+        model: type[Any],
+        file_csv_convert_id: int,
+        iterable_name: Iterable[str],
+    ) -> dict[str, Any | None]:
+        return self.get(model).try_to_find_all(file_csv_convert_id, iterable_name)
+
+    def create_state(self) -> dict[type[Any], IndexedConvertTable]:
+        return {}
+
+    def build(self, model: type[Any]) -> None:
+        self.get(model)
+
+    def apply(self, model: type[Any], file_csv_convert_id: int, convert_table_diff: ConvertTableDiff) -> None:
+        # Index which isn't built yet will be built from database which difference has been applied to.
+        with self.lock:
+            index = self.dictionary_state.get(Session.get_bind(), {}).get(model)
+            if index is not None:
+                index.apply(file_csv_convert_id, convert_table_diff)
+
+    def get(self, model: type[Any]) -> IndexedConvertTable:
+        """Return index of model on current database engine, build it when it isn't built yet."""
+        dictionary_model = self.get_state()
+        index = dictionary_model.get(model)
+        if index is not None:
+            return index
+        with self.lock:
+            if model not in dictionary_model:
+                dictionary_model[model] = self.create_index(model)
+            return dictionary_model[model]
+
+    def create_index(self, model: type[Any]) -> IndexedConvertTable:
+        # Models are detached when session is closed, and their attributes have been loaded.
+        with Session() as session:
+            return IndexedConvertTable(self.create_values(model, session.execute(select(model)).scalars().all()))
+
+
+@dataclass
+class SqliteConvertTableState:
+    """This class implements state of SQLite backend for each database engine."""
+
+    lru_cache: LruCache
+    dictionary_pattern: dict[tuple[type[Any], int], ConvertTablePattern] = field(default_factory=dict)
+
+
+class SqliteConvertTableBackend(ConvertTableBackend[SqliteConvertTableState]):
+    """This class implements backend which queries convert tables in SQLite database for each name.
+
+    Names are queried by unique index of convert table, and results including undefined names are held
+    in bounded LRU cache, so that memory isn't proportional to size of convert tables.
+    Only prefix and regular expression rules are loaded into memory since they can't be queried by index.
+    Queries are serialized since connection to in-memory database is shared between threads.
+    """
+
+    DEFAULT_CACHE_SIZE = 65_536
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        super().__init__()
+        self.cache_size = cache_size
+        self.lock_database: AbstractContextManager[Any] = Lock()
+
+    def find(self, model: type[Any], file_csv_convert_id: int, name: str) -> Any | None:  # noqa: ANN401
+        return self.lookup(model, file_csv_convert_id, name, exact=True)
+
+    def try_to_find(self, model: type[Any], file_csv_convert_id: int, name: str) -> Any | None:  # noqa: ANN401
+        return self.lookup(model, file_csv_convert_id, name, exact=False)
+
+    def create_state(self) -> SqliteConvertTableState:
+        return SqliteConvertTableState(LruCache(self.cache_size))
+
+    def apply(self, model: type[Any], file_csv_convert_id: int, convert_table_diff: ConvertTableDiff) -> None:
+        # Database has been changed, so only cached results which can be affected are discarded.
+        state = self.dictionary_state.get(Session.get_bind())
+        if state is None:
+            return
+        if convert_table_diff.is_rule_changed:
+            state.dictionary_pattern.pop((model, file_csv_convert_id), None)
+            state.lru_cache.discard_if(lambda key: key[0] is model and key[1] == file_csv_convert_id)
+            return
+        set_name_normalized = convert_table_diff.set_name_normalized
+        state.lru_cache.discard_if(
+            lambda key: (
+                key[0] is model
+                and key[1] == file_csv_convert_id
+                and IndexedConvertTable.normalize(key[2]) in set_name_normalized
+            ),
+        )
+
+    def lookup(self, model: type[Any], file_csv_convert_id: int, name: str, *, exact: bool) -> Any | None:  # noqa: ANN401
+        state = self.get_state()
+        key = (model, file_csv_convert_id, name, exact)
+        value = state.lru_cache.get(key)
+        if value is not LruCache.MISSING:
+            return value
+        value = (
+            self.select(model, file_csv_convert_id, [name]).get(name)
+            if exact
+            else self.resolve(state, model, file_csv_convert_id, name)
+        )
+        state.lru_cache.put(key, value)
+        return value
+
+    def resolve(
+        self,
+        state: SqliteConvertTableState,
+        model: type[Any],
+        file_csv_convert_id: int,
+        name: str,
+    ) -> Any | None:  # noqa: ANN401
+        name_normalized = IndexedConvertTable.normalize(name)
+        dictionary_value = self.select(model, file_csv_convert_id, {name, name_normalized})
+        value = dictionary_value.get(name, dictionary_value.get(name_normalized))
+        if value is not None:
+            return value
+        return self.get_pattern(state, model, file_csv_convert_id).match_either(name, name_normalized)
+
+    def select(self, model: type[Any], file_csv_convert_id: int, iterable_name: Iterable[str]) -> dict[str, Any]:
+        statement = select(model).where(
+            model.file_csv_convert_id == file_csv_convert_id,
+            model.name.in_(iterable_name),
+        )
+        with self.lock_database, Session() as session:
+            return {
+                value.name: value for value in self.create_values(model, session.execute(statement).scalars().all())
+            }
+
+    def get_pattern(
+        self,
+        state: SqliteConvertTableState,
+        model: type[Any],
+        file_csv_convert_id: int,
+    ) -> ConvertTablePattern:
+        key = (model, file_csv_convert_id)
+        convert_table_pattern = state.dictionary_pattern.get(key)
+        if convert_table_pattern is not None:
+            return convert_table_pattern
+        with self.lock_database, Session() as session:
+            list_value = self.create_values(
+                model,
+                session.execute(self.select_rule(model, file_csv_convert_id)).scalars().all(),
+            )
+        convert_table_pattern = ConvertTablePattern((value.name, value) for value in list_value)
+        return state.dictionary_pattern.setdefault(key, convert_table_pattern)
+
+    @staticmethod
+    def select_rule(model: type[Any], file_csv_convert_id: int) -> Select[Any]:
+        """Select names which can be rule in order of definition.
+
+        Names are only narrowed by SQL, so that each of them should be checked by ConvertTablePattern.
+        """
+        return (
+            select(model)
+            .where(
+                model.file_csv_convert_id == file_csv_convert_id,
+                or_(
+                    model.name.startswith(ConvertTablePattern.MARKER_PREFIX),
+                    model.name.startswith(ConvertTablePattern.MARKER_REGEX),
+                ),
+            )
+            .order_by(model.id)
+        )
+
+
+class SqliteFileConvertTableBackend(SqliteConvertTableBackend):
+    """This class implements backend which queries convert tables in SQLite database file.
+
+    Convert tables which are too large to be loaded into memory are saved into temporary database file
+    in write-ahead logging mode, so that threads read it concurrently by their own connections.
+    The file is removed when another backend is selected or process exits,
+    except on child process which has inherited this backend from process which created the file.
+    """
+
+    PREFIX_FILE = "zaim_csv_converter_convert_table_"
+    SUFFIX_FILE = ".sqlite3"
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        cache_size: int = SqliteConvertTableBackend.DEFAULT_CACHE_SIZE,
+    ) -> None:
+        super().__init__(cache_size)
+        self.lock_database = nullcontext()
+        file_descriptor, path = mkstemp(suffix=self.SUFFIX_FILE, prefix=self.PREFIX_FILE, dir=directory)
+        os.close(file_descriptor)
+        self.path = Path(path)
+        self.engine = create_engine(f"sqlite:///{self.path}", connect_args={"check_same_thread": False})
+        event.listen(self.engine, "connect", self.set_pragma)
+        self.engine_previous: Engine | Connection | None = None
+        self.finalizer = finalize(self, self.remove, self.engine, self.path, os.getpid())
+
+    @staticmethod
+    def set_pragma(dbapi_connection: Any, _connection_record: Any) -> None:  # noqa: ANN401
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    def bind(self) -> None:
+        self.engine_previous = Session.get_bind()
+        Session.remove()
+        Session.configure(bind=self.engine)
+
+    def close(self) -> None:
+        super().close()
+        if self.engine_previous is not None and Session.get_bind() is self.engine:
+            Session.remove()
+            Session.configure(bind=self.engine_previous)
+        self.finalizer()
+
+    @classmethod
+    def remove(cls, engine: Engine, path: Path, pid: int) -> None:
+        is_owner = os.getpid() == pid
+        # Reason: Connections and file inherited by child process belong to parent process.
+        engine.dispose(close=is_owner)
+        if is_owner:
+            for suffix in ("", "-wal", "-shm"):
+                path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+class ConvertTableBackendKind(Enum):
+    """This class implements kinds of backend which can be selected by configuration."""
+
+    DICT = "dict"
+    SQLITE_MEMORY = "sqlite_memory"
+    SQLITE_FILE = "sqlite_file"
+
+
+class ConvertTableBackendFactory:
+    """This class implements factory of backend which looks up convert tables."""
+
+    @staticmethod
+    def create(convert_table_backend_config: ConvertTableBackendConfig) -> ConvertTableBackend[Any]:
+        """Create backend of kind in configuration."""
+        kind = ConvertTableBackendKind(convert_table_backend_config.kind)
+        if kind is ConvertTableBackendKind.SQLITE_MEMORY:
+            return SqliteConvertTableBackend(convert_table_backend_config.cache_size)
+        if kind is ConvertTableBackendKind.SQLITE_FILE:
+            directory = convert_table_backend_config.directory
+            return SqliteFileConvertTableBackend(
+                None if directory is None else Path(directory),
+                convert_table_backend_config.cache_size,
+            )
+        return DictConvertTableBackend()
+
+    @classmethod
+    def create_by_config(cls) -> ConvertTableBackend[Any]:
+        """Create backend selected in current configuration, or dictionary backend when it isn't loaded."""
+        try:
+            convert_table_backend_config = CONFIG.convert_table_backend
+        except ConfigNotLoadedError:
+            return DictConvertTableBackend()
+        return cls.create(convert_table_backend_config)
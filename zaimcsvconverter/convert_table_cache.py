@@ -0,0 +1,158 @@
+"""This module implements on-disk cache of convert tables."""
+
+from __future__ import annotations
+
+import json
+from logging import getLogger
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING
+
+from sqlalchemy.exc import DatabaseError
+
+from zaimcsvconverter import Session
+from zaimcsvconverter.convert_table_importer import ConvertTableImporter
+from zaimcsvconverter.convert_table_source import ConvertTableSourceFactory
+from zaimcsvconverter.models import ConvertTableType
+from zaimcsvconverter.run_manifest import get_package_version
+from zaimcsvconverter.run_manifest import hash_package_source
+
+if TYPE_CHECKING:
+    from sqlalchemy import Connection
+    from sqlalchemy import Table
+
+
+class ConvertTableCache:
+    """This class implements on-disk cache of convert tables.
+
+    Tables of convert tables are saved into SQLite file with fingerprint of sources of convert tables.
+    While sources are unchanged, the SQLite file is attached to database
+    and its rows are copied by SQLite itself instead of parsing and inserting each row of convert table CSV files.
+    Database should have been initialized by initialize_database() in advance.
+    """
+
+    FILE_NAME = ".convert_table_cache.sqlite3"
+    SCHEMA_NAME = "convert_table_cache"
+    TABLE_NAME_FINGERPRINT = "fingerprint"
+
+    def __init__(self, directory_csv_convert: Path, path_file_cache: Path | None = None) -> None:
+        self.directory_csv_convert = directory_csv_convert
+        self.path_file_cache = directory_csv_convert / self.FILE_NAME if path_file_cache is None else path_file_cache
+        self.logger = getLogger(__name__)
+
+    def execute(self) -> bool:
+        """Import convert tables from cache, or from convert table CSV files and cache them when they are changed.
+
+        Returns:
+            Whether convert tables have been imported from cache or not.
+        """
+        fingerprint = self.fingerprint()
+        if self.restore(fingerprint):
+            ConvertTableImporter.build_indexes()
+            return True
+        ConvertTableImporter.execute_all(self.directory_csv_convert)
+        self.try_to_save(fingerprint)
+        return False
+
+    def fingerprint(self) -> str:
+        """Return fingerprint of sources of convert tables, version and source code of this package."""
+        return json.dumps(
+            {
+                "version": get_package_version(),
+                "source": hash_package_source(),
+                "convert_table": {
+                    source.name: source.fingerprint()
+                    for source in ConvertTableSourceFactory.create_all(self.directory_csv_convert)
+                },
+            },
+            sort_keys=True,
+        )
+
+    def restore(self, fingerprint: str) -> bool:
+        """Copy rows from cache into database when fingerprint of cache is same as argument."""
+        if not self.path_file_cache.is_file():
+            return False
+        try:
+            return self.copy(fingerprint)
+        except DatabaseError:
+            self.logger.warning("Ignore broken cache of convert tables: %s", self.path_file_cache)
+            return False
+
+    def copy(self, fingerprint: str) -> bool:
+        with Session.get_bind().engine.connect() as connection:
+            self.attach(connection, self.path_file_cache)
+            try:
+                if self.read_fingerprint(connection) != fingerprint:
+                    return False
+                for table, name_cache in self.list_table():
+                    columns = ", ".join(column.name for column in table.columns)
+                    connection.exec_driver_sql(
+                        f"INSERT INTO main.{self.quote(connection, table.name)} ({columns}) "  # noqa: S608
+                        f"SELECT {columns} FROM {self.SCHEMA_NAME}.{name_cache}",
+                    )
+                connection.commit()
+            finally:
+                connection.rollback()
+                self.detach(connection)
+        return True
+
+    def read_fingerprint(self, connection: Connection) -> str | None:
+        return connection.exec_driver_sql(
+            f"SELECT value FROM {self.SCHEMA_NAME}.{self.TABLE_NAME_FINGERPRINT}",  # noqa: S608
+        ).scalar()
+
+    def try_to_save(self, fingerprint: str) -> None:
+        """Save cache, converting continues even if cache can't be saved since it's only for speed."""
+        try:
+            self.save(fingerprint)
+        except (OSError, DatabaseError):
+            self.logger.warning("Failed to save cache of convert tables: %s", self.path_file_cache, exc_info=True)
+
+    def save(self, fingerprint: str) -> None:
+        """Save tables of database and fingerprint into cache atomically."""
+        with NamedTemporaryFile(dir=self.path_file_cache.parent, suffix=".tmp", delete=False) as file:
+            path_temporary = Path(file.name)
+        try:
+            with Session.get_bind().engine.connect() as connection:
+                self.attach(connection, path_temporary)
+                try:
+                    for table, name_cache in self.list_table():
+                        connection.exec_driver_sql(
+                            f"CREATE TABLE {self.SCHEMA_NAME}.{name_cache} "  # noqa: S608
+                            f"AS SELECT * FROM main.{self.quote(connection, table.name)}",
+                        )
+                    connection.exec_driver_sql(
+                        f"CREATE TABLE {self.SCHEMA_NAME}.{self.TABLE_NAME_FINGERPRINT} (value TEXT)",
+                    )
+                    connection.exec_driver_sql(
+                        f"INSERT INTO {self.SCHEMA_NAME}.{self.TABLE_NAME_FINGERPRINT} VALUES (?)",  # noqa: S608
+                        (fingerprint,),
+                    )
+                    connection.commit()
+                finally:
+                    self.detach(connection)
+            path_temporary.replace(self.path_file_cache)
+        finally:
+            path_temporary.unlink(missing_ok=True)
+
+    @staticmethod
+    def list_table() -> list[tuple[Table, str]]:
+        """Return tables of convert tables and their names in cache.
+
+        Names in cache are taken from model since names of tables aren't stable between processes.
+        """
+        return [
+            # Reason: Mixin doesn't declare __table__ which is added by declarative mapping.
+            (convert_table_type.value.model.__table__, convert_table_type.name.lower())  # type: ignore[attr-defined]
+            for convert_table_type in ConvertTableType
+        ]
+
+    @staticmethod
+    def quote(connection: Connection, name: str) -> str:
+        return connection.dialect.identifier_preparer.quote(name)
+
+    def attach(self, connection: Connection, path: Path) -> None:
+        connection.exec_driver_sql(f"ATTACH DATABASE ? AS {self.SCHEMA_NAME}", (str(path),))
+
+    def detach(self, connection: Connection) -> None:
+        connection.exec_driver_sql(f"DETACH DATABASE {self.SCHEMA_NAME}")
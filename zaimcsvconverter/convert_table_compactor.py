@@ -0,0 +1,321 @@
+"""This module implements compacting convert table CSV and reporting entries which should be reviewed."""
+
+from __future__ import annotations
+
+import csv
+import heapq
+import json
+import unicodedata
+from contextlib import contextmanager
+from enum import Enum
+from itertools import groupby
+from logging import getLogger
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+from typing import Any
+
+from zaimcsvconverter import CONFIG
+from zaimcsvconverter import Session
+from zaimcsvconverter import create_database_engine
+from zaimcsvconverter.convert_table_backend import DictConvertTableBackend
+from zaimcsvconverter.convert_table_backend import IndexedConvertTable
+from zaimcsvconverter.convert_table_importer import ConvertTableImporter
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.convert_table_source import ConvertTableSourceFactory
+from zaimcsvconverter.csvconverter.csv_to_csv_converter import CsvToCsvConverter
+from zaimcsvconverter.errorreporters.csv_exporter import CsvExporter
+from zaimcsvconverter.exceptions import InvalidConvertTableError
+from zaimcsvconverter.exceptions.invalid_input_csv_error import InvalidInputCsvError
+from zaimcsvconverter.iterables import split
+from zaimcsvconverter.models import create_tables
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Generator
+    from collections.abc import Iterable
+
+    from sqlalchemy import Connection
+    from sqlalchemy import Engine
+
+    from zaimcsvconverter.convert_table_source import FileConvertTableSource
+    from zaimcsvconverter.workspace import Workspace
+
+# Line number and row of convert table CSV
+Entry = tuple[int, list[str]]
+
+
+class ExternalSorter:
+    """This class implements sorting items which don't fit in memory.
+
+    Items are sorted in chunks and each chunk is written into temporary file as JSON lines,
+    then sorted chunks are merged while reading them, so that memory is bounded by chunk size.
+    """
+
+    DEFAULT_CHUNK_SIZE = 100_000
+
+    def __init__(self, directory: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.directory = directory
+        self.chunk_size = chunk_size
+
+    def sort(self, iterable: Iterable[Any], key: Callable[[Any], Any]) -> Generator[Any, None, None]:
+        """Yield items sorted by key, items should be able to be serialized as JSON."""
+        list_path: list[Path] = []
+        for list_item in split(iterable, self.chunk_size):
+            path = self.directory / f"run_{len(list_path)}.jsonl"
+            with path.open("w", encoding="UTF-8") as file:
+                file.writelines(json.dumps(item, ensure_ascii=False) + "\n" for item in sorted(list_item, key=key))
+            list_path.append(path)
+        list_file = [path.open(encoding="UTF-8") for path in list_path]
+        try:
+            yield from heapq.merge(*((json.loads(line) for line in file) for file in list_file), key=key)
+        finally:
+            for file, path in zip(list_file, list_path, strict=True):
+                file.close()
+                path.unlink()
+
+
+class CompactionFinding(Enum):
+    """This class implements kinds of entries which are reported by compaction."""
+
+    DUPLICATE = "duplicate"
+    CONFLICT = "conflict"
+    NEAR_DUPLICATE = "near_duplicate"
+    UNUSED = "unused"
+    INVALID = "invalid"
+
+
+class ConvertTableCompactor:
+    """This class implements compacting convert table CSV and reporting entries which should be reviewed.
+
+    Convert table files are discovered and read by ConvertTableSourceFactory as same as importing them,
+    and each of them is compacted into convert table CSV whatever its format is.
+    Tables of external SQLite databases in configuration aren't compacted.
+    Rows which are exactly same as former row are removed from compacted convert table CSV,
+    and rows which have same name as former row with different columns, names which are same as former name
+    after normalizing full-width and half-width characters, and entries which no input CSV refers are reported.
+    Order of other rows is kept since former regular expression rule takes priority.
+    """
+
+    DIRECTORY_NAME_COMPACTED = "csvconverttable"
+    FILE_NAME_REPORT = "convert_table_compaction.csv"
+
+    def __init__(self, workspace: Workspace, chunk_size: int = ExternalSorter.DEFAULT_CHUNK_SIZE) -> None:
+        self.workspace = workspace
+        self.chunk_size = chunk_size
+        self.directory_compacted = workspace.directory_csv_output / self.DIRECTORY_NAME_COMPACTED
+        self.logger = getLogger(__name__)
+
+    def execute(self) -> list[list[int | str]]:
+        """Write compacted convert table CSV and report, then return rows of report."""
+        self.directory_compacted.mkdir(parents=True, exist_ok=True)
+        list_finding: list[list[int | str]] = []
+        list_source: list[FileConvertTableSource] = []
+        for path in ConvertTableSourceFactory.list_path(self.workspace.directory_csv_convert):
+            source = ConvertTableSourceFactory.create(path)
+            try:
+                list_finding.extend(self.compact(source))
+            except InvalidConvertTableError as error:
+                list_finding.extend(self.create_findings_invalid(error.list_error))
+                continue
+            list_source.append(source)
+        list_finding.extend(self.find_unused(list_source))
+        list_finding.sort(key=lambda finding: (finding[0], finding[1]))
+        CsvExporter(self.workspace.directory_csv_output).export(list_finding, self.FILE_NAME_REPORT)
+        return list_finding
+
+    def compact(self, source: FileConvertTableSource) -> list[list[int | str]]:
+        """Write convert table CSV without duplicated rows, and return findings."""
+        with TemporaryDirectory() as directory_temporary:
+            external_sorter = ExternalSorter(Path(directory_temporary), self.chunk_size)
+            list_finding, set_line_number_duplicate = self.find_duplicates(
+                source.name,
+                external_sorter.sort(self.iterate_entry(source), key=lambda entry: (entry[1][0], entry[0])),
+            )
+            list_finding.extend(
+                self.find_near_duplicates(
+                    source.name,
+                    external_sorter.sort(
+                        self.iterate_entry(source),
+                        key=lambda entry: (self.normalize(entry[1][0]), entry[0]),
+                    ),
+                ),
+            )
+        path_compacted = self.directory_compacted / f"{source.path.stem}.csv"
+        with path_compacted.open("w", encoding="UTF-8", newline="\n") as file_output:
+            writer = csv.writer(file_output)
+            writer.writerows(
+                row for line_number, row in self.iterate_entry(source) if line_number not in set_line_number_duplicate
+            )
+        return list_finding
+
+    @staticmethod
+    def iterate_entry(source: FileConvertTableSource) -> Generator[Entry, None, None]:
+        # Empty row can't be name, it is reported when convert table is imported.
+        yield from ((line_number, row) for line_number, row in source.iterate_entry() if row)
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Normalize full-width and half-width characters, Shift JIS specific characters and spaces."""
+        return " ".join(unicodedata.normalize("NFKC", IndexedConvertTable.normalize(name)).split())
+
+    @staticmethod
+    def find_duplicates(
+        name_source: str,
+        iterable_entry_sorted: Iterable[Entry],
+    ) -> tuple[list[list[int | str]], set[int]]:
+        """Find rows which have same name as former row in entries sorted by name and line number."""
+        list_finding: list[list[int | str]] = []
+        set_line_number_duplicate = set()
+        for name, group in groupby(iterable_entry_sorted, key=lambda entry: entry[1][0]):
+            (line_number_first, row_first), *list_entry = group
+            for line_number, row in list_entry:
+                if row == row_first:
+                    set_line_number_duplicate.add(line_number)
+                    kind, message = CompactionFinding.DUPLICATE, "Removed since same as line"
+                else:
+                    kind, message = CompactionFinding.CONFLICT, "Columns are different from line"
+                list_finding.append(
+                    [name_source, line_number, kind.value, f"{message} {line_number_first}. Name = {name}"],
+                )
+        return list_finding, set_line_number_duplicate
+
+    @staticmethod
+    def find_near_duplicates(name_source: str, iterable_entry_sorted: Iterable[Entry]) -> list[list[int | str]]:
+        """Find names which are same as former name after normalizing in entries sorted by normalized name."""
+        list_finding: list[list[int | str]] = []
+        for _, group in groupby(iterable_entry_sorted, key=lambda entry: ConvertTableCompactor.normalize(entry[1][0])):
+            (line_number_first, row_first), *list_entry = group
+            set_name = {row_first[0]}
+            for line_number, row in list_entry:
+                if row[0] in set_name:
+                    continue
+                set_name.add(row[0])
+                message = f"Name is same as name on line {line_number_first} after normalizing. Name = {row[0]}"
+                list_finding.append([name_source, line_number, CompactionFinding.NEAR_DUPLICATE.value, message])
+        return list_finding
+
+    def find_unused(self, list_source: list[FileConvertTableSource]) -> list[list[int | str]]:
+        """Find entries of convert table CSV which no input CSV refers, by converting input CSV with compacted ones.
+
+        Configuration, backend and database which have been selected before are restored after finding,
+        since compacted convert tables are imported into database of separate engine.
+        """
+        hit_recording_convert_table_backend = HitRecordingConvertTableBackend()
+        with self.load_config_temporarily(), CONVERT_TABLE_INDEX.use_temporarily(hit_recording_convert_table_backend):
+            CONVERT_TABLE_INDEX.configure(CONFIG.store_categories)
+            create_tables()
+            return self.find_unused_with(list_source, hit_recording_convert_table_backend.set_hit)
+
+    @contextmanager
+    def load_config_temporarily(self) -> Generator[None, None, None]:
+        """Load configuration of workspace while context, then restore configuration which has been loaded before."""
+        dictionary_config = dict(vars(CONFIG))
+        CONFIG.load(self.workspace.path_file_config)
+        try:
+            yield
+        finally:
+            vars(CONFIG).clear()
+            vars(CONFIG).update(dictionary_config)
+
+    def find_unused_with(
+        self,
+        list_source: list[FileConvertTableSource],
+        set_hit: set[tuple[type[Any], int, str]],
+    ) -> list[list[int | str]]:
+        """Compacted convert table CSV which can't be imported is reported instead of unused entries."""
+        list_error = [
+            error
+            for path in ConvertTableSourceFactory.list_path(self.directory_compacted)
+            for error in ConvertTableImporter.try_to_execute(path)
+        ]
+        if list_error:
+            self.logger.warning("Skip finding unused entries since compacted convert table CSV is invalid.")
+            return self.create_findings_invalid(list_error)
+        self.refer_input_csv()
+        return [finding for source in list_source for finding in self.find_unused_in(source, set_hit)]
+
+    @staticmethod
+    def create_findings_invalid(list_error: list[list[int | str]]) -> list[list[int | str]]:
+        return [
+            [file_name, line_number, CompactionFinding.INVALID.value, message]
+            for file_name, line_number, message in list_error
+        ]
+
+    def refer_input_csv(self) -> None:
+        """Look up convert tables as same as converting each input CSV without writing Zaim CSV."""
+        with TemporaryDirectory() as directory_temporary:
+            for path in sorted(self.workspace.directory_csv_input.glob("*.csv")):
+                self.refer(path, Path(directory_temporary))
+
+    def refer(self, path: Path, directory_temporary: Path) -> None:
+        try:
+            for _ in CsvToCsvConverter(path, directory_temporary).convert_workflow.data_source:
+                pass
+        except (ValueError, InvalidInputCsvError):
+            self.logger.warning("Skip input CSV which can't be read: %s", path)
+
+    @classmethod
+    def find_unused_in(
+        cls,
+        source: FileConvertTableSource,
+        set_hit: set[tuple[type[Any], int, str]],
+    ) -> Generator[list[int | str], None, None]:
+        file_csv_convert = source.file_csv_convert.value
+        model = file_csv_convert.convert_table_type.value.model
+        set_name_reported: set[str] = set()
+        for line_number, row in cls.iterate_entry(source):
+            name = row[0]
+            if (model, file_csv_convert.id.value, name) in set_hit or name in set_name_reported:
+                continue
+            set_name_reported.add(name)
+            message = f"No input CSV refers. Name = {name}"
+            yield [source.name, line_number, CompactionFinding.UNUSED.value, message]
+
+
+class HitRecordingConvertTableBackend(DictConvertTableBackend):
+    """This class implements dictionary backend which records entries found by lookup.
+
+    Database session is bound to in-memory database of its own engine while this backend is selected,
+    so that database of previous backend is kept as it is.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.set_hit: set[tuple[type[Any], int, str]] = set()
+        self.engine = create_database_engine()
+        self.engine_previous: Engine | Connection | None = None
+
+    def bind(self) -> None:
+        self.engine_previous = Session.get_bind()
+        Session.remove()
+        Session.configure(bind=self.engine)
+
+    def close(self) -> None:
+        super().close()
+        if self.engine_previous is not None and Session.get_bind() is self.engine:
+            Session.remove()
+            Session.configure(bind=self.engine_previous)
+        self.engine.dispose()
+
+    def find(self, model: type[Any], file_csv_convert_id: int, name: str) -> Any | None:  # noqa: ANN401
+        return self.record(model, file_csv_convert_id, super().find(model, file_csv_convert_id, name))
+
+    def try_to_find(self, model: type[Any], file_csv_convert_id: int, name: str) -> Any | None:  # noqa: ANN401
+        return self.record(model, file_csv_convert_id, super().try_to_find(model, file_csv_convert_id, name))
+
+    def try_to_find_all(
+        self,
+        model: type[Any],
+        file_csv_convert_id: int,
+        iterable_name: Iterable[str],
+    ) -> dict[str, Any | None]:
+        dictionary_value = super().try_to_find_all(model, file_csv_convert_id, iterable_name)
+        for value in dictionary_value.values():
+            self.record(model, file_csv_convert_id, value)
+        return dictionary_value
+
+    def record(self, model: type[Any], file_csv_convert_id: int, value: Any | None) -> Any | None:  # noqa: ANN401
+        if value is not None:
+            self.set_hit.add((model, file_csv_convert_id, value.name))
+        return value
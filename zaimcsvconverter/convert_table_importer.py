@@ -1,32 +1,471 @@
 """This module implements importing process for convert table CSV."""
 
-import csv
-from pathlib import Path
+from __future__ import annotations
 
-from zaimcsvconverter.file_csv_convert import FileCsvConvert
-from zaimcsvconverter.models import Base
-from zaimcsvconverter.models import ConvertTableRecordMixin
-from zaimcsvconverter.models import ConvertTableRowData
+import hashlib
+import json
+import re
+from typing import TYPE_CHECKING
+from typing import Any
+
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy import update
+
+from zaimcsvconverter import Session
+from zaimcsvconverter.convert_table_backend import ConvertTableDiff
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.convert_table_pattern import ConvertTablePattern
+from zaimcsvconverter.convert_table_source import ConvertTableSourceFactory
+from zaimcsvconverter.convert_table_source import FileConvertTableSource
+from zaimcsvconverter.convert_table_source import SqliteConvertTableSource
+from zaimcsvconverter.exceptions import InvalidConvertTableError
+from zaimcsvconverter.iterables import split
+from zaimcsvconverter.models import ConvertTableType
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from sqlalchemy import Connection
+    from sqlalchemy.orm import Session as SQLAlchemySession
+
+    from zaimcsvconverter.convert_table_source import ConvertTableSource
 
 
 class ConvertTableImporter:
-    """This class implements importing process for convert table CSV."""
+    """This class implements importing process for convert table CSV.
+
+    Convert table files of other formats and tables of external SQLite database are also imported as sources.
+    """
 
     @classmethod
     def execute(cls, path: Path) -> None:
         """Execute importing process for convert table CSV."""
-        file_csv_convert = FileCsvConvert.create_by_path_csv_convert(path)
-        list_convert_table = cls._load_csv(file_csv_convert, path)
-        file_csv_convert.value.convert_table_type.value.model.save_all(list_convert_table)
-
-    @classmethod
-    def _load_csv(
-        cls,
-        file_csv_convert: FileCsvConvert,
-        path: Path,
-    ) -> list[ConvertTableRecordMixin[Base, ConvertTableRowData]]:
-        with path.open("r", encoding="UTF-8") as file_convert_table:
-            return [
-                file_csv_convert.create_convert_table_row_instance(list_convert_table_row_standard_type_value)
-                for list_convert_table_row_standard_type_value in csv.reader(file_convert_table)
-            ]
+        cls.execute_source(ConvertTableSourceFactory.create(path))
+
+    @classmethod
+    def execute_source(cls, source: ConvertTableSource) -> None:
+        """Execute importing process for source of convert table.
+
+        Rows of convert table file are committed per chunk,
+        so rows inserted from it are deleted when it is invalid not to leave partially imported convert table.
+        """
+        try:
+            if isinstance(source, FileConvertTableSource):
+                cls.insert_file_source(source)
+            elif isinstance(source, SqliteConvertTableSource):
+                ConvertTableSqliteCopier(source).execute()
+            else:
+                raise TypeError(source)
+        finally:
+            CONVERT_TABLE_INDEX.clear()
+
+    @classmethod
+    def insert_file_source(cls, source: FileConvertTableSource) -> None:
+        model = source.file_csv_convert.value.convert_table_type.value.model
+        with Session() as session:
+            # Only rows inserted by this import are deleted when it is invalid.
+            id_last = session.execute(select(func.max(model.id))).scalar_one_or_none()
+            try:
+                ConvertTableBulkInserter(session, source, commit_per_chunk=True).execute()
+                session.commit()
+            except InvalidConvertTableError:
+                session.rollback()
+                session.execute(
+                    delete(model).where(
+                        model.file_csv_convert_id == source.file_csv_convert.value.id.value,
+                        model.source == source.name,
+                        model.id > (0 if id_last is None else id_last),
+                    ),
+                )
+                session.commit()
+                raise
+
+    @classmethod
+    def try_to_execute(cls, path: Path) -> list[list[int | str]]:
+        """Execute importing process for convert table CSV, return errors instead of raising them."""
+        return cls.try_to_execute_source(ConvertTableSourceFactory.create(path))
+
+    @classmethod
+    def try_to_execute_source(cls, source: ConvertTableSource) -> list[list[int | str]]:
+        """Execute importing process for source of convert table, return errors instead of raising them."""
+        try:
+            cls.execute_source(source)
+        except InvalidConvertTableError as error:
+            return error.list_error
+        return []
+
+    @classmethod
+    def reload(cls, path: Path) -> ConvertTableDiff:
+        """Apply difference between rows imported from convert table file and current content of it.
+
+        Rows imported from convert table file are deleted when it has been removed,
+        and rows imported from other sources are kept.
+        """
+        source = ConvertTableSourceFactory.create(path)
+        with Session() as session:
+            convert_table_diff = ConvertTableReloader(session, source).execute()
+            session.commit()
+        CONVERT_TABLE_INDEX.apply(
+            source.file_csv_convert.value.convert_table_type.value.model,
+            source.file_csv_convert.value.id.value,
+            convert_table_diff,
+        )
+        return convert_table_diff
+
+    @classmethod
+    def remove_source(cls, source: ConvertTableSource) -> None:
+        """Delete rows imported from source, rows imported from other sources are kept."""
+        model = source.file_csv_convert.value.convert_table_type.value.model
+        with Session() as session:
+            session.execute(
+                delete(model).where(
+                    model.file_csv_convert_id == source.file_csv_convert.value.id.value,
+                    model.source == source.name,
+                ),
+            )
+            session.commit()
+        CONVERT_TABLE_INDEX.clear()
+
+    @classmethod
+    def execute_all(cls, directory_csv_convert: Path) -> None:
+        """Execute importing process for all convert table CSV in directory and tables in configuration.
+
+        Errors of all convert table CSV are raised at once so that they can be fixed in one pass.
+        """
+        list_error = [
+            error
+            for source in ConvertTableSourceFactory.create_all(directory_csv_convert)
+            for error in cls.try_to_execute_source(source)
+        ]
+        if list_error:
+            raise InvalidConvertTableError(list_error)
+        cls.build_indexes()
+
+    @classmethod
+    def build_indexes(cls) -> None:
+        """Build indexes of imported convert tables in advance so that converting rows only looks up them."""
+        for convert_table_type in ConvertTableType:
+            CONVERT_TABLE_INDEX.build(convert_table_type.value.model)
+
+
+class ConvertTableBulkInserter:
+    """This class implements inserting rows of convert table CSV through SQLAlchemy Core executemany.
+
+    Rows are streamed in chunks as plain dictionaries without creating model instances,
+    and each chunk is committed when commit_per_chunk is True, so that memory is bounded by chunk size.
+    Names which are duplicated in convert table CSV or in imported convert table are detected by in-memory set
+    before inserting, since unique constraint of database can't tell which line is duplicated.
+    After first error, rows are no longer inserted but all rows are still checked to report every error.
+    """
+
+    DEFAULT_CHUNK_SIZE = 10_000
+
+    def __init__(
+        self,
+        session: SQLAlchemySession,
+        source: FileConvertTableSource,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        *,
+        commit_per_chunk: bool = False,
+    ) -> None:
+        self.session = session
+        self.file_csv_convert_id = source.file_csv_convert.value.id.value
+        self.model = source.file_csv_convert.value.convert_table_type.value.model
+        self.source = source
+        self.chunk_size = chunk_size
+        self.commit_per_chunk = commit_per_chunk
+        # Reason: Mixin doesn't declare __table__ which is added by declarative mapping.
+        self.statement = insert(self.model.__table__)  # type: ignore[attr-defined]
+        self.dictionary_line_number: dict[str, int | None] = {}
+        self.list_error: list[tuple[int, str]] = []
+
+    def execute(self) -> None:
+        """Insert rows of convert table CSV, raise error when some names are duplicated."""
+        self.dictionary_line_number = dict.fromkeys(
+            self.session.execute(
+                select(self.model.name).where(self.model.file_csv_convert_id == self.file_csv_convert_id),
+            ).scalars(),
+        )
+        for list_row in split(self.source.iterate_entry(), self.chunk_size):
+            list_parameters = list(self.create_parameters(list_row))
+            if list_parameters and not self.list_error:
+                self.insert(list_parameters)
+        self.raise_if_error()
+
+    def raise_if_error(self) -> None:
+        if self.list_error:
+            raise InvalidConvertTableError(
+                [[self.source.name, line_number, error] for line_number, error in self.list_error],
+            )
+
+    def insert(self, list_parameters: list[dict[str, Any]]) -> None:
+        self.session.execute(self.statement, list_parameters)
+        if self.commit_per_chunk:
+            self.session.commit()
+
+    def create_parameters(self, list_row: Iterable[tuple[int, list[str]]]) -> Iterable[dict[str, Any]]:
+        """Create parameters of insert, values of empty cells are None except name."""
+        columns = self.model.COLUMNS_CSV
+        for line_number, row in list_row:
+            if not 1 <= len(row) <= len(columns):
+                self.list_error.append((line_number, f"Number of columns should be 1 to {len(columns)}."))
+                continue
+            name = row[0]
+            try:
+                ConvertTablePattern.validate(name)
+            except re.error as error:
+                self.list_error.append((line_number, f"Invalid regular expression, {error}. Name = {name}"))
+                continue
+            if name in self.dictionary_line_number:
+                line_number_defined = self.dictionary_line_number[name]
+                defined = "imported" if line_number_defined is None else f"defined on line {line_number_defined}"
+                self.list_error.append((line_number, f"Name has already been {defined}. Name = {name}"))
+                continue
+            self.dictionary_line_number[name] = line_number
+            parameters = dict.fromkeys(columns)
+            parameters.update(zip(columns[1:], (value or None for value in row[1:]), strict=False))
+            parameters["name"] = name
+            parameters["file_csv_convert_id"] = self.file_csv_convert_id
+            parameters["source"] = self.source.name
+            yield parameters
+
+
+class ConvertTableReloader:
+    """This class implements applying only difference between convert table CSV and imported convert table.
+
+    Rows are compared by hash of their columns keyed by name in convert table CSV,
+    then only inserted, updated and deleted rows are applied to database in single transaction.
+    Only rows imported from the same source are compared,
+    and names imported from other sources are reported as duplicated as same as importing.
+    Convert table CSV is checked entirely before applying, so that invalid one doesn't change imported convert table.
+    """
+
+    def __init__(self, session: SQLAlchemySession, source: FileConvertTableSource) -> None:
+        self.session = session
+        self.file_csv_convert_id = source.file_csv_convert.value.id.value
+        self.model = source.file_csv_convert.value.convert_table_type.value.model
+        # Reason: Mixin doesn't declare __table__ which is added by declarative mapping.
+        self.table = self.model.__table__  # type: ignore[attr-defined]
+        self.source = source
+        self.convert_table_bulk_inserter = ConvertTableBulkInserter(session, source)
+
+    def execute(self) -> ConvertTableDiff:
+        """Apply difference into database without committing, and return applied difference."""
+        dictionary_loaded = self.load()
+        dictionary_parameters = self.read()
+        list_parameters_inserted = []
+        list_parameters_updated = []
+        for name, parameters in dictionary_parameters.items():
+            loaded = dictionary_loaded.get(name)
+            if loaded is None:
+                list_parameters_inserted.append(parameters)
+            elif loaded[1] != self.hash_row(parameters):
+                list_parameters_updated.append({**parameters, "id": loaded[0]})
+        list_name_deleted = [name for name in dictionary_loaded if name not in dictionary_parameters]
+        self.apply(
+            list_parameters_inserted,
+            list_parameters_updated,
+            [dictionary_loaded[name][0] for name in list_name_deleted],
+        )
+        return ConvertTableDiff(
+            self.select_values(list_parameters_inserted),
+            self.select_values(list_parameters_updated),
+            list_name_deleted,
+        )
+
+    def apply(
+        self,
+        list_parameters_inserted: list[dict[str, Any]],
+        list_parameters_updated: list[dict[str, Any]],
+        list_id_deleted: list[int],
+    ) -> None:
+        for list_id in self.chunk(list_id_deleted):
+            self.session.execute(delete(self.table).where(self.table.c.id.in_(list_id)))
+        if list_parameters_updated:
+            # ORM bulk update by primary key, which is executed as executemany.
+            self.session.execute(update(self.model), list_parameters_updated)
+        if list_parameters_inserted:
+            self.session.execute(insert(self.table), list_parameters_inserted)
+
+    def load(self) -> dict[str, tuple[int, bytes]]:
+        """Return primary key and hash of row imported from source for each name.
+
+        Names imported from other sources are set into bulk inserter to detect duplicated names.
+        """
+        columns = [getattr(self.model, column) for column in self.model.COLUMNS_CSV]
+        result = self.session.execute(
+            select(self.model.id, self.model.source, *columns).where(
+                self.model.file_csv_convert_id == self.file_csv_convert_id,
+            ),
+        )
+        dictionary_loaded = {}
+        for row in result:
+            if row[1] != self.source.name:
+                self.convert_table_bulk_inserter.dictionary_line_number[row[2]] = None
+                continue
+            dictionary_loaded[row[2]] = (
+                row[0],
+                self.hash_row(dict(zip(self.model.COLUMNS_CSV, row[2:], strict=True))),
+            )
+        return dictionary_loaded
+
+    def read(self) -> dict[str, dict[str, Any]]:
+        """Return parameters of each name in convert table CSV, or empty when it has been removed."""
+        if not self.source.path.is_file():
+            return {}
+        dictionary_parameters = {
+            parameters["name"]: parameters
+            for parameters in self.convert_table_bulk_inserter.create_parameters(self.source.iterate_entry())
+        }
+        self.convert_table_bulk_inserter.raise_if_error()
+        return dictionary_parameters
+
+    def hash_row(self, parameters: dict[str, Any]) -> bytes:
+        values = [parameters[column] for column in self.model.COLUMNS_CSV]
+        return hashlib.blake2b(json.dumps(values, ensure_ascii=False).encode(), digest_size=16).digest()
+
+    def select_values(self, list_parameters: list[dict[str, Any]]) -> list[Any]:
+        """Select values of rows which have been inserted or updated in current transaction."""
+        return [
+            value
+            for list_name in self.chunk([parameters["name"] for parameters in list_parameters])
+            for value in CONVERT_TABLE_INDEX.create_values(
+                self.model,
+                self.session.execute(
+                    select(self.model).where(
+                        self.model.file_csv_convert_id == self.file_csv_convert_id,
+                        self.model.name.in_(list_name),
+                    ),
+                ).scalars(),
+            )
+        ]
+
+    @staticmethod
+    def chunk(list_item: list[Any]) -> Iterable[list[Any]]:
+        # Reason: Number of parameters of statement is limited by SQLite.
+        return split(list_item, ConvertTableBulkInserter.DEFAULT_CHUNK_SIZE)
+
+
+class ConvertTableSqliteCopier:
+    """This class implements copying rows of table of external SQLite database into convert table by SQLite itself.
+
+    External database is attached to database, then rows are copied by INSERT ... SELECT in order of rowid
+    instead of parsing and inserting each row in Python, so that large table can be imported quickly.
+    Attached table isn't queried in place on each lookup since lookup backends, checking names,
+    priority of rules and reporting errors work on convert table,
+    so changes of external database are applied only when it is imported again.
+    Rows which have been imported from the same source are replaced in the same transaction,
+    so that executing again reloads the table.
+    Names are checked by queries before copying as same as convert table CSV.
+    Database should be SQLite since external database is attached to it.
+    """
+
+    SCHEMA_NAME = "convert_table_source"
+
+    def __init__(self, source: SqliteConvertTableSource) -> None:
+        self.source = source
+        self.file_csv_convert_id = source.file_csv_convert.value.id.value
+        self.model = source.file_csv_convert.value.convert_table_type.value.model
+        # Reason: Mixin doesn't declare __table__ which is added by declarative mapping.
+        self.table = self.model.__table__  # type: ignore[attr-defined]
+
+    def execute(self) -> None:
+        """Copy rows of table, raise error when columns or some names are invalid."""
+        self.validate()
+        with Session.get_bind().engine.connect() as connection:
+            connection.exec_driver_sql(f"ATTACH DATABASE ? AS {self.SCHEMA_NAME}", (str(self.source.path),))
+            try:
+                connection.exec_driver_sql(
+                    f"DELETE FROM main.{self.quote(connection, self.table.name)} "  # noqa: S608
+                    "WHERE file_csv_convert_id = ? AND source = ?",
+                    (self.file_csv_convert_id, self.source.name),
+                )
+                self.raise_if_error(connection)
+                connection.exec_driver_sql(
+                    f"INSERT INTO main.{self.quote(connection, self.table.name)} "  # noqa: S608
+                    f"(file_csv_convert_id, source, {', '.join(self.model.COLUMNS_CSV)}) "
+                    f"SELECT ?, ?, {', '.join(self.select(connection, column) for column in self.model.COLUMNS_CSV)} "
+                    f"FROM {self.from_(connection)} ORDER BY rowid",
+                    (self.file_csv_convert_id, self.source.name),
+                )
+                connection.commit()
+            finally:
+                connection.rollback()
+                connection.exec_driver_sql(f"DETACH DATABASE {self.SCHEMA_NAME}")
+
+    def validate(self) -> None:
+        """Raise error before attaching since attaching file which doesn't exist creates empty database."""
+        set_column_unknown = self.source.columns.keys() - set(self.model.COLUMNS_CSV)
+        if set_column_unknown:
+            message = f"Unknown columns: {', '.join(sorted(set_column_unknown))}."
+            raise InvalidConvertTableError([[self.source.name, "", message]])
+        if not self.source.path.is_file():
+            raise InvalidConvertTableError([[self.source.name, "", "Database file doesn't exist."]])
+
+    def raise_if_error(self, connection: Connection) -> None:
+        """Raise error for each row which name is empty, duplicated, imported or invalid regular expression."""
+        name = self.select(connection, "name")
+        list_error: list[tuple[int, str]] = [
+            (rowid, "Name is empty.")
+            for (rowid,) in connection.exec_driver_sql(
+                f"SELECT rowid FROM {self.from_(connection)} WHERE NULLIF({name}, '') IS NULL",  # noqa: S608
+            )
+        ]
+        list_error.extend(
+            (rowid, f"Name has already been defined on rowid {rowid_first}. Name = {name_row}")
+            for rowid, name_row, rowid_first in connection.exec_driver_sql(
+                "SELECT position, name, position_first FROM ("  # noqa: S608
+                f"SELECT rowid AS position, {name} AS name, MIN(rowid) OVER (PARTITION BY {name}) AS position_first "
+                f"FROM {self.from_(connection)}"
+                ") WHERE position != position_first",
+            )
+        )
+        list_error.extend(
+            (rowid, f"Name has already been imported. Name = {name_row}")
+            for rowid, name_row in connection.exec_driver_sql(
+                f"SELECT rowid, {name} FROM {self.from_(connection)} WHERE {name} IN ("  # noqa: S608
+                f"SELECT name FROM main.{self.quote(connection, self.table.name)} WHERE file_csv_convert_id = ?)",
+                (self.file_csv_convert_id,),
+            )
+        )
+        list_error.extend(self.check_regex(connection, name))
+        if list_error:
+            raise InvalidConvertTableError(
+                [[self.source.name, rowid, error] for rowid, error in sorted(list_error, key=lambda error: error[0])],
+            )
+
+    def check_regex(self, connection: Connection, name: str) -> Iterable[tuple[int, str]]:
+        for rowid, name_row in connection.exec_driver_sql(
+            f"SELECT rowid, {name} FROM {self.from_(connection)} WHERE {name} LIKE ?",  # noqa: S608
+            (f"{ConvertTablePattern.MARKER_REGEX}%",),
+        ):
+            error = self.validate_regex(name_row)
+            if error is not None:
+                yield rowid, error
+
+    @staticmethod
+    def validate_regex(name: str) -> str | None:
+        try:
+            ConvertTablePattern.validate(name)
+        except re.error as error:
+            return f"Invalid regular expression, {error}. Name = {name}"
+        return None
+
+    def select(self, connection: Connection, column: str) -> str:
+        """Return expression of column, empty string is treated as NULL as same as empty cell of convert table CSV."""
+        column_source = self.source.columns.get(column)
+        if column_source is None:
+            return "NULL"
+        expression = f"CAST({self.quote(connection, column_source)} AS TEXT)"
+        return expression if column == "name" else f"NULLIF({expression}, '')"
+
+    def from_(self, connection: Connection) -> str:
+        return f"{self.SCHEMA_NAME}.{self.quote(connection, self.source.table)}"
+
+    @staticmethod
+    def quote(connection: Connection, name: str) -> str:
+        return connection.dialect.identifier_preparer.quote(name)
@@ -0,0 +1,147 @@
+"""This module implements index of convert tables which looks up through selected backend."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+from typing import Any
+
+from sqlalchemy.exc import NoResultFound
+
+from zaimcsvconverter.convert_table_backend import DictConvertTableBackend
+from zaimcsvconverter.store_classifier import StoreClassifier
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterable
+
+    from zaimcsvconverter.config import StoreCategoryConfig
+    from zaimcsvconverter.convert_table_backend import ConvertTableBackend
+    from zaimcsvconverter.convert_table_backend import ConvertTableDiff
+    from zaimcsvconverter.models import FileCsvConvertId
+
+
+class ConvertTableIndex:
+    """This class implements index of convert tables which looks up through selected backend.
+
+    Dictionary backend is used until another backend is selected by initialize_database().
+    Stores are classified only by built-in rules until configure() is called after configuration is loaded.
+    """
+
+    def __init__(self) -> None:
+        self.backend: ConvertTableBackend[Any] = DictConvertTableBackend()
+
+    def use(self, backend: ConvertTableBackend[Any]) -> None:
+        """Select backend, and release previous one."""
+        self.backend.close()
+        backend.configure(self.backend.store_classifier)
+        backend.bind()
+        self.backend = backend
+
+    @contextmanager
+    def use_temporarily(self, backend: ConvertTableBackend[Any]) -> Generator[None, None, None]:
+        """Select backend while context, then select previous backend again without releasing it.
+
+        Previous backend keeps its classifier and lookup state since it isn't closed.
+        """
+        backend_previous = self.backend
+        backend.configure(backend_previous.store_classifier)
+        backend.bind()
+        self.backend = backend
+        try:
+            yield
+        finally:
+            self.backend = backend_previous
+            backend.close()
+
+    def configure(self, list_store_category_config: Iterable[StoreCategoryConfig]) -> None:
+        """Build classifier of stores once from store categories in configuration which has just been loaded."""
+        self.backend.configure(StoreClassifier.create(list_store_category_config))
+
+    def find(self, model: type[Any], file_csv_convert_id: FileCsvConvertId, name: str) -> Any:  # noqa: ANN401
+        """Find model by name in convert table of file_csv_convert_id.
+
+        If model is not exist, raise NoResultFound as same as query.
+        """
+        return self.raise_if_none(self.backend.find(model, file_csv_convert_id.value, name))
+
+    def try_to_find(self, model: type[Any], file_csv_convert_id: FileCsvConvertId, name: str) -> Any:  # noqa: ANN401
+        """Find model by name or name normalized for Shift JIS in convert table of file_csv_convert_id.
+
+        If model is not exist, raise NoResultFound as same as query.
+        """
+        return self.raise_if_none(self.backend.try_to_find(model, file_csv_convert_id.value, name))
+
+    def try_to_find_all(
+        self,
+        model: type[Any],
+        file_csv_convert_id: int,
+        iterable_name: Iterable[str],
+    ) -> dict[str, Any | None]:
+        """Find models of distinct names at once, value is None when name isn't defined."""
+        return self.backend.try_to_find_all(model, file_csv_convert_id, iterable_name)
+
+    @staticmethod
+    def raise_if_none(model: Any | None) -> Any:  # noqa: ANN401
+        if model is None:
+            msg = "No row was found when one was required"
+            raise NoResultFound(msg)
+        return model
+
+    def create_values(self, model: type[Any], iterable_model: Iterable[Any]) -> list[Any]:
+        return self.backend.create_values(model, iterable_model)
+
+    def build(self, model: type[Any]) -> None:
+        self.backend.build(model)
+
+    def apply(self, model: type[Any], file_csv_convert_id: int, convert_table_diff: ConvertTableDiff) -> None:
+        self.backend.apply(model, file_csv_convert_id, convert_table_diff)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+CONVERT_TABLE_INDEX = ConvertTableIndex()
+
+
+class ConvertTablePrefetcher:
+    """This class implements resolving distinct names referred by chunk of rows at once.
+
+    Rows request names before validating, then names are resolved by single probe into index of each convert table,
+    so that undefined names in chunk are known at once.
+    """
+
+    def __init__(self) -> None:
+        self.dictionary_name: dict[tuple[type[Any], int], set[str]] = {}
+        self.dictionary_model: dict[tuple[type[Any], int], dict[str, Any | None]] = {}
+
+    def request(self, model: type[Any], file_csv_convert_id: FileCsvConvertId, name: str) -> None:
+        """Request to resolve name in convert table of file_csv_convert_id."""
+        self.dictionary_name.setdefault((model, file_csv_convert_id.value), set()).add(name)
+
+    def execute(self) -> None:
+        """Resolve all requested names."""
+        for (model, file_csv_convert_id), set_name in self.dictionary_name.items():
+            self.dictionary_model[(model, file_csv_convert_id)] = CONVERT_TABLE_INDEX.try_to_find_all(
+                model,
+                file_csv_convert_id,
+                set_name,
+            )
+
+    def get(self, model: type[Any], file_csv_convert_id: FileCsvConvertId, name: str) -> Any | None:  # noqa: ANN401
+        """Return resolved model, or None when name isn't defined or hasn't been requested."""
+        return self.dictionary_model.get((model, file_csv_convert_id.value), {}).get(name)
+
+    def is_resolved(self, model: type[Any], file_csv_convert_id: FileCsvConvertId, name: str) -> bool:
+        """Return whether name has been resolved, including the case that it isn't defined."""
+        return name in self.dictionary_model.get((model, file_csv_convert_id.value), {})
+
+    @property
+    def list_undefined(self) -> list[tuple[type[Any], int, str]]:
+        """Names which aren't defined in convert tables."""
+        return [
+            (model, file_csv_convert_id, name)
+            for (model, file_csv_convert_id), dictionary_model in self.dictionary_model.items()
+            for name, found in dictionary_model.items()
+            if found is None
+        ]
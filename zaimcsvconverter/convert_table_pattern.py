@@ -0,0 +1,122 @@
+"""This module implements prefix and regular expression rules in convert table."""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class ConvertTablePattern:
+    """This class implements prefix and regular expression rules in convert table of one convert table CSV.
+
+    Rules are opt-in by marker at the beginning of name so that existing exact names never turn into rules:
+    name which starts with "prefix:" is prefix rule,
+    and name which starts with "regex:" is regular expression rule which should match whole name.
+    Prefix rules are held in trie to find longest prefix, and regular expression rules are combined into single
+    pattern, so that lookup takes time proportional to length of name however many rules exist.
+    Prefix rules take priority over regular expression rules, and former rule takes priority in each kind.
+    Rules are built when instance is created so that invalid rule raises error before lookup.
+    """
+
+    MARKER_PREFIX = "prefix:"
+    MARKER_REGEX = "regex:"
+    # Key of node of trie for model, which never conflicts with character.
+    KEY_MODEL = ""
+    # Tokens which are skipped to find numbered references: character sets, octal escapes and other escapes.
+    # Numbered references are backreferences such as \1 and conditions such as (?(1)...).
+    REGEX_NUMBERED_REFERENCE = re.compile(r"\[\^?\]?(?:\\.|[^\]\\])*\]|\\[0-7]{3}|(\\[1-9]|\(\?\(\d)|\\.")
+    FLAGS_DEFAULT = re.compile("").flags
+
+    def __init__(self, iterable_rule: Iterable[tuple[str, Any]] = ()) -> None:
+        """Build rules from pairs of name and model, names which aren't rule are ignored."""
+        self.trie: dict[str, Any] = {}
+        list_regex: list[str] = []
+        self.list_model_regex: list[Any] = []
+        for name, model in iterable_rule:
+            if self.is_regex(name):
+                self.validate(name)
+                list_regex.append(f"(?P<_{len(list_regex)}>{self.strip_marker(name)})")
+                self.list_model_regex.append(model)
+            elif self.is_prefix(name):
+                self.add_prefix(name, model)
+        self.pattern = re.compile("|".join(list_regex)) if list_regex else None
+
+    @classmethod
+    def is_prefix(cls, name: str) -> bool:
+        return len(name) > len(cls.MARKER_PREFIX) and name.startswith(cls.MARKER_PREFIX)
+
+    @classmethod
+    def is_regex(cls, name: str) -> bool:
+        return len(name) > len(cls.MARKER_REGEX) and name.startswith(cls.MARKER_REGEX)
+
+    @classmethod
+    def strip_marker(cls, name: str) -> str:
+        """Return body of rule without marker."""
+        for marker in (cls.MARKER_PREFIX, cls.MARKER_REGEX):
+            if name.startswith(marker):
+                return name[len(marker) :]
+        return name
+
+    @classmethod
+    def validate(cls, name: str) -> None:
+        """Raise re.error when name is regular expression rule which can't be compiled or combined.
+
+        Since rules are combined into single pattern, each rule can't have global inline flags
+        which affect other rules, named groups which conflict with ones of other rules,
+        or numbered references which refer to groups of other rules.
+        """
+        if not cls.is_regex(name):
+            return
+        regex = cls.strip_marker(name)
+        pattern = re.compile(regex)
+        if pattern.flags != cls.FLAGS_DEFAULT:
+            msg = "global inline flags can't be used, use scoped flags such as (?i:...) instead"
+            raise re.error(msg, regex)
+        if pattern.groupindex:
+            msg = "named groups can't be used, use (...) or (?:...) instead"
+            raise re.error(msg, regex)
+        position = cls.find_numbered_reference(regex)
+        if position is not None:
+            msg = "numbered references to groups can't be used"
+            raise re.error(msg, regex, position)
+
+    @classmethod
+    def find_numbered_reference(cls, regex: str) -> int | None:
+        """Return position of first numbered reference in regular expression, or None when it has nothing."""
+        return next(
+            (match.start() for match in cls.REGEX_NUMBERED_REFERENCE.finditer(regex) if match.group(1) is not None),
+            None,
+        )
+
+    def add_prefix(self, name: str, model: Any) -> None:  # noqa: ANN401
+        node = self.trie
+        for character in self.strip_marker(name):
+            node = node.setdefault(character, {})
+        node.setdefault(self.KEY_MODEL, model)
+
+    def match(self, name: str) -> Any | None:  # noqa: ANN401
+        """Return model of longest prefix rule, or of regular expression rule which matches name."""
+        model = None
+        node = self.trie
+        for character in name:
+            child = node.get(character)
+            if child is None:
+                break
+            node = child
+            model = node.get(self.KEY_MODEL, model)
+        if model is not None or self.pattern is None:
+            return model
+        match = self.pattern.fullmatch(name)
+        # Outer group of each rule is closed at last, so that lastgroup is the rule which matches.
+        return None if match is None or match.lastgroup is None else self.list_model_regex[int(match.lastgroup[1:])]
+
+    def match_either(self, name: str, name_normalized: str) -> Any | None:  # noqa: ANN401
+        """Return model of rule which matches name, or normalized name when name matches nothing."""
+        model = self.match(name)
+        if model is None and name_normalized != name:
+            model = self.match(name_normalized)
+        return model
@@ -0,0 +1,216 @@
+"""This module implements sources of convert tables in several formats."""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+from abc import ABC
+from abc import abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import ClassVar
+
+import yaml
+from yamldataclassconfig.exceptions import ConfigNotLoadedError
+
+from zaimcsvconverter import CONFIG
+from zaimcsvconverter.exceptions import InvalidConvertTableError
+from zaimcsvconverter.file_csv_convert import FileCsvConvert
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterable
+
+    from zaimcsvconverter.config import ConvertTableSourceConfig
+
+# Line number or position and row of convert table
+Entry = tuple[int, list[str]]
+
+
+class ConvertTableSource(ABC):
+    """This class implements source of convert table."""
+
+    def __init__(self, file_csv_convert: FileCsvConvert) -> None:
+        self.file_csv_convert = file_csv_convert
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Name of source which is reported with errors."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def fingerprint(self) -> str | None:
+        """Return fingerprint which changes when content of source is changed, or None when it doesn't exist."""
+        raise NotImplementedError
+
+
+class FileConvertTableSource(ConvertTableSource):
+    """This class implements convert table file in convert table directory, detected by name without suffix."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(FileCsvConvert.create_by_path_csv_convert(path))
+        self.path = path
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def fingerprint(self) -> str | None:
+        if not self.path.is_file():
+            return None
+        return hashlib.sha256(self.path.read_bytes()).hexdigest()
+
+    @abstractmethod
+    def iterate_entry(self) -> Iterable[Entry]:
+        """Yield rows of convert table as same as ones of convert table CSV."""
+        raise NotImplementedError
+
+
+class CsvConvertTableSource(FileConvertTableSource):
+    """This class implements convert table CSV."""
+
+    def iterate_entry(self) -> Generator[Entry, None, None]:
+        with self.path.open("r", encoding="UTF-8") as file_convert_table:
+            reader = csv.reader(file_convert_table)
+            yield from ((reader.line_num, row) for row in reader)
+
+
+class JsonConvertTableSource(FileConvertTableSource):
+    """This class implements convert table JSON.
+
+    Top level is list of entries, and each entry is list of columns as same as row of convert table CSV
+    or object keyed by column names such as name and name_zaim.
+    Position of entry starting from 1 is reported instead of line number.
+    """
+
+    def iterate_entry(self) -> list[Entry]:
+        try:
+            document = self.load()
+        except ValueError as error:
+            raise InvalidConvertTableError([[self.name, "", f"Failed to parse, {error}"]]) from error
+        if not isinstance(document, list):
+            raise InvalidConvertTableError([[self.name, "", "Top level should be list of entries."]])
+        columns = self.file_csv_convert.value.convert_table_type.value.model.COLUMNS_CSV
+        list_error: list[list[int | str]] = [
+            [self.name, position, message]
+            for position, element in enumerate(document, start=1)
+            if (message := self.validate(element, columns)) is not None
+        ]
+        if list_error:
+            raise InvalidConvertTableError(list_error)
+        return [(position, self.create_row(element, columns)) for position, element in enumerate(document, start=1)]
+
+    def load(self) -> Any:  # noqa: ANN401
+        with self.path.open("r", encoding="UTF-8") as file:
+            return json.load(file)
+
+    @staticmethod
+    def validate(element: Any, columns: tuple[str, ...]) -> str | None:  # noqa: ANN401
+        """Return error of entry, or None when it is valid."""
+        if isinstance(element, dict):
+            set_column_unknown = element.keys() - set(columns)
+            return (
+                f"Unknown columns: {', '.join(sorted(map(str, set_column_unknown)))}." if set_column_unknown else None
+            )
+        return None if isinstance(element, list) else "Entry should be list or object."
+
+    @staticmethod
+    def create_row(element: dict[str, Any] | list[Any], columns: tuple[str, ...]) -> list[str]:
+        """Create row of convert table CSV from entry, values of empty columns are empty strings."""
+        if isinstance(element, dict):
+            element = [element.get(column) for column in columns]
+        return ["" if value is None else str(value) for value in element]
+
+
+class YamlConvertTableSource(JsonConvertTableSource):
+    """This class implements convert table YAML which has same structure as convert table JSON."""
+
+    def load(self) -> Any:  # noqa: ANN401
+        # Reason: LibYAML is much faster than pure Python implementation when it's available.
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with self.path.open("r", encoding="UTF-8") as file:
+            try:
+                # Reason: Loader is safe one.
+                return yaml.load(file, Loader=loader)  # noqa: S506
+            except yaml.YAMLError as error:
+                raise ValueError(error) from error
+
+
+class SqliteConvertTableSource(ConvertTableSource):
+    """This class implements table of external SQLite database which is imported as convert table.
+
+    Columns of convert table are mapped to columns of table, name is mapped to column of same name by default,
+    and other columns which aren't mapped are imported as empty.
+    Rowid is reported instead of line number.
+    """
+
+    def __init__(self, convert_table_source_config: ConvertTableSourceConfig) -> None:
+        super().__init__(FileCsvConvert.create_by_path_csv_convert(Path(convert_table_source_config.convert_table)))
+        self.path = Path(convert_table_source_config.path)
+        self.table = convert_table_source_config.table
+        self.columns = {"name": "name", **convert_table_source_config.columns}
+
+    @property
+    def name(self) -> str:
+        return f"{self.path.name}:{self.table}"
+
+    def fingerprint(self) -> str | None:
+        """Return fingerprint by modified time and size instead of content not to read large database entirely."""
+        if not self.path.is_file():
+            return None
+        stat = self.path.stat()
+        return json.dumps([self.table, self.columns, stat.st_mtime_ns, stat.st_size], sort_keys=True)
+
+
+class ConvertTableSourceFactory:
+    """This class implements creating sources of convert tables."""
+
+    DICTIONARY_SUFFIX: ClassVar[dict[str, type[FileConvertTableSource]]] = {
+        ".csv": CsvConvertTableSource,
+        ".json": JsonConvertTableSource,
+        ".yml": YamlConvertTableSource,
+        ".yaml": YamlConvertTableSource,
+    }
+
+    @classmethod
+    def create(cls, path: Path) -> FileConvertTableSource:
+        """Create source by path to convert table file."""
+        type_source = cls.DICTIONARY_SUFFIX.get(path.suffix)
+        if type_source is None:
+            msg = f"Unsupported format of convert table file. Path = {path}"
+            raise ValueError(msg)
+        return type_source(path)
+
+    @classmethod
+    def create_all(cls, directory_csv_convert: Path) -> list[ConvertTableSource]:
+        """Create sources of convert table files in directory, then ones of tables in current configuration."""
+        return [*map(cls.create, cls.list_path(directory_csv_convert)), *cls.create_by_config()]
+
+    @classmethod
+    def list_path(cls, directory_csv_convert: Path) -> list[Path]:
+        """Return convert table files in order of file name.
+
+        Only files of supported formats which are named as convert table CSV except suffix are listed,
+        so that other files in directory are ignored.
+        """
+        set_stem = {Path(file_csv_convert.value.name).stem for file_csv_convert in FileCsvConvert}
+        return sorted(
+            path
+            for path in directory_csv_convert.glob("*")
+            if path.suffix in cls.DICTIONARY_SUFFIX and path.stem in set_stem
+        )
+
+    @staticmethod
+    def create_by_config() -> list[SqliteConvertTableSource]:
+        """Create sources of tables in current configuration, or no source when it isn't loaded."""
+        try:
+            list_convert_table_source_config = CONFIG.convert_table_sources
+        except ConfigNotLoadedError:
+            return []
+        return [
+            SqliteConvertTableSource(convert_table_source_config)
+            for convert_table_source_config in list_convert_table_source_config
+        ]
@@ -7,6 +7,7 @@ from zaimcsvconverter import DirectoryCsv
 from zaimcsvconverter.accounts.enum import Account
 from zaimcsvconverter.first_form_normalizer import FirstFormNormalizer
 from zaimcsvconverter.inputtooutput.convert_workflow import ConvertWorkflow
+from zaimcsvconverter.inputtooutput.convert_workflow import PipelinedConvertWorkflow
 from zaimcsvconverter.inputtooutput.converters.recordtozaim.record_to_zaim_converter import RecordToZaimConverter
 from zaimcsvconverter.inputtooutput.datasources.csvfile.csv_file import Csv
 from zaimcsvconverter.inputtooutput.datasources.csvfile.csv_record_processor import CsvRecordProcessor
@@ -21,7 +22,13 @@ if TYPE_CHECKING:
 class CsvToCsvConverter:
     """This class implements abstract converting steps for CSV."""
 
-    def __init__(self, path_csv_file: Path, directory_csv_output: Path = DirectoryCsv.OUTPUT.value) -> None:
+    def __init__(
+        self,
+        path_csv_file: Path,
+        directory_csv_output: Path = DirectoryCsv.OUTPUT.value,
+        *,
+        pipelined: bool = False,
+    ) -> None:
         account_context: AccountContext[InputRowData, InputRow[InputRowData]] = Account.create_by_path_csv_input(
             path_csv_file,
         ).value
@@ -30,8 +37,13 @@ class CsvToCsvConverter:
         data_source_csv = Csv(first_form_normalizer, CsvRecordProcessor(account_context.input_row_factory))
         record_converter = RecordToZaimConverter(account_context.zaim_row_converter_factory, path_csv_file)
         output_model_exporter = ZaimCsvOutputModelExporter(directory_csv_output / path_csv_file.name)
-        self.convert_workflow = ConvertWorkflow(data_source_csv, record_converter, output_model_exporter)
+        convert_workflow_class = PipelinedConvertWorkflow if pipelined else ConvertWorkflow
+        self.convert_workflow = convert_workflow_class(data_source_csv, record_converter, output_model_exporter)
 
     def execute(self) -> None:
         """Execute CSV convert steps."""
         self.convert_workflow.execute()
+
+    async def aexecute(self) -> None:
+        """Execute CSV convert steps without blocking event loop."""
+        await self.convert_workflow.aexecute()
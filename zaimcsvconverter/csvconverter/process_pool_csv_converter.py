@@ -0,0 +1,96 @@
+"""This module implements converting steps for multiple CSV files on process pool."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+
+from zaimcsvconverter import CONFIG
+from zaimcsvconverter import Session
+from zaimcsvconverter import create_database_engine
+from zaimcsvconverter.convert_table_cache import ConvertTableCache
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.errorreporters.convert_result import ConvertResult
+from zaimcsvconverter.models import initialize_database
+from zaimcsvconverter.shared_convert_table import SharedConvertTable
+from zaimcsvconverter.shared_convert_table import SharedConvertTableBackend
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+FILE_NAME_SHARED_CONVERT_TABLE = "convert_table.sst"
+
+
+def bind_new_database_engine() -> None:
+    """Bind database to new engine on worker process since SQLite connection can't be shared with parent process."""
+    Session.remove()
+    Session.configure(bind=create_database_engine())
+
+
+def initialize_worker(path_file_config: Path, path_file_convert_table: Path) -> None:
+    """Load configuration and map convert tables written by parent process on worker process."""
+    bind_new_database_engine()
+    CONFIG.load(path_file_config)
+    CONVERT_TABLE_INDEX.configure(CONFIG.store_categories)
+    CONVERT_TABLE_INDEX.use(SharedConvertTableBackend(path_file_convert_table))
+
+
+@contextmanager
+def create_process_pool(
+    path_file_config: Path,
+    directory_csv_convert: Path,
+    max_workers: int | None = None,
+) -> Generator[ProcessPoolExecutor, None, None]:
+    """Create process pool which workers have loaded configuration and convert tables.
+
+    Convert tables are imported once on current process and written into file which workers map into memory,
+    so that workers neither import convert tables nor hold their own copy of them.
+    Configuration should have been loaded on current process in advance.
+    """
+    initialize_database()
+    ConvertTableCache(directory_csv_convert).execute()
+    with TemporaryDirectory() as directory_temporary:
+        path_file_convert_table = Path(directory_temporary) / FILE_NAME_SHARED_CONVERT_TABLE
+        SharedConvertTable.write(path_file_convert_table)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=initialize_worker,
+            initargs=(path_file_config, path_file_convert_table),
+        ) as executor:
+            yield executor
+
+
+class ProcessPoolCsvConverter:
+    """This class implements converting steps for multiple CSV files on process pool.
+
+    Each input CSV file is converted on separate process.
+    """
+
+    def __init__(
+        self,
+        path_file_config: Path,
+        directory_csv_convert: Path,
+        directory_csv_output: Path,
+        *,
+        max_workers: int | None = None,
+        pipelined: bool = False,
+    ) -> None:
+        self.path_file_config = path_file_config
+        self.directory_csv_convert = directory_csv_convert
+        self.directory_csv_output = directory_csv_output
+        self.max_workers = max_workers
+        self.pipelined = pipelined
+
+    def execute(self, list_path_csv_file: list[Path]) -> Generator[ConvertResult, None, None]:
+        """Convert input CSV files and yield results in order of argument."""
+        with create_process_pool(self.path_file_config, self.directory_csv_convert, self.max_workers) as executor:
+            convert = partial(
+                ConvertResult.convert,
+                directory_csv_output=self.directory_csv_output,
+                pipelined=self.pipelined,
+            )
+            yield from executor.map(convert, list_path_csv_file)
@@ -0,0 +1,130 @@
+"""This module implements converting steps for single CSV file which rows are split into shards."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
+from typing import TypeVar
+
+from zaimcsvconverter.csvconverter.csv_to_csv_converter import CsvToCsvConverter
+from zaimcsvconverter.iterables import split
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Generator
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from concurrent.futures import Executor
+    from concurrent.futures import Future
+    from pathlib import Path
+
+    from zaimcsvconverter.errorhandling.error_handler import UndefinedContentErrorHandler
+    from zaimcsvconverter.exceptions import InvalidCellError
+    from zaimcsvconverter.inputtooutput.datasources import DataSource
+    from zaimcsvconverter.inputtooutput.exporters import OutputRecord
+
+TypeVarItem = TypeVar("TypeVarItem")
+TypeVarResult = TypeVar("TypeVarResult")
+RawRecord = tuple[int, list[str]]
+
+
+@dataclass
+class ShardResult:
+    """This class implements result of validating and converting rows of shard.
+
+    Keys of dictionary_invalid_record are indices of rows in original input CSV file.
+    """
+
+    list_output_record: list[OutputRecord]
+    dictionary_invalid_record: dict[int, list[InvalidCellError]]
+    undefined_content_error_handler: UndefinedContentErrorHandler
+
+
+def convert_shard(path_csv_file: Path, list_raw_record: list[RawRecord]) -> ShardResult:
+    """Validate and convert rows of shard, this function is called on worker process."""
+    convert_workflow = CsvToCsvConverter(path_csv_file).convert_workflow
+    data_source = convert_workflow.data_source
+    list_output_record = [
+        convert_workflow.record_converter.convert(input_record)
+        for input_record in data_source.process_chunk(iter(list_raw_record), len(list_raw_record)) or []
+    ]
+    return ShardResult(
+        list_output_record,
+        data_source.dictionary_invalid_record,
+        data_source.undefined_content_error_handler,
+    )
+
+
+def map_bounded(
+    executor: Executor,
+    function: Callable[[TypeVarItem], TypeVarResult],
+    iterable: Iterable[TypeVarItem],
+    max_in_flight: int,
+) -> Generator[TypeVarResult, None, None]:
+    """Map function on executor in order of iterable, submitting at most max_in_flight items at once.
+
+    Unlike Executor.map(), iterable is not consumed all at once so that memory usage is bounded.
+    """
+    queue_future: deque[Future[TypeVarResult]] = deque()
+    iterator: Iterator[TypeVarItem] = iter(iterable)
+    try:
+        for item in iterator:
+            queue_future.append(executor.submit(function, item))
+            if len(queue_future) >= max_in_flight:
+                yield queue_future.popleft().result()
+        while queue_future:
+            yield queue_future.popleft().result()
+    finally:
+        for future in queue_future:
+            future.cancel()
+
+
+class ShardedCsvConverter:
+    """This class implements converting steps for single CSV file which rows are split into shards.
+
+    Header and footer are checked on current process while reading rows,
+    then each shard is validated and converted on worker process of executor.
+    Output rows and errors are merged in order of rows in input CSV file.
+    Workers of executor should have loaded configuration and convert tables.
+    """
+
+    DEFAULT_SHARD_SIZE = 10_000
+
+    def __init__(
+        self,
+        executor: Executor,
+        path_csv_file: Path,
+        directory_csv_output: Path,
+        *,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        max_in_flight: int = 2,
+    ) -> None:
+        self.executor = executor
+        self.path_csv_file = path_csv_file
+        self.shard_size = shard_size
+        self.max_in_flight = max_in_flight
+        self.convert_workflow = CsvToCsvConverter(path_csv_file, directory_csv_output).convert_workflow
+
+    def execute(self) -> None:
+        """Execute CSV convert steps."""
+        data_source = self.convert_workflow.data_source
+        iterable_shard_result = map_bounded(
+            self.executor,
+            partial(convert_shard, self.path_csv_file),
+            split(data_source.iterate_raw_record(), self.shard_size),
+            self.max_in_flight,
+        )
+        self.convert_workflow.export(self.merge(data_source, iterable_shard_result))
+
+    @staticmethod
+    def merge(
+        data_source: DataSource,
+        iterable_shard_result: Iterable[ShardResult],
+    ) -> Generator[OutputRecord, None, None]:
+        """Merge errors of shards into data source and yield output records in order."""
+        for shard_result in iterable_shard_result:
+            data_source.dictionary_invalid_record.update(shard_result.dictionary_invalid_record)
+            data_source.undefined_content_error_handler.extend(shard_result.undefined_content_error_handler)
+            yield from shard_result.list_output_record
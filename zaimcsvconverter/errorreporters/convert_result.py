@@ -0,0 +1,75 @@
+"""This module implements result of converting one input CSV file."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Any
+
+from zaimcsvconverter.csvconverter.csv_to_csv_converter import CsvToCsvConverter
+from zaimcsvconverter.errorhandling.error_handler import UndefinedContentErrorHandler
+from zaimcsvconverter.errorreporters.input_csv_error_reporter import DataSourceErrorReporterFactory
+from zaimcsvconverter.exceptions.invalid_input_csv_error import InvalidInputCsvError
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from zaimcsvconverter.csvconverter.sharded_csv_converter import ShardedCsvConverter
+    from zaimcsvconverter.inputtooutput.datasources import DataSource
+
+
+@dataclass
+class ConvertResult:
+    """This class implements result of converting one input CSV file.
+
+    Errors are held as rows of error CSV instead of data source so that the result can be passed across processes.
+    """
+
+    is_invalid: bool = False
+    list_invalid_row: list[list[int | str]] = field(default_factory=list)
+    undefined_content_error_handler: UndefinedContentErrorHandler = field(
+        default_factory=UndefinedContentErrorHandler,
+    )
+
+    @classmethod
+    def create_invalid(cls, data_source: DataSource) -> ConvertResult:
+        """Create result by invalid data source."""
+        return cls(
+            is_invalid=True,
+            list_invalid_row=list(DataSourceErrorReporterFactory.create(data_source)),
+            undefined_content_error_handler=data_source.undefined_content_error_handler,
+        )
+
+    @classmethod
+    def convert(cls, path_csv_file: Path, directory_csv_output: Path, *, pipelined: bool = False) -> ConvertResult:
+        """Convert input CSV file and return result."""
+        return cls.execute(CsvToCsvConverter(path_csv_file, directory_csv_output, pipelined=pipelined))
+
+    @classmethod
+    def execute(cls, csv_converter: CsvToCsvConverter | ShardedCsvConverter) -> ConvertResult:
+        """Execute CSV converter and return result."""
+        try:
+            csv_converter.execute()
+        except InvalidInputCsvError as exc:
+            return cls.create_invalid(exc.data_source)
+        return cls()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert into dictionary which can be serialized as JSON."""
+        return {
+            "is_invalid": self.is_invalid,
+            "list_invalid_row": self.list_invalid_row,
+            "list_undefined_content_error": self.undefined_content_error_handler.list_error,
+        }
+
+    @classmethod
+    def from_dict(cls, dictionary: dict[str, Any]) -> ConvertResult:
+        """Create result by dictionary created by to_dict()."""
+        undefined_content_error_handler = UndefinedContentErrorHandler()
+        undefined_content_error_handler.list_error = dictionary["list_undefined_content_error"]
+        return cls(
+            is_invalid=dictionary["is_invalid"],
+            list_invalid_row=dictionary["list_invalid_row"],
+            undefined_content_error_handler=undefined_content_error_handler,
+        )
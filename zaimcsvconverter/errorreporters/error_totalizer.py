@@ -5,65 +5,67 @@ from __future__ import annotations
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from zaimcsvconverter.csvconverter.csv_to_csv_converter import CsvToCsvConverter
 from zaimcsvconverter.errorhandling.error_handler import UndefinedContentErrorHandler
+from zaimcsvconverter.errorreporters.convert_result import ConvertResult
 from zaimcsvconverter.errorreporters.csv_exporter import CsvExporter
-from zaimcsvconverter.errorreporters.input_csv_error_reporter import DataSourceErrorReporterFactory
-from zaimcsvconverter.exceptions.invalid_input_csv_error import InvalidInputCsvError
+from zaimcsvconverter.errorreporters.undefined_content_suggester import UndefinedContentSuggester
 
 if TYPE_CHECKING:
     from collections.abc import Generator
     from pathlib import Path
 
-    from zaimcsvconverter.inputtooutput.datasources import DataSource
-
 
 class FileNameForError(Enum):
     INVALID_ROW = "error_invalid_row.csv"
     UNDEFINED_CONTENT = "error_undefined_content.csv"
+    CONVERT_TABLE = "error_convert_table.csv"
 
 
 class ErrorTotalizer:
-    """This class implements totalize process of error."""
+    """This class implements totalize process of error.
+
+    Undefined content errors are reported with similar entries of convert tables in current database
+    unless suggest is False.
+    """
 
-    def __init__(self, directory_csv_output: Path) -> None:
+    def __init__(self, directory_csv_output: Path, *, suggest: bool = True) -> None:
         self.directory_csv_output = directory_csv_output
-        self.list_invalid_data_source: list[DataSource] = []
+        self.suggest = suggest
+        self.list_invalid_convert_result: list[ConvertResult] = []
         self.undefined_content_error_handler: UndefinedContentErrorHandler = UndefinedContentErrorHandler()
 
     def __iter__(self) -> Generator[list[int | str], None, None]:
-        for data_source in self.list_invalid_data_source:
-            data_source_error_reporter = DataSourceErrorReporterFactory.create(data_source)
-            yield from data_source_error_reporter
+        for convert_result in self.list_invalid_convert_result:
+            yield from convert_result.list_invalid_row
 
-    def convert_csv(self, path_csv_file: Path) -> None:
+    def convert_csv(self, path_csv_file: Path, *, pipelined: bool = False) -> None:
         """To seal complexity in for loop."""
-        csv_to_csv_converter = CsvToCsvConverter(path_csv_file, self.directory_csv_output)
-        try:
-            csv_to_csv_converter.execute()
-        except InvalidInputCsvError as exc:
-            self.list_invalid_data_source.append(exc.data_source)
-            self.undefined_content_error_handler.extend(exc.data_source.undefined_content_error_handler)
+        self.merge(ConvertResult.convert(path_csv_file, self.directory_csv_output, pipelined=pipelined))
+
+    def merge(self, convert_result: ConvertResult) -> None:
+        """Merge result of converting one input CSV file.
+
+        Results should be merged in order of input CSV file to keep order of rows in error CSV.
+        """
+        if not convert_result.is_invalid:
+            return
+        self.list_invalid_convert_result.append(convert_result)
+        self.undefined_content_error_handler.extend(convert_result.undefined_content_error_handler)
 
     @property
     def is_presented(self) -> bool:
-        return bool(self.list_invalid_data_source)
+        return bool(self.list_invalid_convert_result)
 
     def report_to_csv(self) -> None:
         """Export invalid input CSV errors into CSV."""
         csv_exporter = CsvExporter(self.directory_csv_output)
         csv_exporter.export(self, FileNameForError.INVALID_ROW.value)
         if self.undefined_content_error_handler.is_presented:
+            undefined_content_suggester = UndefinedContentSuggester(
+                UndefinedContentSuggester.DEFAULT_TOP_K if self.suggest else 0,
+            )
             csv_exporter.export(
-                # Reason: mypy's bug. Iterator[List[str]] should be included in Iterator[List[Union[str, int]]] .
-                # error: Argument 1 to "export" of "CsvExporter" has incompatible type "UndefinedContentErrorHandler";
-                #        expected "Iterable[List[Union[str, int]]]"
-                # note: Following member(s) of "UndefinedContentErrorHandler" have conflicts:
-                # note:     Expected:
-                # note:         def __iter__(self) -> Iterator[List[Union[str, int]]]
-                # note:     Got:
-                # note:         def __iter__(self) -> Iterator[List[str]]
-                self.undefined_content_error_handler,  # type: ignore[arg-type]
+                undefined_content_suggester.suggest(self.undefined_content_error_handler),
                 FileNameForError.UNDEFINED_CONTENT.value,
             )
 
@@ -0,0 +1,140 @@
+"""This module implements suggesting existing convert table entries for undefined store or item names."""
+
+from __future__ import annotations
+
+import csv
+import io
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from sqlalchemy import select
+
+from zaimcsvconverter import Session
+from zaimcsvconverter.convert_table_backend import IndexedConvertTable
+from zaimcsvconverter.file_csv_convert import FileCsvConvert
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterable
+
+    import numpy.typing as npt
+
+
+class NgramIndex:
+    """This class implements character n-gram inverted index of names of convert table entries.
+
+    Similarity is Dice coefficient of sets of n-grams.
+    Candidates are entries in posting lists of n-grams of name except frequent ones,
+    then common n-grams of each candidate are counted by binary search on posting lists,
+    so that cost of search depends on length of posting lists of rare n-grams instead of number of entries.
+    """
+
+    N = 2
+    # Posting lists longer than this are too long to merge for each name
+    LENGTH_FREQUENT = 1_000
+
+    def __init__(self, list_row: list[list[str]]) -> None:
+        self.list_row = list_row
+        dictionary_list_index: defaultdict[str, list[int]] = defaultdict(list)
+        list_count_gram = []
+        for index, row in enumerate(list_row):
+            set_gram = self.create_grams(row[0])
+            list_count_gram.append(len(set_gram))
+            for gram in set_gram:
+                dictionary_list_index[gram].append(index)
+        self.dictionary_posting: dict[str, npt.NDArray[np.int64]] = {
+            gram: np.array(list_index, dtype=np.int64) for gram, list_index in dictionary_list_index.items()
+        }
+        self.array_count_gram = np.array(list_count_gram, dtype=np.int64)
+
+    @classmethod
+    def create_grams(cls, name: str) -> set[str]:
+        """Create n-grams of name after normalizing, padded so that names shorter than n also have n-gram."""
+        normalized = " ".join(unicodedata.normalize("NFKC", IndexedConvertTable.normalize(name)).casefold().split())
+        padded = f" {normalized} "
+        return {padded[index : index + cls.N] for index in range(len(padded) - cls.N + 1)}
+
+    def search(self, name: str, top_k: int) -> list[list[str]]:
+        """Return rows of top k entries which are most similar to name, in descending order of similarity."""
+        set_gram = self.create_grams(name)
+        list_posting = [
+            self.dictionary_posting[gram]
+            for gram in sorted(
+                set_gram & self.dictionary_posting.keys(),
+                key=lambda gram: (len(self.dictionary_posting[gram]), gram),
+            )
+        ]
+        if not list_posting:
+            return []
+        # When all n-grams are frequent, entries which share the rarest one are candidates.
+        list_posting_rare = [posting for posting in list_posting if len(posting) <= self.LENGTH_FREQUENT]
+        array_index = np.unique(np.concatenate(list_posting_rare or list_posting[:1]))
+        array_count_common = np.zeros(len(array_index), dtype=np.int64)
+        for posting in list_posting:
+            array_position = np.minimum(np.searchsorted(posting, array_index), len(posting) - 1)
+            array_count_common += posting[array_position] == array_index
+        array_score = 2 * array_count_common / (len(set_gram) + self.array_count_gram[array_index])
+        if len(array_index) > top_k:
+            # To sort only candidates which can be in top k
+            score_kth = np.partition(array_score, len(array_score) - top_k)[len(array_score) - top_k]
+            is_candidate = array_score >= score_kth
+            array_index, array_score = array_index[is_candidate], array_score[is_candidate]
+        # Former entry comes first when scores are same.
+        array_order = np.lexsort((array_index, -array_score))[:top_k]
+        return [self.list_row[index] for index in array_index[array_order].tolist()]
+
+
+class UndefinedContentSuggester:
+    """This class implements suggesting existing convert table entries for undefined store or item names.
+
+    Index is built once for each convert table CSV when its undefined name is found first.
+    Each suggestion is row of convert table CSV so that it can be copied after replacing its name.
+    """
+
+    DEFAULT_TOP_K = 3
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K) -> None:
+        self.top_k = top_k
+        self.dictionary_index: dict[FileCsvConvert, NgramIndex] = {}
+
+    def suggest(self, iterable_error: Iterable[list[str]]) -> Generator[list[int | str], None, None]:
+        """Yield rows of undefined content error followed by suggestions."""
+        for error in iterable_error:
+            file_name, store_name, item_name = error
+            row: list[int | str] = [file_name, store_name, item_name]
+            if self.top_k > 0:
+                ngram_index = self.get_index(FileCsvConvert.create_by_path_csv_convert(Path(file_name)))
+                row.extend(
+                    self.format(suggestion) for suggestion in ngram_index.search(store_name or item_name, self.top_k)
+                )
+            yield row
+
+    def get_index(self, file_csv_convert: FileCsvConvert) -> NgramIndex:
+        ngram_index = self.dictionary_index.get(file_csv_convert)
+        if ngram_index is None:
+            ngram_index = NgramIndex(self.load(file_csv_convert))
+            self.dictionary_index[file_csv_convert] = ngram_index
+        return ngram_index
+
+    @staticmethod
+    def load(file_csv_convert: FileCsvConvert) -> list[list[str]]:
+        """Load rows of convert table CSV from database in order of import."""
+        model = file_csv_convert.value.convert_table_type.value.model
+        with Session() as session:
+            iterable_model = session.execute(
+                select(model).where(model.file_csv_convert_id == file_csv_convert.value.id.value).order_by(model.id),
+            ).scalars()
+            return [
+                ["" if (value := getattr(instance, column)) is None else value for column in model.COLUMNS_CSV]
+                for instance in iterable_model
+            ]
+
+    @staticmethod
+    def format(row: list[str]) -> str:
+        """Format row as line of convert table CSV."""
+        string_io = io.StringIO()
+        csv.writer(string_io, lineterminator="").writerow(row)
+        return string_io.getvalue()
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from zaimcsvconverter.errorhandling.error_handler import UndefinedContentErrorHandler
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 
 class Error(Exception):
     """Base class for exceptions in this module.
@@ -74,3 +79,24 @@ class InvalidRecordErrorFactory:
 
 class SomeInvalidInputCsvError(Error):
     pass
+
+
+class InvalidConvertTableError(Error):
+    """Convert table CSV is invalid.
+
+    Each error is list of file name, line number and message so that errors can be exported into CSV.
+    """
+
+    def __init__(self, list_error: list[list[int | str]]) -> None:
+        super().__init__(list_error)
+        self.list_error = list_error
+
+    def __iter__(self) -> Iterator[list[int | str]]:
+        return iter(self.list_error)
+
+    def __str__(self) -> str:
+        """Return formatted error message, line number is omitted for error of whole convert table."""
+        return "\n".join(
+            f"{file_name}: {message}" if line_number == "" else f"{file_name}: line {line_number}: {message}"
+            for file_name, line_number, message in self
+        )
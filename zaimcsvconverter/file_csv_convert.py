@@ -4,18 +4,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
+from pathlib import Path
 from types import DynamicClassAttribute
-from typing import TYPE_CHECKING
 
 from zaimcsvconverter.models import Base
 from zaimcsvconverter.models import ConvertTableRecordMixin
 from zaimcsvconverter.models import ConvertTableRowData
 from zaimcsvconverter.models import ConvertTableType
+from zaimcsvconverter.models import ConvertTableValue
 from zaimcsvconverter.models import FileCsvConvertId
 
-if TYPE_CHECKING:
-    from pathlib import Path
-
 
 @dataclass
 class FileCsvConvertContext:
@@ -29,7 +27,7 @@ class FileCsvConvertContext:
     def create_convert_table_row_instance(
         self,
         list_convert_table_row_standard_type_value: list[str],
-    ) -> ConvertTableRecordMixin[Base, ConvertTableRowData]:
+    ) -> ConvertTableRecordMixin[Base, ConvertTableRowData, ConvertTableValue]:
         """Create convert table row model instance by list data of convert table row."""
         convert_table_type = self.convert_table_type.value
         # noinspection PyArgumentList
@@ -73,9 +71,9 @@ class FileCsvConvert(Enum):
 
     @staticmethod
     def create_by_path_csv_convert(path: Path) -> FileCsvConvert:
-        """Create Enum instance by path to CSV convert file."""
+        """Create Enum instance by path to CSV convert file, or to convert table file of other format by its stem."""
         for file_csv_convert in FileCsvConvert:
-            if path.name == file_csv_convert.value.name:
+            if path.stem == Path(file_csv_convert.value.name).stem:
                 return file_csv_convert
         msg = "can't detect account type by csv file name. Please confirm csv file name."
         raise ValueError(msg)
@@ -83,6 +81,6 @@ class FileCsvConvert(Enum):
     def create_convert_table_row_instance(
         self,
         list_convert_table_row_standard_type_value: list[str],
-    ) -> ConvertTableRecordMixin[Base, ConvertTableRowData]:
+    ) -> ConvertTableRecordMixin[Base, ConvertTableRowData, ConvertTableValue]:
         """Create convert table row model instance by list data of convert table row."""
         return self.value.create_convert_table_row_instance(list_convert_table_row_standard_type_value)
@@ -43,6 +43,19 @@ class FirstFormNormalizer(Generic[T]):
                 break
             yield self.normalize_row_data(list_input_row_standard_type_value)
 
+    def iterate_with_index(self) -> Generator[tuple[int, list[str]], None, None]:
+        """Iterate CSV row data with its index before normalizing, to normalize on other thread."""
+        iterator = self.god_slayer.__iter__()
+        while True:
+            try:
+                list_input_row_standard_type_value = next(iterator)
+            except UnicodeDecodeError:
+                self.logger.exception("Invalid encode file: %s", self.god_slayer.path_to_file)
+                raise
+            except StopIteration:
+                break
+            yield self.god_slayer.index, list_input_row_standard_type_value
+
     def normalize_row_data(self, list_input_row_standard_type_value: list[str]) -> T:
         """Convert list of input row data to model instance."""
         self.logger.debug("self.input_row_data_class: %s", self.input_row_data_class)
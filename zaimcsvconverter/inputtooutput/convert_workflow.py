@@ -1,11 +1,20 @@
 """This module implements model of input CSV."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 from typing import Generic
 
 from zaimcsvconverter.exceptions.invalid_input_csv_error import InvalidInputCsvError
-from zaimcsvconverter.inputtooutput.converters import RecordConverter
 from zaimcsvconverter.inputtooutput.datasources import DataSource
 from zaimcsvconverter.inputtooutput.exporters import TypeVarOutputModelExporter
+from zaimcsvconverter.inputtooutput.pipeline import ThreadStage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from zaimcsvconverter.inputtooutput.converters import RecordConverter
+    from zaimcsvconverter.inputtooutput.exporters import OutputRecord
 
 
 class ConvertWorkflow(Generic[TypeVarOutputModelExporter]):
@@ -23,9 +32,54 @@ class ConvertWorkflow(Generic[TypeVarOutputModelExporter]):
 
     def execute(self) -> None:
         """Convert this csv into Zaim format CSV."""
+        self.export(self.record_converter.convert(input_record) for input_record in self.data_source)
+
+    def export(self, iterable_output_record: Iterable[OutputRecord]) -> None:
+        """Export output records, then raise error if data source is invalid."""
         with self.output_model_exporter:
-            for input_record in self.data_source:
-                output_record = self.record_converter.convert(input_record)
+            for output_record in iterable_output_record:
                 self.output_model_exporter.execute(output_record)
+        self.raise_if_invalid()
+
+    async def aexecute(self, chunk_size: int = DataSource.DEFAULT_CHUNK_SIZE) -> None:
+        """Convert this csv into Zaim format CSV without blocking event loop.
+
+        Reading and writing files are processed off event loop in chunks.
+        """
+        async with self.output_model_exporter:
+            async for list_input_record in self.data_source.aiterate_chunk(chunk_size):
+                await self.output_model_exporter.aexecute_chunk(
+                    [self.record_converter.convert(input_record) for input_record in list_input_record],
+                )
+        self.raise_if_invalid()
+
+    def raise_if_invalid(self) -> None:
         if self.data_source.is_invalid:
             raise InvalidInputCsvError(self.data_source.message, self.data_source)
+
+
+class PipelinedConvertWorkflow(ConvertWorkflow[TypeVarOutputModelExporter]):
+    """This class implements model of input CSV which runs each stage on separate thread.
+
+    Reading data source, processing input records, converting records and exporting output records run concurrently.
+    Records are passed between stages through bounded queues, and order of input records is kept in output.
+    """
+
+    DEFAULT_MAXSIZE = 256
+
+    def __init__(
+        self,
+        datasource: DataSource,
+        record_converter: RecordConverter,
+        output_model_exporter: TypeVarOutputModelExporter,
+        *,
+        maxsize: int = DEFAULT_MAXSIZE,
+    ) -> None:
+        super().__init__(datasource, record_converter, output_model_exporter)
+        self.maxsize = maxsize
+
+    def execute(self) -> None:
+        stage_read = ThreadStage(self.data_source.iterate_raw_record(), self.maxsize)
+        stage_process = ThreadStage.map(self.data_source.process_raw_record, stage_read, self.maxsize)
+        stage_convert = ThreadStage.map(self.record_converter.convert, stage_process, self.maxsize)
+        self.export(stage_convert)
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC
 from abc import abstractmethod
+from itertools import islice
 from typing import TYPE_CHECKING
+from typing import cast
 
 from zaimcsvconverter.errorhandling.error_handler import UndefinedContentErrorHandler
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import AsyncGenerator
     from collections.abc import Generator
+    from collections.abc import Iterator
 
     from zaimcsvconverter.exceptions import InvalidCellError
 
@@ -22,6 +27,8 @@ class AbstractInputRecord(ABC):  # noqa: B024
 class DataSource(ABC):
     """This class implements data source model."""
 
+    DEFAULT_CHUNK_SIZE = 1024
+
     def __init__(self) -> None:
         self.dictionary_invalid_record: dict[int, list[InvalidCellError]] = {}
         self.undefined_content_error_handler = UndefinedContentErrorHandler()
@@ -30,10 +37,48 @@ class DataSource(ABC):
     def __iter__(self) -> Generator[AbstractInputRecord, None, None]:
         raise NotImplementedError
 
-    @abstractmethod
-    def mark_current_record_as_error(self, list_error: list[InvalidCellError]) -> None:
-        """Mark current record as error."""
-        raise NotImplementedError
+    def iterate_raw_record(self) -> Generator[object, None, None]:
+        """Iterate record before processing, to process on other thread than the one reading data source.
+
+        Data source which can't split reading and processing yields processed records as they are.
+        """
+        yield from self
+
+    def process_raw_record(self, raw_record: object) -> AbstractInputRecord | None:
+        """Process record iterated by iterate_raw_record(), return None when record is invalid or skipped."""
+        return cast("AbstractInputRecord", raw_record)
+
+    async def __aiter__(self) -> AsyncGenerator[AbstractInputRecord, None]:
+        async for list_input_record in self.aiterate_chunk():
+            for input_record in list_input_record:
+                yield input_record
+
+    async def aiterate_chunk(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncGenerator[list[AbstractInputRecord], None]:
+        """Iterate chunks of records, reading and processing each chunk off event loop."""
+        iterator = self.iterate_raw_record()
+        while True:
+            list_input_record = await asyncio.to_thread(self.process_chunk, iterator, chunk_size)
+            if list_input_record is None:
+                return
+            yield list_input_record
+
+    def process_chunk(self, iterator: Iterator[object], chunk_size: int) -> list[AbstractInputRecord] | None:
+        """Read and process chunk of records, return None when data source has been exhausted."""
+        list_raw_record = list(islice(iterator, chunk_size))
+        if not list_raw_record:
+            return None
+        return self.process_list_raw_record(list_raw_record)
+
+    def process_list_raw_record(self, list_raw_record: list[object]) -> list[AbstractInputRecord]:
+        """Process records iterated by iterate_raw_record(), drop invalid or skipped records."""
+        return [
+            input_record
+            for input_record in (self.process_raw_record(raw_record) for raw_record in list_raw_record)
+            if input_record is not None
+        ]
 
     @property
     @abstractmethod
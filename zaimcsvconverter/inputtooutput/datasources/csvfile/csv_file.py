@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 from typing import Generic
+from typing import TypeVar
 from typing import cast
 
 from godslayer.exceptions import InvalidFooterError
@@ -13,7 +14,6 @@ from pydantic import ValidationError
 from zaimcsvconverter.exceptions import InvalidCellError
 from zaimcsvconverter.exceptions import InvalidRecordError
 from zaimcsvconverter.exceptions import InvalidRecordErrorFactory
-from zaimcsvconverter.exceptions import LogicError
 from zaimcsvconverter.exceptions import SkipRecord
 from zaimcsvconverter.exceptions.invalid_input_csv_error import InvalidInputCsvError
 from zaimcsvconverter.inputtooutput.datasources import AbstractInputRecord
@@ -24,9 +24,13 @@ from zaimcsvconverter.inputtooutput.datasources.csvfile.records import TypeVarIn
 if TYPE_CHECKING:
     from collections.abc import Generator
 
+    from returns.primitives.hkt import Kind1
+
     from zaimcsvconverter.first_form_normalizer import FirstFormNormalizer
     from zaimcsvconverter.inputtooutput.datasources.csvfile.csv_record_processor import CsvRecordProcessor
 
+TypeVarItem = TypeVar("TypeVarItem")
+
 
 class Csv(DataSource, Generic[TypeVarInputRow, TypeVarInputRowData]):
     """This class implements CSV datasource."""
@@ -43,20 +47,14 @@ class Csv(DataSource, Generic[TypeVarInputRow, TypeVarInputRowData]):
         self.invalid_footer_error: InvalidFooterError | None = None
 
     def __iter__(self) -> Generator[AbstractInputRecord, None, None]:
-        iterator = self.first_form_normalizer.__iter__()
-        while True:
-            try:
-                input_record_data = self.try_to_iterate(iterator)
-            except ValidationError as exc:
-                exception = self.build_invalid_record_error(exc)
-                self.mark_current_record_as_error(exception.list_error)
-                self.undefined_content_error_handler.extend(exception.undefined_content_error_handler)
-                continue
-            except StopIteration:
-                break
-            yield from self.convert_to_record(input_record_data)
-
-    def try_to_iterate(self, iterator: Generator[TypeVarInputRowData, None, None]) -> TypeVarInputRowData:
+        # Each row is normalized outside of generator of rows
+        # since generator can't be resumed after raising ValidationError.
+        # Rows are processed in chunks to resolve store and item names of each chunk at once.
+        iterator = self.iterate_raw_record()
+        while (list_input_record := self.process_chunk(iterator, self.DEFAULT_CHUNK_SIZE)) is not None:
+            yield from list_input_record
+
+    def try_to_iterate(self, iterator: Generator[TypeVarItem, None, None]) -> TypeVarItem:
         """Try to iterate CSV row data."""
         try:
             return next(iterator)
@@ -67,15 +65,65 @@ class Csv(DataSource, Generic[TypeVarInputRow, TypeVarInputRowData]):
             self.invalid_footer_error = error
             raise InvalidInputCsvError(str(error), self) from error
 
-    def convert_to_record(self, input_record_data: TypeVarInputRowData) -> Generator[AbstractInputRecord, None, None]:
-        """Convert InputRecordData to InputRecord."""
+    def iterate_raw_record(self) -> Generator[tuple[int, list[str]], None, None]:
+        """Iterate CSV row with its index before normalizing."""
+        iterator = self.first_form_normalizer.iterate_with_index()
+        while True:
+            try:
+                raw_record = self.try_to_iterate(iterator)
+            except StopIteration:
+                return
+            yield raw_record
+
+    def process_raw_record(self, raw_record: object) -> AbstractInputRecord | None:
+        """Normalize and process CSV row iterated by iterate_raw_record()."""
+        index, input_record = self.create_input_record(raw_record)
+        return self.check_input_record(index, input_record)
+
+    def process_list_raw_record(self, list_raw_record: list[object]) -> list[AbstractInputRecord]:
+        """Normalize rows, resolve their store and item names at once, then process each row."""
+        list_created = [self.create_input_record(raw_record) for raw_record in list_raw_record]
+        self.csv_record_processor.prefetch(
+            [input_record for _, input_record in list_created if not isinstance(input_record, InvalidRecordError)],
+        )
+        return [
+            input_record
+            for input_record in (self.check_input_record(index, input_record) for index, input_record in list_created)
+            if input_record is not None
+        ]
+
+    def create_input_record(
+        self,
+        raw_record: object,
+    ) -> tuple[int, Kind1[TypeVarInputRow, TypeVarInputRowData] | InvalidRecordError]:
+        """Normalize CSV row and create input row, or error when the row can't be normalized."""
+        index, list_input_row_standard_type_value = cast("tuple[int, list[str]]", raw_record)
+        try:
+            input_record_data = self.first_form_normalizer.normalize_row_data(list_input_row_standard_type_value)
+        except ValidationError as exc:
+            return index, self.build_invalid_record_error(exc)
+        return index, self.csv_record_processor.create_input_row_instance(input_record_data)
+
+    def check_input_record(
+        self,
+        index: int,
+        input_record: Kind1[TypeVarInputRow, TypeVarInputRowData] | InvalidRecordError,
+    ) -> AbstractInputRecord | None:
+        """Check input row created by create_input_record(), stock error and return None when it is invalid."""
         try:
-            yield cast("AbstractInputRecord", self.csv_record_processor.execute(input_record_data))
+            if isinstance(input_record, InvalidRecordError):
+                raise input_record
+            return cast("AbstractInputRecord", self.csv_record_processor.check(input_record))
         except InvalidRecordError as exc:
-            self.mark_current_record_as_error(exc.list_error)
-            self.undefined_content_error_handler.extend(exc.undefined_content_error_handler)
+            self.stock_invalid_record_error(index, exc)
         except SkipRecord:
             pass
+        return None
+
+    def stock_invalid_record_error(self, index: int, error: InvalidRecordError) -> None:
+        """Stock errors of record of index."""
+        self.mark_record_as_error(index, error.list_error)
+        self.undefined_content_error_handler.extend(error.undefined_content_error_handler)
 
     def build_invalid_record_error(self, exc: ValidationError) -> InvalidRecordError:
         list_error = [InvalidCellError(f"Invalid {error['loc'][0]}, {error['msg']}") for error in exc.errors()]
@@ -89,11 +137,9 @@ class Csv(DataSource, Generic[TypeVarInputRow, TypeVarInputRowData]):
             or self.invalid_footer_error is not None
         )
 
-    def mark_current_record_as_error(self, list_error: list[InvalidCellError]) -> None:
-        if self.first_form_normalizer.index is None:  # pragma: no cover
-            msg = "This method can't be called before iterate this instance."
-            raise LogicError(msg)
-        self.dictionary_invalid_record[self.first_form_normalizer.index] = list_error
+    def mark_record_as_error(self, index: int, list_error: list[InvalidCellError]) -> None:
+        """Mark record of index as error."""
+        self.dictionary_invalid_record[index] = list_error
 
     @property
     def message(self) -> str:
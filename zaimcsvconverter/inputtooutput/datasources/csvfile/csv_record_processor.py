@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 from typing import Generic
 from typing import cast
 
+from zaimcsvconverter.convert_table_index import ConvertTablePrefetcher
 from zaimcsvconverter.errorhandling.error_handler import UndefinedContentErrorHandler
 from zaimcsvconverter.exceptions import InvalidRecordErrorFactory
 from zaimcsvconverter.exceptions import SkipRecord
@@ -32,7 +33,24 @@ class CsvRecordProcessor(Generic[TypeVarInputRowData, TypeVarInputRow]):
 
     def execute(self, input_record_data: TypeVarInputRowData) -> Kind1[TypeVarInputRow, TypeVarInputRowData]:
         """Execute convert steps of input CSV row."""
-        input_record = self.create_input_row_instance(input_record_data)
+        return self.check(self.create_input_row_instance(input_record_data))
+
+    @staticmethod
+    def prefetch(list_input_record: list[Kind1[TypeVarInputRow, TypeVarInputRowData]]) -> None:
+        """Resolve distinct store and item names of rows at once before checking each row."""
+        convert_table_prefetcher = ConvertTablePrefetcher()
+        list_dekinded_input_record = cast("list[InputRow[InputRowData]]", list_input_record)
+        for input_record in list_dekinded_input_record:
+            input_record.request_prefetch(convert_table_prefetcher)
+        convert_table_prefetcher.execute()
+        for input_record in list_dekinded_input_record:
+            input_record.apply_prefetch(convert_table_prefetcher)
+
+    def check(
+        self,
+        input_record: Kind1[TypeVarInputRow, TypeVarInputRowData],
+    ) -> Kind1[TypeVarInputRow, TypeVarInputRowData]:
+        """Validate input CSV row, raise error when the row is invalid or should be skipped."""
         dekinded_input_record = cast("InputRow[InputRowData]", input_record)
         # Requires to validate before skip check process since skip check process checks store.
         if dekinded_input_record.validate:
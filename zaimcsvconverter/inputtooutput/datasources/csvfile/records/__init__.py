@@ -11,6 +11,7 @@ from typing import TypeVar
 from errorcollector import MultipleErrorCollector
 from errorcollector import SingleErrorCollector
 
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
 from zaimcsvconverter.exceptions import InvalidCellError
 from zaimcsvconverter.exceptions import UndefinedContentError
 from zaimcsvconverter.inputtooutput.datasources import AbstractInputRecord
@@ -25,7 +26,10 @@ if TYPE_CHECKING:
     from collections.abc import Callable
     from datetime import datetime
 
+    from zaimcsvconverter.convert_table_index import ConvertTablePrefetcher
     from zaimcsvconverter.file_csv_convert import FileCsvConvertContext
+    from zaimcsvconverter.models import ItemValue
+    from zaimcsvconverter.models import StoreValue
 
 
 TypeVarReturnValue = TypeVar("TypeVarReturnValue")
@@ -53,6 +57,12 @@ class InputRow(AbstractInputRecord, Generic[TypeVarInputRowData]):
         """This property returns whether this row should be skipped or not."""
         return False
 
+    def request_prefetch(self, convert_table_prefetcher: ConvertTablePrefetcher) -> None:
+        """Request names to find in convert tables before validating chunk of rows."""
+
+    def apply_prefetch(self, convert_table_prefetcher: ConvertTablePrefetcher) -> None:
+        """Apply models found in convert tables by prefetch."""
+
 
 class InputContentRow(InputRow[TypeVarInputRowData]):
     """Row model of CSV including at least either store or item name data."""
@@ -73,16 +83,36 @@ class InputStoreRow(InputContentRow[TypeVarInputStoreRowData]):
         super().__init__(input_store_row_data)
         self._file_csv_convert_store: FileCsvConvertContext = file_csv_convert_context_store
         self.store_name: str = input_store_row_data.store_name
-        self._store: Store | None = None
+        self._store: StoreValue | None = None
+        self._is_store_prefetched = False
         self.undefined_content_error_store: UndefinedContentError | None = None
 
     @property
-    def store(self) -> Store:
+    def store(self) -> StoreValue:
         """This method finds store data from database if has not find."""
         if self._store is None:
-            self._store = Store.try_to_find(self._file_csv_convert_store.id, self.store_name)
+            # Name which prefetch has resolved as undefined isn't looked up again.
+            self._store = (
+                CONVERT_TABLE_INDEX.raise_if_none(self._store)
+                if self._is_store_prefetched
+                else Store.try_to_find(self._file_csv_convert_store.id, self.store_name)
+            )
         return self._store
 
+    def request_prefetch(self, convert_table_prefetcher: ConvertTablePrefetcher) -> None:
+        super().request_prefetch(convert_table_prefetcher)
+        convert_table_prefetcher.request(Store, self._file_csv_convert_store.id, self.store_name)
+
+    def apply_prefetch(self, convert_table_prefetcher: ConvertTablePrefetcher) -> None:
+        super().apply_prefetch(convert_table_prefetcher)
+        if self._store is None and convert_table_prefetcher.is_resolved(
+            Store,
+            self._file_csv_convert_store.id,
+            self.store_name,
+        ):
+            self._store = convert_table_prefetcher.get(Store, self._file_csv_convert_store.id, self.store_name)
+            self._is_store_prefetched = True
+
     def stock_undefined_content_error_store(
         self,
         method: Callable[[], TypeVarReturnValue],
@@ -128,21 +158,41 @@ class InputItemRow(InputContentRow[TypeVarInputItemRowData]):
         self._file_csv_convert_item: FileCsvConvertContext = file_csv_convert_item
         self.store_name: str = ""
         self.item_name: str = input_item_row_data.item_name
-        self._item: Item | None = None
+        self._item: ItemValue | None = None
+        self._is_item_prefetched = False
         self.undefined_content_error_item: UndefinedContentError | None = None
 
     @property
     @abstractmethod
-    def store(self) -> Store:
+    def store(self) -> StoreValue:
         """This property returns store in Zaim row."""
 
     @property
-    def item(self) -> Item:
+    def item(self) -> ItemValue:
         """This method finds store data from database if has not find."""
         if self._item is None:
-            self._item = Item.try_to_find(self._file_csv_convert_item.id, self.item_name)
+            # Name which prefetch has resolved as undefined isn't looked up again.
+            self._item = (
+                CONVERT_TABLE_INDEX.raise_if_none(self._item)
+                if self._is_item_prefetched
+                else Item.try_to_find(self._file_csv_convert_item.id, self.item_name)
+            )
         return self._item
 
+    def request_prefetch(self, convert_table_prefetcher: ConvertTablePrefetcher) -> None:
+        super().request_prefetch(convert_table_prefetcher)
+        convert_table_prefetcher.request(Item, self._file_csv_convert_item.id, self.item_name)
+
+    def apply_prefetch(self, convert_table_prefetcher: ConvertTablePrefetcher) -> None:
+        super().apply_prefetch(convert_table_prefetcher)
+        if self._item is None and convert_table_prefetcher.is_resolved(
+            Item,
+            self._file_csv_convert_item.id,
+            self.item_name,
+        ):
+            self._item = convert_table_prefetcher.get(Item, self._file_csv_convert_item.id, self.item_name)
+            self._is_item_prefetched = True
+
     def stock_undefined_content_error_item(
         self,
         method: Callable[[], TypeVarReturnValue],
@@ -189,16 +239,36 @@ class InputStoreItemRow(InputStoreRow[TypeVarInputStoreItemRowData]):
         self._file_csv_convert_item: FileCsvConvertContext = file_csv_convert_context_item
         self.store_name: str = ""
         self.item_name: str = input_store_item_row_data.item_name
-        self._item: Item | None = None
+        self._item: ItemValue | None = None
+        self._is_item_prefetched = False
         self.undefined_content_error_item: UndefinedContentError | None = None
 
     @property
-    def item(self) -> Item:
+    def item(self) -> ItemValue:
         """This method finds store data from database if has not find."""
         if self._item is None:
-            self._item = Item.try_to_find(self._file_csv_convert_item.id, self.item_name)
+            # Name which prefetch has resolved as undefined isn't looked up again.
+            self._item = (
+                CONVERT_TABLE_INDEX.raise_if_none(self._item)
+                if self._is_item_prefetched
+                else Item.try_to_find(self._file_csv_convert_item.id, self.item_name)
+            )
         return self._item
 
+    def request_prefetch(self, convert_table_prefetcher: ConvertTablePrefetcher) -> None:
+        super().request_prefetch(convert_table_prefetcher)
+        convert_table_prefetcher.request(Item, self._file_csv_convert_item.id, self.item_name)
+
+    def apply_prefetch(self, convert_table_prefetcher: ConvertTablePrefetcher) -> None:
+        super().apply_prefetch(convert_table_prefetcher)
+        if self._item is None and convert_table_prefetcher.is_resolved(
+            Item,
+            self._file_csv_convert_item.id,
+            self.item_name,
+        ):
+            self._item = convert_table_prefetcher.get(Item, self._file_csv_convert_item.id, self.item_name)
+            self._is_item_prefetched = True
+
     def stock_undefined_content_error_item(
         self,
         method: Callable[[], TypeVarReturnValue],
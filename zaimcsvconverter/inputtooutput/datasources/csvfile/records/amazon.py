@@ -5,8 +5,7 @@ from zaimcsvconverter.file_csv_convert import FileCsvConvert
 from zaimcsvconverter.inputtooutput.datasources.csvfile.data.amazon import AmazonRowData
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records import InputItemRow
 from zaimcsvconverter.models import FileCsvConvertId
-from zaimcsvconverter.models import Store
-from zaimcsvconverter.models import StoreRowData
+from zaimcsvconverter.models import StoreValue
 
 
 # pylint: disable=too-many-instance-attributes
@@ -15,13 +14,14 @@ class AmazonRow(InputItemRow[AmazonRowData]):
 
     def __init__(self, row_data: AmazonRowData) -> None:
         super().__init__(row_data, FileCsvConvert.AMAZON.value)
-        self._store: Store = Store(
-            FileCsvConvertId.AMAZON,
-            StoreRowData("Amazon.co.jp", CONFIG.amazon.store_name_zaim),
+        self._store: StoreValue = StoreValue(
+            FileCsvConvertId.AMAZON.value,
+            "Amazon.co.jp",
+            name_zaim=CONFIG.amazon.store_name_zaim or None,
         )
         self.price: int = row_data.price
         self.number: int = row_data.number
 
     @property
-    def store(self) -> Store:
+    def store(self) -> StoreValue:
         return self._store
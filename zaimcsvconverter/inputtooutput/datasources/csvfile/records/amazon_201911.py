@@ -8,8 +8,7 @@ from zaimcsvconverter.inputtooutput.datasources.csvfile.data.amazon_201911 impor
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records import InputItemRow
 from zaimcsvconverter.inputtooutput.datasources.csvfile.records import InputRow
 from zaimcsvconverter.models import FileCsvConvertId
-from zaimcsvconverter.models import Store
-from zaimcsvconverter.models import StoreRowData
+from zaimcsvconverter.models import StoreValue
 
 
 class Amazon201911Row(InputRow[Amazon201911RowData]):
@@ -28,13 +27,14 @@ class Amazon201911ItemRow(Amazon201911Row, InputItemRow[Amazon201911RowData]):
 
     def __init__(self, row_data: Amazon201911RowData) -> None:
         super().__init__(row_data, FileCsvConvert.AMAZON.value)
-        self._store: Store = Store(
-            FileCsvConvertId.AMAZON,
-            StoreRowData("Amazon.co.jp", CONFIG.amazon.store_name_zaim),
+        self._store: StoreValue = StoreValue(
+            FileCsvConvertId.AMAZON.value,
+            "Amazon.co.jp",
+            name_zaim=CONFIG.amazon.store_name_zaim or None,
         )
 
     @property
-    def store(self) -> Store:
+    def store(self) -> StoreValue:
         return self._store
 
 
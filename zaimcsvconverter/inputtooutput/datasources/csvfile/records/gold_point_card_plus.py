@@ -19,6 +19,7 @@ class GoldPointCardPlusRow(InputStoreRow[GoldPointCardPlusRowData]):
             self.is_amazon_row_and_should_skip
             or self.is_pay_pal_row_and_should_skip
             or self.is_kyash_row_and_should_skip
+            or self.is_store_category_row_and_should_skip
         ) and self.used_amount >= 0
 
     @property
@@ -32,3 +33,7 @@ class GoldPointCardPlusRow(InputStoreRow[GoldPointCardPlusRowData]):
     @property
     def is_kyash_row_and_should_skip(self) -> bool:
         return CONFIG.gold_point_card_plus.skip_kyash_row and self.store.is_kyash
+
+    @property
+    def is_store_category_row_and_should_skip(self) -> bool:
+        return not self.store.categories.isdisjoint(CONFIG.gold_point_card_plus.skip_store_categories)
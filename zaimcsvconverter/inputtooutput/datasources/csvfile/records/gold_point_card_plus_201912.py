@@ -22,7 +22,12 @@ class GoldPointCardPlus201912Row(InputStoreRow[GoldPointCardPlus201912RowData]):
 
     @property
     def is_row_to_skip(self) -> bool:
-        return self.is_amazon_row_to_skip or self.is_pay_pal_row_to_skip or self.is_kyash_row_to_skip
+        return (
+            self.is_amazon_row_to_skip
+            or self.is_pay_pal_row_to_skip
+            or self.is_kyash_row_to_skip
+            or self.is_store_category_row_to_skip
+        )
 
     @property
     def is_amazon_row_to_skip(self) -> bool:
@@ -39,3 +44,7 @@ class GoldPointCardPlus201912Row(InputStoreRow[GoldPointCardPlus201912RowData]):
     @property
     def is_kyash_row_to_skip(self) -> bool:
         return CONFIG.gold_point_card_plus.skip_kyash_row and self.store.is_kyash
+
+    @property
+    def is_store_category_row_to_skip(self) -> bool:
+        return not self.store.categories.isdisjoint(CONFIG.gold_point_card_plus.skip_store_categories)
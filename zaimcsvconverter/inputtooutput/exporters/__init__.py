@@ -1,13 +1,20 @@
 """Abstract output model exporter."""
 
+from __future__ import annotations
+
+import asyncio
 from abc import ABC
 from abc import abstractmethod
+from typing import TYPE_CHECKING
 from typing import Any
 from typing import Generic
 from typing import TypeVar
 
 from zaimcsvconverter.context_manager import ContextManager
 
+if TYPE_CHECKING:
+    from types import TracebackType
+
 
 # Reason: Abstract class to support other application than Zaim pylint: disable=too-few-public-methods
 class OutputRecord(ABC):  # noqa: B024
@@ -22,5 +29,25 @@ class OutputModelExporter(ContextManager[Any], ABC, Generic[TypeVarOutputRecord]
     def execute(self, output_row: TypeVarOutputRecord) -> None:
         raise NotImplementedError
 
+    def execute_chunk(self, list_output_row: list[TypeVarOutputRecord]) -> None:
+        """Export chunk of output rows."""
+        for output_row in list_output_row:
+            self.execute(output_row)
+
+    async def aexecute_chunk(self, list_output_row: list[TypeVarOutputRecord]) -> None:
+        """Export chunk of output rows off event loop."""
+        await asyncio.to_thread(self.execute_chunk, list_output_row)
+
+    async def __aenter__(self) -> Any:  # noqa: ANN401
+        return await asyncio.to_thread(self.__enter__)
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> bool | None:
+        return await asyncio.to_thread(self.__exit__, exc_type, exc_value, traceback)
+
 
 TypeVarOutputModelExporter = TypeVar("TypeVarOutputModelExporter", bound=OutputModelExporter[Any])
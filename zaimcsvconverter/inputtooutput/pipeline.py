@@ -0,0 +1,106 @@
+"""This module implements pipeline stage which runs on separate thread."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from types import GeneratorType
+from typing import TYPE_CHECKING
+from typing import Generic
+from typing import TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Generator
+    from collections.abc import Iterable
+
+TypeVarItem = TypeVar("TypeVarItem")
+TypeVarResult = TypeVar("TypeVarResult")
+
+
+class EndOfStage:
+    """Marker to notify that stage has been finished."""
+
+
+class FailureOfStage:
+    """Marker to pass exception raised in stage to downstream."""
+
+    def __init__(self, exception: BaseException) -> None:
+        self.exception = exception
+
+
+class ThreadStage(Generic[TypeVarItem]):
+    """This class implements pipeline stage which iterates iterable on separate thread.
+
+    Items are passed to downstream through bounded queue to apply backpressure to upstream. Since each stage is
+    processed by single thread, order of items is kept.
+    """
+
+    TIMEOUT_SECONDS = 0.1
+
+    def __init__(self, iterable: Iterable[TypeVarItem], maxsize: int) -> None:
+        self.iterable = iterable
+        self.queue: queue.Queue[TypeVarItem | EndOfStage | FailureOfStage] = queue.Queue(maxsize)
+        self.event_stop = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    @classmethod
+    def map(
+        cls,
+        function: Callable[[TypeVarItem], TypeVarResult | None],
+        iterable: Iterable[TypeVarItem],
+        maxsize: int,
+    ) -> ThreadStage[TypeVarResult]:
+        """Create stage which applies function to each item and drops None."""
+        return ThreadStage(cls.filter_none(function(item) for item in iterable), maxsize)
+
+    @staticmethod
+    def filter_none(iterable: Iterable[TypeVarResult | None]) -> Generator[TypeVarResult, None, None]:
+        for item in iterable:
+            if item is not None:
+                yield item
+
+    def run(self) -> None:
+        """Iterate iterable and put items into queue."""
+        iterator = iter(self.iterable)
+        try:
+            for item in iterator:
+                if not self.put(item):
+                    return
+        # Reason: To pass any exception to downstream thread.
+        except BaseException as exc:  # noqa: BLE001 pylint: disable=broad-exception-caught
+            self.put(FailureOfStage(exc))
+            return
+        finally:
+            # To stop upstream stages when this stage has been stopped.
+            if isinstance(iterator, GeneratorType):
+                iterator.close()
+        self.put(EndOfStage())
+
+    def put(self, item: TypeVarItem | EndOfStage | FailureOfStage) -> bool:
+        """Put item into queue unless downstream stopped, return whether item has been put or not."""
+        while not self.event_stop.is_set():
+            try:
+                self.queue.put(item, timeout=self.TIMEOUT_SECONDS)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def __iter__(self) -> Generator[TypeVarItem, None, None]:
+        self.thread.start()
+        try:
+            while True:
+                item = self.queue.get()
+                if isinstance(item, EndOfStage):
+                    return
+                if isinstance(item, FailureOfStage):
+                    raise item.exception
+                yield item
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stop upstream thread, for example, when downstream has been failed."""
+        self.event_stop.set()
+        self.thread.join()
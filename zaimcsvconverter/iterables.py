@@ -0,0 +1,20 @@
+"""This module implements helpers for iterables which are shared by converting steps."""
+
+from __future__ import annotations
+
+from itertools import islice
+from typing import TYPE_CHECKING
+from typing import TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterable
+
+TypeVarItem = TypeVar("TypeVarItem")
+
+
+def split(iterable: Iterable[TypeVarItem], size: int) -> Generator[list[TypeVarItem], None, None]:
+    """Split iterable into lists which have at most size items."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
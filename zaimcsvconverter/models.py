@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
-import re
 import warnings
 from abc import abstractmethod
-from contextlib import suppress
 from dataclasses import dataclass
 from enum import Enum
 from types import DynamicClassAttribute
+from typing import TYPE_CHECKING
 from typing import Any
+from typing import ClassVar
 from typing import Generic
 from typing import Optional
 from typing import TypeVar
@@ -19,9 +19,9 @@ from inflector import Inflector
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import UniqueConstraint
+from sqlalchemy import delete
+from sqlalchemy import event
 from sqlalchemy import exc
-from sqlalchemy import select
-from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import declarative_mixin
 from sqlalchemy.orm import declared_attr
@@ -30,6 +30,15 @@ from sqlalchemy.orm.decl_api import DeclarativeMeta
 from sqlalchemy.orm.decl_api import registry
 
 from zaimcsvconverter import Session
+from zaimcsvconverter.convert_table_backend import ConvertTableBackendFactory
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.store_classifier import StoreCategory
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from zaimcsvconverter.convert_table_backend import ConvertTableBackend
+    from zaimcsvconverter.store_classifier import StoreClassifier
 
 
 class FileCsvConvertId(Enum):
@@ -101,8 +110,56 @@ class ItemRowData(ConvertTableRowData):
 TypeVarConvertTableRowData = TypeVar("TypeVarConvertTableRowData", bound=ConvertTableRowData)
 
 
+@dataclass(frozen=True, slots=True)
+class ConvertTableValue:
+    """This class implements immutable row of convert table detached from database session.
+
+    Value is shared by all input rows which refer to the same name.
+    """
+
+    file_csv_convert_id: int
+    name: str
+    category_payment_large: str | None = None
+    category_payment_small: str | None = None
+    # pylint: disable=invalid-name
+    id: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class StoreValue(ConvertTableValue):
+    """This class implements immutable row of store convert table."""
+
+    name_zaim: str | None = None
+    category_income: str | None = None
+    transfer_target: str | None = None
+    categories: frozenset[str] = frozenset()
+
+    @property
+    def is_amazon(self) -> bool:
+        """This property returns whether this store is Amazon.co.jp or not."""
+        return StoreCategory.AMAZON in self.categories
+
+    @property
+    def is_pay_pal(self) -> bool:
+        """This property returns whether this store is PayPal or not."""
+        return StoreCategory.PAY_PAL in self.categories
+
+    @property
+    def is_kyash(self) -> bool:
+        """This property returns whether this store is Kyash or not."""
+        return StoreCategory.KYASH in self.categories
+
+
+@dataclass(frozen=True, slots=True)
+class ItemValue(ConvertTableValue):
+    """This class implements immutable row of item convert table."""
+
+
+TypeVarConvertTableValue = TypeVar("TypeVarConvertTableValue", bound=ConvertTableValue)
+
+
 @declarative_mixin
-class ConvertTableRecordMixin(Generic[TypeVarBase, TypeVarConvertTableRowData]):
+class ConvertTableRecordMixin(Generic[TypeVarBase, TypeVarConvertTableRowData, TypeVarConvertTableValue]):
     """This class implements convert table mixin.
 
     @see https://docs.sqlalchemy.org/en/13/orm/extensions/declarative/mixins.html
@@ -126,8 +183,12 @@ class ConvertTableRecordMixin(Generic[TypeVarBase, TypeVarConvertTableRowData]):
     #   https://github.com/astral-sh/ruff/issues/19144
     category_payment_large: Mapped[Optional[str]] = mapped_column(String(255))  # noqa: UP045
     category_payment_small: Mapped[Optional[str]] = mapped_column(String(255))  # noqa: UP045
+    # Name of source which row has been imported from, so that each source can be reloaded separately.
+    source: Mapped[Optional[str]] = mapped_column(String(255))  # noqa: UP045
 
     __table_args__ = (UniqueConstraint("file_csv_convert_id", "name", name="_name_on_each_account_uc"),)
+    # Names of columns in order of columns in convert table CSV, same as fields of row data.
+    COLUMNS_CSV: ClassVar[tuple[str, ...]] = ("name", "category_payment_large", "category_payment_small")
 
     @abstractmethod
     def __init__(self, file_csv_convert_id: FileCsvConvertId, row_data: TypeVarConvertTableRowData) -> None:
@@ -139,26 +200,28 @@ class ConvertTableRecordMixin(Generic[TypeVarBase, TypeVarConvertTableRowData]):
         return value or None
 
     @classmethod
-    def try_to_find(cls, file_csv_convert_id: FileCsvConvertId, name: str) -> TypeVarBase:
+    @abstractmethod
+    def create_values(
+        cls,
+        iterable_model: Iterable[TypeVarBase],
+        store_classifier: StoreClassifier,
+    ) -> list[TypeVarConvertTableValue]:
+        """Create immutable values detached from database session, stores are classified by store_classifier."""
+        raise NotImplementedError
+
+    @classmethod
+    def try_to_find(cls, file_csv_convert_id: FileCsvConvertId, name: str) -> TypeVarConvertTableValue:
         """Select Store model from database.
 
         If record is not exist, raise NoResultFound.
+        Name normalized for Shift JIS is also found when name itself is not exist.
         """
-        with suppress(NoResultFound):
-            return cls.find(file_csv_convert_id, name)
-        # ↓ To support Shift JIS. Reason: Specification.
-        return cls.find(file_csv_convert_id, name.replace("−", "ー"))  # noqa: RUF001
+        return cast("TypeVarConvertTableValue", CONVERT_TABLE_INDEX.try_to_find(cls, file_csv_convert_id, name))
 
     @classmethod
-    def find(cls, file_csv_convert_id: FileCsvConvertId, name: str) -> TypeVarBase:
-        """Select Store model from database."""
-        with Session() as session:
-            return cast(
-                "TypeVarBase",
-                session.execute(
-                    select(cls).where(cls.file_csv_convert_id == file_csv_convert_id.value, cls.name == name),
-                ).scalar_one(),
-            )
+    def find(cls, file_csv_convert_id: FileCsvConvertId, name: str) -> TypeVarConvertTableValue:
+        """Select Store model from index of convert table."""
+        return cast("TypeVarConvertTableValue", CONVERT_TABLE_INDEX.find(cls, file_csv_convert_id, name))
 
     @classmethod
     def save_all(cls, models: list[TypeVarBase]) -> None:
@@ -166,12 +229,30 @@ class ConvertTableRecordMixin(Generic[TypeVarBase, TypeVarConvertTableRowData]):
         with Session() as session:
             session.add_all(models)
             session.commit()
+        CONVERT_TABLE_INDEX.clear()
+
+    @classmethod
+    def replace_all(cls, file_csv_convert_id: FileCsvConvertId, models: list[TypeVarBase]) -> None:
+        """Replace models of convert table CSV file in single transaction."""
+        with Session() as session:
+            session.execute(delete(cls).where(cls.file_csv_convert_id == file_csv_convert_id.value))
+            session.add_all(models)
+            session.commit()
+        CONVERT_TABLE_INDEX.clear()
+
+
+# Reason: Convert table can be changed without save_all() or replace_all(), e.g. fixtures for unit testing.
+@event.listens_for(ConvertTableRecordMixin, "after_insert", propagate=True)
+@event.listens_for(ConvertTableRecordMixin, "after_update", propagate=True)
+@event.listens_for(ConvertTableRecordMixin, "after_delete", propagate=True)
+def clear_convert_table_index(*_args: Any) -> None:  # noqa: ANN401
+    CONVERT_TABLE_INDEX.clear()
 
 
 with warnings.catch_warnings():
     warnings.simplefilter("ignore", category=exc.SAWarning)
 
-    class Store(Base, ConvertTableRecordMixin["Store", StoreRowData]):
+    class Store(Base, ConvertTableRecordMixin["Store", StoreRowData, StoreValue]):
         """This class implements Store model to convert from account CSV to Zaim CSV."""
 
         # The types are by default always considered to be Optional,
@@ -187,6 +268,14 @@ with warnings.catch_warnings():
         name_zaim: Mapped[Optional[str]] = mapped_column(String(255))  # noqa: UP045
         category_income: Mapped[Optional[str]] = mapped_column(String(255))  # noqa: UP045
         transfer_target: Mapped[Optional[str]] = mapped_column(String(255))  # noqa: UP045
+        COLUMNS_CSV = (
+            "name",
+            "name_zaim",
+            "category_payment_large",
+            "category_payment_small",
+            "category_income",
+            "transfer_target",
+        )
 
         def __init__(self, file_csv_convert_id: FileCsvConvertId, row_data: StoreRowData) -> None:
             ConvertTableRecordMixin.__init__(self, file_csv_convert_id, row_data)
@@ -198,31 +287,25 @@ with warnings.catch_warnings():
             self.category_income = self._get_str_or_none(row_data.category_income)
             self.transfer_target = self._get_str_or_none(row_data.transfer_account)
 
-        @property
-        def is_amazon(self) -> bool:
-            """This property returns whether this store is Amazon.co.jp or not."""
-            # Reason: Specification.
-            return self.name in [
-                "Ａｍａｚｏｎ  Ｄｏｗｎｌｏａｄｓ",  # noqa: RUF001
-                "Ａｍａｚｏｎ　Ｄｏｗｎｌｏａｄｓ",  # noqa: RUF001
-                "ＡＭＡＺＯＮ．ＣＯ．ＪＰ",  # noqa: RUF001
+        @classmethod
+        def create_values(cls, iterable_model: Iterable[Store], store_classifier: StoreClassifier) -> list[StoreValue]:
+            """Create immutable values which stores are classified into categories."""
+            return [
+                StoreValue(
+                    model.file_csv_convert_id,
+                    model.name,
+                    model.category_payment_large,
+                    model.category_payment_small,
+                    model.id,
+                    model.name_zaim,
+                    model.category_income,
+                    model.transfer_target,
+                    store_classifier.classify(model.name),
+                )
+                for model in iterable_model
             ]
 
-        @property
-        def is_pay_pal(self) -> bool:
-            """This property returns whether this store is PayPal or not."""
-            # Reason: Specification.
-            return self.name == "ＰａｙＰａｌ決済" or (
-                self.name is not None and re.search(r"PAYPAL\s*", self.name) is not None
-            )
-
-        @property
-        def is_kyash(self) -> bool:
-            """This property returns whether this store is Kyash or not."""
-            # Reason: Specification.
-            return bool(self.name == "ＫＹＡＳＨ")  # noqa: RUF001
-
-    class Item(Base, ConvertTableRecordMixin["Item", ItemRowData]):
+    class Item(Base, ConvertTableRecordMixin["Item", ItemRowData, ItemValue]):
         """This class implements Store model to convert from account CSV to Zaim CSV."""
 
         def __init__(self, file_csv_convert_id: FileCsvConvertId, row_data: ItemRowData) -> None:
@@ -232,18 +315,47 @@ with warnings.catch_warnings():
             category_payment_small = self._get_str_or_none(row_data.category_payment_small)
             self.category_payment_small = category_payment_small
 
+        @classmethod
+        def create_values(
+            cls,
+            iterable_model: Iterable[Item],
+            store_classifier: StoreClassifier,  # noqa: ARG003
+        ) -> list[ItemValue]:
+            return [
+                ItemValue(
+                    model.file_csv_convert_id,
+                    model.name,
+                    model.category_payment_large,
+                    model.category_payment_small,
+                    model.id,
+                )
+                for model in iterable_model
+            ]
+
+
+def initialize_database(backend: ConvertTableBackend[Any] | None = None) -> None:
+    """Create empty tables from SQLAlchemy models on database of backend.
+
+    Backend selected in configuration is used when it isn't specified.
+    Existing tables are dropped so that convert tables can be imported again in the same process.
+    """
+    CONVERT_TABLE_INDEX.use(ConvertTableBackendFactory.create_by_config() if backend is None else backend)
+    create_tables()
+
 
-def initialize_database() -> None:
-    """Create empty tables from SQLAlchemy models."""
+def create_tables() -> None:
+    """Create empty tables from SQLAlchemy models on database of current engine, existing tables are dropped."""
     # pylint: disable=no-member
+    Base.metadata.drop_all(Session.get_bind())
     Base.metadata.create_all(Session.get_bind(), checkfirst=False)
+    CONVERT_TABLE_INDEX.clear()
 
 
 @dataclass
 class ClassConvertTable(Generic[TypeVarBase, TypeVarConvertTableRowData]):
     """This class implements association of classes about convert table."""
 
-    model: type[ConvertTableRecordMixin[TypeVarBase, TypeVarConvertTableRowData]]
+    model: type[ConvertTableRecordMixin[TypeVarBase, TypeVarConvertTableRowData, Any]]
     row_data: type[TypeVarConvertTableRowData]
 
 
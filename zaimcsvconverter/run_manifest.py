@@ -0,0 +1,150 @@
+"""This module implements manifest of previous run to skip unchanged input CSV files."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from functools import cache
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from zaimcsvconverter import CONFIG
+from zaimcsvconverter.accounts.enum import Account
+from zaimcsvconverter.convert_table_source import ConvertTableSourceFactory
+from zaimcsvconverter.errorreporters.convert_result import ConvertResult
+
+if TYPE_CHECKING:
+    from zaimcsvconverter.convert_table_source import ConvertTableSource
+    from zaimcsvconverter.file_csv_convert import FileCsvConvert
+
+
+def get_package_version() -> str:
+    """Return version of this package, or "unknown" when this package isn't installed."""
+    try:
+        return version("zaimcsvconverter")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@cache
+def hash_package_source() -> str:
+    """Return SHA-256 hash of source code of this package.
+
+    Version of this package isn't bumped on each change of converters,
+    so fingerprints include this hash to be invalidated when code of converters is changed.
+    """
+    directory_package = Path(__file__).parent
+    hash_source = hashlib.sha256()
+    for path in sorted(directory_package.rglob("*.py")):
+        hash_source.update(path.relative_to(directory_package).as_posix().encode("UTF-8"))
+        hash_source.update(path.read_bytes())
+    return hash_source.hexdigest()
+
+
+def hash_file(path: Path) -> str | None:
+    """Return SHA-256 hash of content of file, or None when file doesn't exist."""
+    if not path.is_file():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class RunManifest:
+    """This class implements manifest of previous run to skip unchanged input CSV files.
+
+    Each input CSV file is recorded with fingerprint of everything its output depends on:
+    content of the file, sources of convert tables of the account, sections of configuration for the account,
+    version and source code of this package. Result of converting is also recorded to report errors again without converting.
+    """
+
+    FILE_NAME = "manifest.json"
+
+    def __init__(self, directory_csv_output: Path, directory_csv_convert: Path) -> None:
+        self.directory_csv_output = directory_csv_output
+        self.directory_csv_convert = directory_csv_convert
+        self.path = directory_csv_output / self.FILE_NAME
+        self.package_version = get_package_version()
+        self.hash_package_source = hash_package_source()
+        self.dictionary_previous_entry = self.load()
+        self.dictionary_entry: dict[str, dict[str, Any]] = {}
+        self.dictionary_fingerprint: dict[Path, str] = {}
+        self.dictionary_hash_convert_table: dict[str, str | None] = {}
+        self.list_source: list[ConvertTableSource] | None = None
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Load entries of previous run. Broken manifest is treated as empty one."""
+        try:
+            dictionary_entry = json.loads(self.path.read_text(encoding="UTF-8"))
+        except (OSError, ValueError):
+            return {}
+        return dictionary_entry if isinstance(dictionary_entry, dict) else {}
+
+    def find(self, path_csv_file: Path) -> ConvertResult | None:
+        """Return previous result when input CSV file and its dependencies are unchanged since previous run."""
+        entry = self.dictionary_previous_entry.get(path_csv_file.name)
+        if entry is None or entry.get("fingerprint") != self.fingerprint(path_csv_file):
+            return None
+        if not (self.directory_csv_output / path_csv_file.name).is_file():
+            return None
+        try:
+            return ConvertResult.from_dict(entry["convert_result"])
+        except (KeyError, TypeError):
+            return None
+
+    def record(self, path_csv_file: Path, convert_result: ConvertResult) -> None:
+        """Record result of input CSV file in this run."""
+        self.dictionary_entry[path_csv_file.name] = {
+            "fingerprint": self.fingerprint(path_csv_file),
+            "convert_result": convert_result.to_dict(),
+        }
+
+    def save(self) -> None:
+        """Save entries of this run. Entries of input CSV files which no longer exist are dropped."""
+        self.path.write_text(json.dumps(self.dictionary_entry, ensure_ascii=False, indent=2), encoding="UTF-8")
+
+    def fingerprint(self, path_csv_file: Path) -> str:
+        """Return fingerprint of input CSV file and its dependencies.
+
+        Fingerprint is calculated only once for each input CSV file in run
+        so that the one recorded is the one of content which has been converted.
+        """
+        if path_csv_file not in self.dictionary_fingerprint:
+            self.dictionary_fingerprint[path_csv_file] = self._calculate_fingerprint(path_csv_file)
+        return self.dictionary_fingerprint[path_csv_file]
+
+    def _calculate_fingerprint(self, path_csv_file: Path) -> str:
+        account_context = Account.create_by_path_csv_input(path_csv_file).value
+        dependency = {
+            "version": self.package_version,
+            "source": self.hash_package_source,
+            "input": hash_file(path_csv_file),
+            "convert_table": {
+                file_csv_convert.value.name: self._hash_convert_table(file_csv_convert)
+                for file_csv_convert in account_context.list_file_csv_convert
+            },
+            "config": {config_key: self._dump_config(config_key) for config_key in account_context.list_config_key},
+        }
+        return hashlib.sha256(json.dumps(dependency, sort_keys=True).encode("UTF-8")).hexdigest()
+
+    def _hash_convert_table(self, file_csv_convert: FileCsvConvert) -> str | None:
+        """Return hash of fingerprints of all sources of convert table, or None when it has no source."""
+        file_name = file_csv_convert.value.name
+        if file_name not in self.dictionary_hash_convert_table:
+            if self.list_source is None:
+                self.list_source = ConvertTableSourceFactory.create_all(self.directory_csv_convert)
+            list_fingerprint = [
+                source.fingerprint() for source in self.list_source if source.file_csv_convert is file_csv_convert
+            ]
+            self.dictionary_hash_convert_table[file_name] = (
+                hashlib.sha256(json.dumps(list_fingerprint).encode("UTF-8")).hexdigest() if list_fingerprint else None
+            )
+        return self.dictionary_hash_convert_table[file_name]
+
+    @staticmethod
+    def _dump_config(config_key: str) -> dict[str, Any] | list[dict[str, Any]] | None:
+        config = getattr(CONFIG, config_key)
+        if isinstance(config, list):
+            return [element.to_dict() for element in config]
+        return None if config is None else config.to_dict()
@@ -0,0 +1,251 @@
+"""This module implements convert tables shared with worker processes through memory-mapped file."""
+
+from __future__ import annotations
+
+import mmap
+import pickle
+import struct
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+from typing import Any
+
+from sqlalchemy import select
+
+from zaimcsvconverter import Session
+from zaimcsvconverter.convert_table_backend import ConvertTableBackend
+from zaimcsvconverter.convert_table_backend import IndexedConvertTable
+from zaimcsvconverter.convert_table_backend import LruCache
+from zaimcsvconverter.convert_table_backend import SqliteConvertTableBackend
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.convert_table_pattern import ConvertTablePattern
+from zaimcsvconverter.models import ConvertTableType
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from sqlalchemy import Select
+    from sqlalchemy.orm import Session as SQLAlchemySession
+
+
+class SortedStringTable:
+    """This class implements read-only sorted string table on memory-mapped file.
+
+    Layout of file is magic number, entries sorted by key, offsets of entries and number of entries.
+    Each entry is length of key, key and value.
+    Offsets follow entries so that entries are written while they are streamed.
+    Since file is mapped into memory as read-only, processes share its pages through page cache,
+    and entry is found by binary search on offsets without deserializing whole table.
+    """
+
+    MAGIC = b"ZCSVSST2"
+    STRUCT_COUNT = struct.Struct("<Q")
+    STRUCT_OFFSET = struct.Struct("<Q")
+    STRUCT_LENGTH_KEY = struct.Struct("<I")
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.mmap[: len(self.MAGIC)] != self.MAGIC:
+            self.mmap.close()
+            msg = f"File is not sorted string table. path = {path}"
+            raise ValueError(msg)
+        self.count: int = self.STRUCT_COUNT.unpack_from(self.mmap, len(self.mmap) - self.STRUCT_COUNT.size)[0]
+        self.offset_offsets = len(self.mmap) - self.STRUCT_COUNT.size - self.STRUCT_OFFSET.size * (self.count + 1)
+
+    @classmethod
+    def write(cls, path: Path, iterable_entry: Iterable[tuple[bytes, bytes]]) -> None:
+        """Write entries into file in order of key."""
+        cls.write_sorted(path, sorted(iterable_entry))
+
+    @classmethod
+    def write_sorted(cls, path: Path, iterable_entry: Iterable[tuple[bytes, bytes]]) -> None:
+        """Write entries which are streamed in order of key into file without holding them.
+
+        Raise ValueError when key isn't greater than previous one.
+        """
+        list_offset = array("Q")
+        key_previous = None
+        with path.open("wb") as file:
+            file.write(cls.MAGIC)
+            offset = len(cls.MAGIC)
+            for key, value in iterable_entry:
+                if key_previous is not None and key <= key_previous:
+                    msg = f"Keys should be unique and in ascending order. key = {key!r}"
+                    raise ValueError(msg)
+                key_previous = key
+                list_offset.append(offset)
+                file.write(cls.STRUCT_LENGTH_KEY.pack(len(key)))
+                file.write(key)
+                file.write(value)
+                offset += cls.STRUCT_LENGTH_KEY.size + len(key) + len(value)
+            list_offset.append(offset)
+            file.writelines(cls.STRUCT_OFFSET.pack(offset_entry) for offset_entry in list_offset)
+            file.write(cls.STRUCT_COUNT.pack(len(list_offset) - 1))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> bytes:
+        """Return key of entry, so that bisect searches keys through this table."""
+        start, _ = self.get_range(index)
+        (length_key,) = self.STRUCT_LENGTH_KEY.unpack_from(self.mmap, start)
+        start_key = start + self.STRUCT_LENGTH_KEY.size
+        return self.mmap[start_key : start_key + length_key]
+
+    def get_range(self, index: int) -> tuple[int, int]:
+        return (
+            self.STRUCT_OFFSET.unpack_from(self.mmap, self.offset_offsets + self.STRUCT_OFFSET.size * index)[0],
+            self.STRUCT_OFFSET.unpack_from(self.mmap, self.offset_offsets + self.STRUCT_OFFSET.size * (index + 1))[0],
+        )
+
+    def get_value(self, index: int) -> bytes:
+        start, end = self.get_range(index)
+        (length_key,) = self.STRUCT_LENGTH_KEY.unpack_from(self.mmap, start)
+        return self.mmap[start + self.STRUCT_LENGTH_KEY.size + length_key : end]
+
+    def get(self, key: bytes) -> bytes | None:
+        """Return value of key, or None when key isn't exist."""
+        index = bisect_left(self, key)
+        return self.get_value(index) if index < self.count and self[index] == key else None
+
+    def iterate_prefix(self, prefix: bytes) -> Generator[bytes, None, None]:
+        """Yield values which key starts with prefix in order of key."""
+        index = bisect_left(self, prefix)
+        while index < self.count and self[index].startswith(prefix):
+            yield self.get_value(index)
+            index += 1
+
+    def close(self) -> None:
+        self.mmap.close()
+
+
+class SharedConvertTable:
+    """This class implements keys and values of convert tables in sorted string table.
+
+    Each value is saved with key of its name, and value of rule is also saved with key of its order
+    so that rules of each convert table CSV are scanned in order without scanning names.
+    Rows are streamed from database in order of key, so that neither rows nor entries are held at once.
+    """
+
+    SEPARATOR = "\0"
+    KIND_NAME = "n"
+    KIND_RULE = "r"
+    SIZE_CHUNK = 1_000
+
+    @classmethod
+    def create_key(cls, model: type[Any], file_csv_convert_id: int, kind: str, name: str = "") -> bytes:
+        return cls.SEPARATOR.join([model.__table__.name, str(file_csv_convert_id), kind + name]).encode()
+
+    @classmethod
+    def write(cls, path: Path) -> None:
+        """Write convert tables in current database into file."""
+        SortedStringTable.write_sorted(path, cls.iterate_entry())
+
+    @classmethod
+    def iterate_entry(cls) -> Generator[tuple[bytes, bytes], None, None]:
+        """Yield entries in order of key: table name, file CSV convert id as string, then names before rules."""
+        iterable_model: Iterable[type[Any]] = (
+            convert_table_type.value.model for convert_table_type in ConvertTableType
+        )
+        for model in sorted(iterable_model, key=lambda model: model.__table__.name):
+            with Session() as session:
+                list_file_csv_convert_id = (
+                    session.execute(select(model.file_csv_convert_id).distinct()).scalars().all()
+                )
+                for file_csv_convert_id in sorted(list_file_csv_convert_id, key=str):
+                    yield from cls.iterate_entry_name(session, model, file_csv_convert_id)
+                    yield from cls.iterate_entry_rule(session, model, file_csv_convert_id)
+
+    @classmethod
+    def iterate_entry_name(
+        cls,
+        session: SQLAlchemySession,
+        model: type[Any],
+        file_csv_convert_id: int,
+    ) -> Generator[tuple[bytes, bytes], None, None]:
+        # Names are sorted by SQLite in binary collation, which is same as order of UTF-8 bytes.
+        statement = select(model).where(model.file_csv_convert_id == file_csv_convert_id).order_by(model.name)
+        for value in cls.iterate_value(session, model, statement):
+            yield cls.create_key(model, file_csv_convert_id, cls.KIND_NAME, value.name), pickle.dumps(value)
+
+    @classmethod
+    def iterate_entry_rule(
+        cls,
+        session: SQLAlchemySession,
+        model: type[Any],
+        file_csv_convert_id: int,
+    ) -> Generator[tuple[bytes, bytes], None, None]:
+        statement = SqliteConvertTableBackend.select_rule(model, file_csv_convert_id)
+        for value in cls.iterate_value(session, model, statement):
+            if ConvertTablePattern.is_prefix(value.name) or ConvertTablePattern.is_regex(value.name):
+                key = cls.create_key(model, file_csv_convert_id, cls.KIND_RULE, f"{value.id:020d}")
+                yield key, pickle.dumps(value)
+
+    @classmethod
+    def iterate_value(cls, session: SQLAlchemySession, model: type[Any], statement: Select[Any]) -> Iterator[Any]:
+        """Yield values of rows which are fetched by chunk."""
+        result = session.execute(statement.execution_options(yield_per=cls.SIZE_CHUNK))
+        for partition in result.scalars().partitions():
+            yield from CONVERT_TABLE_INDEX.create_values(model, partition)
+
+
+class SharedConvertTableBackend(ConvertTableBackend[dict[tuple[type[Any], int], ConvertTablePattern]]):
+    """This class implements backend which looks up convert tables written by parent process.
+
+    Worker processes look up the same memory-mapped file instead of importing convert tables into their own database,
+    so that memory doesn't increase as workers are added.
+    Only prefix and regular expression rules and bounded LRU cache of values which have been decoded
+    are loaded into memory of each process.
+    """
+
+    def __init__(self, path: Path, cache_size: int = SqliteConvertTableBackend.DEFAULT_CACHE_SIZE) -> None:
+        super().__init__()
+        self.sorted_string_table = SortedStringTable(path)
+        # File isn't changed after it is written, so that decoded values including undefined names are kept.
+        self.lru_cache = LruCache(cache_size)
+
+    def find(self, model: type[Any], file_csv_convert_id: int, name: str) -> Any | None:  # noqa: ANN401
+        return self.get(SharedConvertTable.create_key(model, file_csv_convert_id, SharedConvertTable.KIND_NAME, name))
+
+    def try_to_find(self, model: type[Any], file_csv_convert_id: int, name: str) -> Any | None:  # noqa: ANN401
+        name_normalized = IndexedConvertTable.normalize(name)
+        for name_candidate in (name, name_normalized):
+            value = self.find(model, file_csv_convert_id, name_candidate)
+            if value is not None:
+                return value
+        return self.get_pattern(model, file_csv_convert_id).match_either(name, name_normalized)
+
+    def get(self, key: bytes) -> Any | None:  # noqa: ANN401
+        value = self.lru_cache.get(key)
+        if value is not LruCache.MISSING:
+            return value
+        value_pickled = self.sorted_string_table.get(key)
+        # Reason: File is written by parent process as same as arguments of worker processes are pickled.
+        value = None if value_pickled is None else pickle.loads(value_pickled)  # noqa: S301
+        self.lru_cache.put(key, value)
+        return value
+
+    def create_state(self) -> dict[tuple[type[Any], int], ConvertTablePattern]:
+        return {}
+
+    def get_pattern(self, model: type[Any], file_csv_convert_id: int) -> ConvertTablePattern:
+        dictionary_pattern = self.get_state()
+        convert_table_pattern = dictionary_pattern.get((model, file_csv_convert_id))
+        if convert_table_pattern is not None:
+            return convert_table_pattern
+        prefix = SharedConvertTable.create_key(model, file_csv_convert_id, SharedConvertTable.KIND_RULE)
+        list_value = [
+            # Reason: File is written by parent process as same as arguments of worker processes are pickled.
+            pickle.loads(value_pickled)  # noqa: S301
+            for value_pickled in self.sorted_string_table.iterate_prefix(prefix)
+        ]
+        convert_table_pattern = ConvertTablePattern((value.name, value) for value in list_value)
+        return dictionary_pattern.setdefault((model, file_csv_convert_id), convert_table_pattern)
+
+    def close(self) -> None:
+        super().close()
+        self.sorted_string_table.close()
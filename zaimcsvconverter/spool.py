@@ -0,0 +1,111 @@
+"""This module implements spool directory which input CSV files are claimed from by rename-based leases."""
+
+from __future__ import annotations
+
+import os
+import time
+from contextlib import suppress
+from threading import Event
+from threading import Thread
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from types import TracebackType
+
+
+class Spool:
+    """This class implements spool directory which input CSV files are claimed from by rename-based leases.
+
+    Input CSV file is claimed by renaming it into lease directory of worker.
+    Since rename is atomic even on shared filesystem, only one worker can claim each input CSV file.
+    Lease is alive while its modified time is renewed by worker,
+    and expired lease is returned to spool so that other worker can claim it again.
+    Completed input CSV file is moved into done directory.
+    """
+
+    DIRECTORY_NAME_LEASE = ".lease"
+    DIRECTORY_NAME_DONE = ".done"
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.directory_lease = directory / self.DIRECTORY_NAME_LEASE
+        self.directory_done = directory / self.DIRECTORY_NAME_DONE
+
+    def claim(self, worker_id: str) -> Path | None:
+        """Claim one of input CSV files in spool and return path of lease, or None when nothing is left."""
+        directory_lease_worker = self.directory_lease / worker_id
+        directory_lease_worker.mkdir(parents=True, exist_ok=True)
+        for path_csv_file in sorted(self.directory.glob("*.csv")):
+            path_lease = directory_lease_worker / path_csv_file.name
+            try:
+                # Rename keeps modified time, so it's renewed in advance not to be regarded as expired lease.
+                os.utime(path_csv_file)
+                path_csv_file.rename(path_lease)
+            except FileNotFoundError:
+                # Other worker has claimed.
+                continue
+            if self.renew(path_lease):
+                return path_lease
+        return None
+
+    @staticmethod
+    def renew(path_lease: Path) -> bool:
+        """Renew lease and return whether lease is still held or not."""
+        try:
+            os.utime(path_lease)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def complete(self, path_lease: Path) -> bool:
+        """Move input CSV file of lease into done directory and return whether lease was still held or not."""
+        self.directory_done.mkdir(exist_ok=True)
+        try:
+            path_lease.replace(self.directory_done / path_lease.name)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def reclaim_expired(self, lease_seconds: float) -> list[Path]:
+        """Return input CSV files of leases which haven't been renewed for lease_seconds into spool."""
+        list_path_csv_file: list[Path] = []
+        deadline = time.time() - lease_seconds
+        for path_lease in self.list_lease():
+            with suppress(FileNotFoundError):
+                if path_lease.stat().st_mtime >= deadline:
+                    continue
+                path_csv_file = self.directory / path_lease.name
+                path_lease.rename(path_csv_file)
+                list_path_csv_file.append(path_csv_file)
+        return list_path_csv_file
+
+    def list_lease(self) -> list[Path]:
+        return sorted(self.directory_lease.glob("*/*.csv"))
+
+
+class LeaseRenewer:
+    """This class implements renewing lease on background thread while input CSV file is converted."""
+
+    def __init__(self, path_lease: Path, interval: float) -> None:
+        self.path_lease = path_lease
+        self.interval = interval
+        self.stop_event = Event()
+        self.thread = Thread(target=self.run, daemon=True)
+
+    def __enter__(self) -> None:
+        self.thread.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.stop_event.set()
+        self.thread.join()
+
+    def run(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            if not Spool.renew(self.path_lease):
+                return
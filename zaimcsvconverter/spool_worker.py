@@ -0,0 +1,150 @@
+"""This module implements worker which converts input CSV files claimed from spool directory."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+from logging import getLogger
+from threading import Event
+from typing import TYPE_CHECKING
+
+from zaimcsvconverter import CONFIG
+from zaimcsvconverter.convert_table_cache import ConvertTableCache
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.errorreporters.convert_result import ConvertResult
+from zaimcsvconverter.errorreporters.error_totalizer import ErrorTotalizer
+from zaimcsvconverter.errorreporters.error_totalizer import FileNameForError
+from zaimcsvconverter.exceptions import SomeInvalidInputCsvError
+from zaimcsvconverter.models import initialize_database
+from zaimcsvconverter.spool import LeaseRenewer
+from zaimcsvconverter.spool import Spool
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+    from zaimcsvconverter.workspace import Workspace
+
+
+class ErrorFragments:
+    """This class implements errors of each input CSV file which are reported by separate workers.
+
+    Each worker writes error fragment of input CSV file it has converted into temporary file,
+    and publishes it only after completing lease, so that worker whose lease has expired never overwrites
+    error fragment of worker which has claimed the input CSV file again.
+    Final step merges error fragments into error CSV files in order of input CSV file name,
+    then removes them so that next spool run starts without error fragments of previous one.
+    """
+
+    DIRECTORY_NAME = ".fragment"
+
+    def __init__(self, directory_csv_output: Path) -> None:
+        self.directory_csv_output = directory_csv_output
+        self.directory = directory_csv_output / self.DIRECTORY_NAME
+
+    def write(self, file_name: str, convert_result: ConvertResult, worker_id: str) -> Path:
+        """Write error fragment into temporary file of worker and return its path."""
+        self.directory.mkdir(exist_ok=True)
+        path_temporary = self.directory / f".{file_name}.{worker_id}.tmp"
+        path_temporary.write_text(json.dumps(convert_result.to_dict(), ensure_ascii=False), encoding="UTF-8")
+        return path_temporary
+
+    def publish(self, file_name: str, path_temporary: Path) -> None:
+        """Move temporary file into error fragment atomically so that final step never reads partially written one."""
+        path_temporary.replace(self.directory / f"{file_name}.json")
+
+    def report(self) -> None:
+        """Merge error fragments into error CSV files, then raise error when some input CSV files are invalid.
+
+        Error CSV files of previous run are removed even if no error is reported.
+        Undefined content errors aren't reported with suggestions since convert tables aren't imported on this step.
+        """
+        error_totalizer = ErrorTotalizer(self.directory_csv_output, suggest=False)
+        list_path_fragment = sorted(self.directory.glob("*.json"))
+        for path_fragment in list_path_fragment:
+            error_totalizer.merge(ConvertResult.from_dict(json.loads(path_fragment.read_text(encoding="UTF-8"))))
+        self.remove_error_csv()
+        if error_totalizer.is_presented:
+            error_totalizer.report_to_csv()
+        for path_fragment in list_path_fragment:
+            path_fragment.unlink()
+        if error_totalizer.is_presented:
+            raise SomeInvalidInputCsvError(error_totalizer.message)
+
+    def remove_error_csv(self) -> None:
+        for file_name_for_error in (FileNameForError.INVALID_ROW, FileNameForError.UNDEFINED_CONTENT):
+            (self.directory_csv_output / file_name_for_error.value).unlink(missing_ok=True)
+
+
+class SpoolWorker:
+    """This class implements worker which converts input CSV files claimed from spool directory.
+
+    Input CSV directory of workspace is used as spool directory.
+    Several workers, possibly on different hosts sharing filesystem, can run on same workspace.
+    Lease expires when it isn't renewed for lease_seconds, so lease_seconds should be much longer than
+    difference of clocks between hosts.
+    """
+
+    DEFAULT_LEASE_SECONDS = 300.0
+    DEFAULT_INTERVAL_SECONDS = 1.0
+
+    def __init__(
+        self,
+        workspace: Workspace,
+        *,
+        worker_id: str | None = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        pipelined: bool = False,
+    ) -> None:
+        self.workspace = workspace
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}" if worker_id is None else worker_id
+        self.lease_seconds = lease_seconds
+        self.pipelined = pipelined
+        self.spool = Spool(workspace.directory_csv_input)
+        self.error_fragments = ErrorFragments(workspace.directory_csv_output)
+        self.logger = getLogger(__name__)
+
+    def run(self, interval: float = DEFAULT_INTERVAL_SECONDS, stop_event: Event | None = None) -> list[Path]:
+        """Convert input CSV files until spool is drained and return names of converted files.
+
+        Worker waits while other workers hold leases since their leases may expire.
+        """
+        if stop_event is None:
+            stop_event = Event()
+        CONFIG.load(self.workspace.path_file_config)
+        CONVERT_TABLE_INDEX.configure(CONFIG.store_categories)
+        initialize_database()
+        ConvertTableCache(self.workspace.directory_csv_convert).execute()
+        return list(self.iterate_converted(interval, stop_event))
+
+    def iterate_converted(self, interval: float, stop_event: Event) -> Generator[Path, None, None]:
+        while not stop_event.is_set():
+            self.spool.reclaim_expired(self.lease_seconds)
+            path_lease = self.spool.claim(self.worker_id)
+            if path_lease is None:
+                if not self.spool.list_lease():
+                    return
+                stop_event.wait(interval)
+                continue
+            if self.convert(path_lease):
+                yield self.spool.directory / path_lease.name
+
+    def convert(self, path_lease: Path) -> bool:
+        """Convert input CSV file of lease and return whether lease was held until completion or not.
+
+        Error fragment is published only when lease was held until completion.
+        """
+        with LeaseRenewer(path_lease, self.lease_seconds / 3):
+            convert_result = ConvertResult.convert(
+                path_lease,
+                self.workspace.directory_csv_output,
+                pipelined=self.pipelined,
+            )
+        path_temporary = self.error_fragments.write(path_lease.name, convert_result, self.worker_id)
+        if not self.spool.complete(path_lease):
+            path_temporary.unlink()
+            self.logger.warning("Lease expired while converting, other worker converts again: %s", path_lease.name)
+            return False
+        self.error_fragments.publish(path_lease.name, path_temporary)
+        return True
@@ -0,0 +1,81 @@
+"""This module implements classifying stores into categories when convert table is loaded."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import ClassVar
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from zaimcsvconverter.config import StoreCategoryConfig
+
+
+class StoreCategory:
+    """This class implements built-in categories of store."""
+
+    AMAZON = "amazon"
+    PAY_PAL = "pay_pal"
+    KYASH = "kyash"
+
+
+@dataclass(frozen=True)
+class StoreClassificationRule:
+    """This class implements rule to classify store into category by exact names or pattern of name."""
+
+    category: str
+    names: frozenset[str] = frozenset()
+    pattern: re.Pattern[str] | None = None
+
+    def match(self, name: str) -> bool:
+        return name in self.names or (self.pattern is not None and self.pattern.search(name) is not None)
+
+
+class StoreClassifier:
+    """This class implements classifying stores into categories when convert table is loaded.
+
+    Each store is classified once, so that rows only check whether category is included in store.
+    Rules can be added by configuration in addition to built-in rules.
+    """
+
+    # Reason: Specification.
+    LIST_RULE_DEFAULT: ClassVar[list[StoreClassificationRule]] = [
+        StoreClassificationRule(
+            StoreCategory.AMAZON,
+            frozenset(
+                [
+                    "Ａｍａｚｏｎ  Ｄｏｗｎｌｏａｄｓ",  # noqa: RUF001
+                    "Ａｍａｚｏｎ　Ｄｏｗｎｌｏａｄｓ",  # noqa: RUF001
+                    "ＡＭＡＺＯＮ．ＣＯ．ＪＰ",  # noqa: RUF001
+                ],
+            ),
+        ),
+        StoreClassificationRule(StoreCategory.PAY_PAL, frozenset(["ＰａｙＰａｌ決済"]), re.compile(r"PAYPAL\s*")),
+        StoreClassificationRule(StoreCategory.KYASH, frozenset(["ＫＹＡＳＨ"])),  # noqa: RUF001
+    ]
+
+    def __init__(self, list_rule: list[StoreClassificationRule]) -> None:
+        self.list_rule = list_rule
+
+    @classmethod
+    def create(cls, list_store_category_config: Iterable[StoreCategoryConfig]) -> StoreClassifier:
+        """Create classifier by built-in rules and rules in configuration."""
+        return cls(
+            [
+                *cls.LIST_RULE_DEFAULT,
+                *(
+                    StoreClassificationRule(
+                        store_category_config.category,
+                        frozenset(store_category_config.names),
+                        None if store_category_config.pattern is None else re.compile(store_category_config.pattern),
+                    )
+                    for store_category_config in list_store_category_config
+                ),
+            ],
+        )
+
+    def classify(self, name: str) -> frozenset[str]:
+        """Return categories of store which name is argument."""
+        return frozenset(rule.category for rule in self.list_rule if rule.match(name))
@@ -0,0 +1,40 @@
+"""This module implements directory tree which has configuration, convert tables, input CSV and output CSV."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from zaimcsvconverter import PATH_FILE_CONFIG
+from zaimcsvconverter import DirectoryCsv
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@dataclass(frozen=True)
+class Workspace:
+    """This class implements directory tree which has configuration, convert tables, input CSV and output CSV.
+
+    Each household (tenant) has its own workspace so that many households can be converted in one process.
+    """
+
+    path_file_config: Path
+    directory_csv_convert: Path
+    directory_csv_input: Path
+    directory_csv_output: Path
+
+    @classmethod
+    def create(cls, directory_root: Path) -> Workspace:
+        """Create workspace which has same layout as root directory of this project."""
+        return cls(
+            directory_root / PATH_FILE_CONFIG.name,
+            directory_root / DirectoryCsv.CONVERT.value.name,
+            directory_root / DirectoryCsv.INPUT.value.name,
+            directory_root / DirectoryCsv.OUTPUT.value.name,
+        )
+
+    @classmethod
+    def default(cls) -> Workspace:
+        """Create workspace of root directory of this project."""
+        return cls(PATH_FILE_CONFIG, DirectoryCsv.CONVERT.value, DirectoryCsv.INPUT.value, DirectoryCsv.OUTPUT.value)
@@ -0,0 +1,83 @@
+"""This module implements converting steps for many workspaces in one process."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
+
+from zaimcsvconverter.csvconverter.process_pool_csv_converter import bind_new_database_engine
+from zaimcsvconverter.exceptions import SomeInvalidInputCsvError
+from zaimcsvconverter.zaim_csv_converter import MergeMode
+from zaimcsvconverter.zaim_csv_converter import ZaimCsvConverter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from zaimcsvconverter.workspace import Workspace
+
+
+def convert_workspace(
+    workspace: Workspace,
+    *,
+    pipelined: bool = False,
+    incremental: bool = False,
+    merge_mode: MergeMode = MergeMode.NONE,
+) -> str | None:
+    """Convert input CSV files of workspace and return error message when some of them are invalid.
+
+    Configuration and convert tables are loaded again for each workspace
+    so that workspace isn't affected by workspace converted previously on same process.
+    """
+    try:
+        ZaimCsvConverter.execute(
+            pipelined=pipelined,
+            incremental=incremental,
+            merge_mode=merge_mode,
+            workspace=workspace,
+        )
+    except SomeInvalidInputCsvError as error:
+        return str(error)
+    return None
+
+
+class ZaimCsvBatchConverter:
+    """This class implements converting steps for many workspaces in one process.
+
+    Modules, database engine and table schema are shared between workspaces,
+    so they are prepared only once for current process or each worker process.
+    """
+
+    def __init__(
+        self,
+        list_workspace: list[Workspace],
+        *,
+        parallel: bool = False,
+        max_workers: int | None = None,
+        pipelined: bool = False,
+    ) -> None:
+        self.list_workspace = list_workspace
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.pipelined = pipelined
+
+    def execute(self, *, incremental: bool = False, merge_mode: MergeMode = MergeMode.NONE) -> None:
+        """Convert all workspaces, then raise error when some of them have invalid input CSV files.
+
+        Invalid input CSV files of a workspace don't stop converting other workspaces.
+        """
+        convert = partial(convert_workspace, pipelined=self.pipelined, incremental=incremental, merge_mode=merge_mode)
+        list_message = [
+            f"{workspace.directory_csv_output}: {message}"
+            for workspace, message in zip(self.list_workspace, self.convert(convert), strict=True)
+            if message is not None
+        ]
+        if list_message:
+            raise SomeInvalidInputCsvError("\n".join(list_message))
+
+    def convert(self, convert: partial[str | None]) -> Iterable[str | None]:
+        """Convert workspaces and return error messages in order of workspaces."""
+        if not self.parallel:
+            return [convert(workspace) for workspace in self.list_workspace]
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=bind_new_database_engine) as executor:
+            return list(executor.map(convert, self.list_workspace))
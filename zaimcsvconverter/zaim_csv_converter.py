@@ -1,27 +1,301 @@
 """This module implements converting steps from account CSV to Zaim CSV."""
 
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING
+
 from zaimcsvconverter import CONFIG
-from zaimcsvconverter import PATH_FILE_CONFIG
-from zaimcsvconverter import DirectoryCsv
-from zaimcsvconverter.convert_table_importer import ConvertTableImporter
+from zaimcsvconverter.convert_table_cache import ConvertTableCache
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.csvconverter.process_pool_csv_converter import ProcessPoolCsvConverter
+from zaimcsvconverter.csvconverter.process_pool_csv_converter import create_process_pool
+from zaimcsvconverter.csvconverter.sharded_csv_converter import ShardedCsvConverter
+from zaimcsvconverter.errorreporters.convert_result import ConvertResult
+from zaimcsvconverter.errorreporters.csv_exporter import CsvExporter
 from zaimcsvconverter.errorreporters.error_totalizer import ErrorTotalizer
+from zaimcsvconverter.errorreporters.error_totalizer import FileNameForError
+from zaimcsvconverter.exceptions import InvalidConvertTableError
 from zaimcsvconverter.exceptions import SomeInvalidInputCsvError
 from zaimcsvconverter.models import initialize_database
+from zaimcsvconverter.run_manifest import RunManifest
+from zaimcsvconverter.workspace import Workspace
+from zaimcsvconverter.zaim_csv_merger import ZaimCsvMerger
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterable
+    from pathlib import Path
+
+
+class MergeMode(Enum):
+    """This class implements whether Zaim CSV files are merged into single Zaim CSV file ordered by date or not."""
+
+    # Output Zaim CSV file for each input CSV file into csvoutput/
+    NONE = "none"
+    # Output Zaim CSV file for each input CSV file and merged Zaim CSV file into csvoutput/
+    ALSO = "also"
+    # Output only merged Zaim CSV file into csvoutput/, Zaim CSV file for each input CSV file is kept in subdirectory
+    INSTEAD = "instead"
+
+
+@dataclass
+class ConvertOption:
+    """This class implements options how to convert input CSV files.
+
+    Attributes:
+        workspace: Workspace which has configuration, convert tables and input CSV files.
+        directory_csv_output: Directory to output Zaim CSV file for each input CSV file.
+        parallel: Whether convert each input CSV file on separate process or not.
+        max_workers: Number of worker processes in parallel or sharded mode. Defaults to number of CPU cores.
+        pipelined: Whether run reading, processing, converting and writing rows on separate threads or not.
+        shard_size: Number of rows in each shard to convert single input CSV file on multiple processes.
+            None disables sharding.
+    """
+
+    workspace: Workspace
+    directory_csv_output: Path
+    parallel: bool = False
+    max_workers: int | None = None
+    pipelined: bool = False
+    shard_size: int | None = None
 
 
 class ZaimCsvConverter:
     """This class implements converting steps from account CSV to Zaim CSV."""
 
+    DIRECTORY_NAME_EACH = "each"
+
+    # Reason: Each argument is independent option. pylint: disable=too-many-arguments
     @staticmethod
-    def execute() -> None:
-        """Execute all CSV converters."""
-        CONFIG.load(PATH_FILE_CONFIG)
-        initialize_database()
-        for path in sorted(DirectoryCsv.CONVERT.value.glob("*.csv")):
-            ConvertTableImporter.execute(path)
-        error_totalizer = ErrorTotalizer(DirectoryCsv.OUTPUT.value)
-        for path_csv_file in sorted(DirectoryCsv.INPUT.value.glob("*.csv")):
-            error_totalizer.convert_csv(path_csv_file)
+    def execute(  # noqa: PLR0913
+        *,
+        parallel: bool = False,
+        max_workers: int | None = None,
+        pipelined: bool = False,
+        incremental: bool = False,
+        shard_size: int | None = None,
+        merge_mode: MergeMode = MergeMode.NONE,
+        workspace: Workspace | None = None,
+    ) -> None:
+        """Execute all CSV converters.
+
+        Args:
+            parallel: Whether convert each input CSV file on separate process or not.
+            max_workers: Number of worker processes in parallel or sharded mode. Defaults to number of CPU cores.
+            pipelined: Whether run reading, processing, converting and writing rows on separate threads or not.
+            incremental: Whether skip input CSV files which content, convert tables and configuration are unchanged
+                since previous run or not.
+            shard_size: Number of rows in each shard to convert single input CSV file on multiple processes.
+                None disables sharding. This can't be used with parallel mode.
+            merge_mode: Whether merge Zaim CSV files into single Zaim CSV file ordered by date or not.
+            workspace: Workspace to convert. Defaults to root directory of this project.
+        """
+        if parallel and shard_size is not None:
+            msg = "Parallel mode and sharding can't be used together."
+            raise ValueError(msg)
+        if workspace is None:
+            workspace = Workspace.default()
+        CONFIG.load(workspace.path_file_config)
+        CONVERT_TABLE_INDEX.configure(CONFIG.store_categories)
+        error_totalizer = ErrorTotalizer(workspace.directory_csv_output)
+        convert_option = ConvertOption(
+            workspace,
+            ZaimCsvConverter.prepare_directory_csv_output(workspace, merge_mode),
+            parallel,
+            max_workers,
+            pipelined,
+            shard_size,
+        )
+        list_path_csv_file = sorted(workspace.directory_csv_input.glob("*.csv"))
+        is_imported = ZaimCsvConverter.convert_all(
+            error_totalizer,
+            list_path_csv_file,
+            convert_option,
+            incremental=incremental,
+        )
+        if merge_mode is not MergeMode.NONE:
+            ZaimCsvConverter.merge(list_path_csv_file, convert_option)
         if error_totalizer.is_presented:
-            error_totalizer.report_to_csv()
+            ZaimCsvConverter.report(error_totalizer, workspace, is_imported=is_imported)
             raise SomeInvalidInputCsvError(error_totalizer.message)
+
+    @staticmethod
+    def report(error_totalizer: ErrorTotalizer, workspace: Workspace, *, is_imported: bool) -> None:
+        """Export errors into CSV.
+
+        Convert tables are imported when all input CSV files have been skipped
+        since suggestions for undefined contents are built from convert tables in database.
+        """
+        if not is_imported and error_totalizer.undefined_content_error_handler.is_presented:
+            ZaimCsvConverter.import_convert_tables(workspace.directory_csv_convert)
+        error_totalizer.report_to_csv()
+
+    @staticmethod
+    def convert_all(
+        error_totalizer: ErrorTotalizer,
+        list_path_csv_file: list[Path],
+        convert_option: ConvertOption,
+        *,
+        incremental: bool,
+    ) -> bool:
+        """Convert input CSV files and merge results into error totalizer.
+
+        Errors of convert table CSV are exported into CSV before raising,
+        and the CSV exported by previous run is removed when convert tables are valid.
+
+        Returns:
+            Whether convert tables have been imported on current process or not.
+        """
+        directory_csv_output = convert_option.workspace.directory_csv_output
+        try:
+            if incremental:
+                is_imported = ZaimCsvConverter.convert_incrementally(
+                    error_totalizer,
+                    list_path_csv_file,
+                    convert_option,
+                )
+            else:
+                for convert_result in ZaimCsvConverter.convert(list_path_csv_file, convert_option):
+                    error_totalizer.merge(convert_result)
+                is_imported = bool(list_path_csv_file)
+        except InvalidConvertTableError as error:
+            csv_exporter = CsvExporter(directory_csv_output)
+            csv_exporter.export(error, FileNameForError.CONVERT_TABLE.value)
+            raise
+        (directory_csv_output / FileNameForError.CONVERT_TABLE.value).unlink(missing_ok=True)
+        return is_imported
+
+    @staticmethod
+    def prepare_directory_csv_output(workspace: Workspace, merge_mode: MergeMode) -> Path:
+        """Prepare directory to output Zaim CSV file for each input CSV file."""
+        if merge_mode is not MergeMode.INSTEAD:
+            return workspace.directory_csv_output
+        directory_csv_output = workspace.directory_csv_output / ZaimCsvConverter.DIRECTORY_NAME_EACH
+        directory_csv_output.mkdir(exist_ok=True)
+        return directory_csv_output
+
+    @staticmethod
+    def merge(list_path_csv_file: list[Path], convert_option: ConvertOption) -> None:
+        """Merge Zaim CSV files of input CSV files into single Zaim CSV file ordered by date."""
+        directory_csv_output = convert_option.directory_csv_output
+        list_path_zaim_csv = [
+            directory_csv_output / path_csv_file.name
+            for path_csv_file in list_path_csv_file
+            if (directory_csv_output / path_csv_file.name).is_file()
+        ]
+        path_output = convert_option.workspace.directory_csv_output / ZaimCsvMerger.FILE_NAME
+        ZaimCsvMerger().execute(list_path_zaim_csv, path_output)
+
+    @staticmethod
+    def convert_incrementally(
+        error_totalizer: ErrorTotalizer,
+        list_path_csv_file: list[Path],
+        convert_option: ConvertOption,
+    ) -> bool:
+        """Convert only input CSV files which have been changed since previous run.
+
+        Results of unchanged input CSV files are restored from manifest to report their errors again.
+
+        Returns:
+            Whether convert tables have been imported on current process or not.
+        """
+        run_manifest = RunManifest(convert_option.directory_csv_output, convert_option.workspace.directory_csv_convert)
+        dictionary_convert_result = {
+            path_csv_file: convert_result
+            for path_csv_file in list_path_csv_file
+            if (convert_result := run_manifest.find(path_csv_file)) is not None
+        }
+        list_path_csv_file_changed = [path for path in list_path_csv_file if path not in dictionary_convert_result]
+        dictionary_convert_result.update(
+            zip(
+                list_path_csv_file_changed,
+                ZaimCsvConverter.convert(list_path_csv_file_changed, convert_option),
+                strict=True,
+            ),
+        )
+        for path_csv_file in list_path_csv_file:
+            convert_result = dictionary_convert_result[path_csv_file]
+            error_totalizer.merge(convert_result)
+            run_manifest.record(path_csv_file, convert_result)
+        run_manifest.save()
+        return bool(list_path_csv_file_changed)
+
+    @staticmethod
+    def convert(list_path_csv_file: list[Path], convert_option: ConvertOption) -> Iterable[ConvertResult]:
+        """Convert input CSV files and return results in order of argument."""
+        if convert_option.parallel:
+            return ZaimCsvConverter.convert_on_process_pool(list_path_csv_file, convert_option)
+        if convert_option.shard_size is not None:
+            return ZaimCsvConverter.convert_sharded(list_path_csv_file, convert_option, convert_option.shard_size)
+        return ZaimCsvConverter.convert_sequentially(list_path_csv_file, convert_option)
+
+    @staticmethod
+    def convert_sequentially(
+        list_path_csv_file: list[Path],
+        convert_option: ConvertOption,
+    ) -> Generator[ConvertResult, None, None]:
+        """Convert input CSV files on current process.
+
+        Convert tables are imported only when there are input CSV files to convert.
+        """
+        if not list_path_csv_file:
+            return
+        ZaimCsvConverter.import_convert_tables(convert_option.workspace.directory_csv_convert)
+        for path_csv_file in list_path_csv_file:
+            yield ConvertResult.convert(
+                path_csv_file,
+                convert_option.directory_csv_output,
+                pipelined=convert_option.pipelined,
+            )
+
+    @staticmethod
+    def import_convert_tables(directory_csv_convert: Path) -> None:
+        """Import convert tables into database on current process."""
+        initialize_database()
+        ConvertTableCache(directory_csv_convert).execute()
+
+    @staticmethod
+    def convert_on_process_pool(
+        list_path_csv_file: list[Path],
+        convert_option: ConvertOption,
+    ) -> Iterable[ConvertResult]:
+        """Convert input CSV files on process pool."""
+        if not list_path_csv_file:
+            return []
+        process_pool_csv_converter = ProcessPoolCsvConverter(
+            convert_option.workspace.path_file_config,
+            convert_option.workspace.directory_csv_convert,
+            convert_option.directory_csv_output,
+            max_workers=convert_option.max_workers,
+            pipelined=convert_option.pipelined,
+        )
+        return process_pool_csv_converter.execute(list_path_csv_file)
+
+    @staticmethod
+    def convert_sharded(
+        list_path_csv_file: list[Path],
+        convert_option: ConvertOption,
+        shard_size: int,
+    ) -> Generator[ConvertResult, None, None]:
+        """Convert input CSV files one by one, splitting rows of each file into shards converted on process pool."""
+        if not list_path_csv_file:
+            return
+        # Keeps workers busy while current process reads next shard and writes previous one.
+        max_in_flight = 2 * (convert_option.max_workers or os.cpu_count() or 1)
+        with create_process_pool(
+            convert_option.workspace.path_file_config,
+            convert_option.workspace.directory_csv_convert,
+            convert_option.max_workers,
+        ) as executor:
+            for path_csv_file in list_path_csv_file:
+                sharded_csv_converter = ShardedCsvConverter(
+                    executor,
+                    path_csv_file,
+                    convert_option.directory_csv_output,
+                    shard_size=shard_size,
+                    max_in_flight=max_in_flight,
+                )
+                yield ConvertResult.execute(sharded_csv_converter)
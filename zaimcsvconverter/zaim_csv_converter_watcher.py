@@ -0,0 +1,303 @@
+"""This module implements watch mode which converts account CSV as soon as it is changed."""
+
+from __future__ import annotations
+
+from contextlib import suppress
+from logging import getLogger
+from pathlib import Path
+from threading import Event
+from typing import TYPE_CHECKING
+from typing import Any
+
+from zaimcsvconverter import CONFIG
+from zaimcsvconverter.accounts.enum import Account
+from zaimcsvconverter.convert_table_importer import ConvertTableImporter
+from zaimcsvconverter.convert_table_index import CONVERT_TABLE_INDEX
+from zaimcsvconverter.convert_table_source import ConvertTableSourceFactory
+from zaimcsvconverter.errorreporters.convert_result import ConvertResult
+from zaimcsvconverter.errorreporters.error_totalizer import ErrorTotalizer
+from zaimcsvconverter.errorreporters.error_totalizer import FileNameForError
+from zaimcsvconverter.exceptions import InvalidConvertTableError
+from zaimcsvconverter.models import initialize_database
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from zaimcsvconverter.accounts.context import AccountContext
+    from zaimcsvconverter.convert_table_source import SqliteConvertTableSource
+    from zaimcsvconverter.file_csv_convert import FileCsvConvert
+
+# Modified time in nanoseconds and size of file
+Signature = tuple[int, int]
+# Source of table in configuration and its fingerprint keyed by convert table and name of source
+SnapshotSource = dict[tuple["FileCsvConvert", str], tuple["SqliteConvertTableSource", str | None]]
+
+
+class ZaimCsvConverterWatcher:
+    """This class implements watch mode which converts account CSV as soon as it is changed.
+
+    Configuration, database schema and convert tables are loaded only once when watching starts.
+    Convert table is reloaded only when its convert table file is changed by applying only changed rows,
+    then input CSV files of accounts which depend on the convert table are converted again.
+    Tables of external SQLite database in configuration are imported again when their fingerprints are changed,
+    and rows imported from tables which are removed from configuration are deleted.
+    Result of each input CSV file is kept until it is converted again,
+    so that error CSV always reports errors of all input CSV files.
+    """
+
+    DEFAULT_INTERVAL_SECONDS = 1.0
+
+    # Reason: Directories are injected for testing. pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        directory_csv_input: Path,
+        directory_csv_convert: Path,
+        directory_csv_output: Path,
+        path_file_config: Path,
+        *,
+        pipelined: bool = False,
+    ) -> None:
+        self.directory_csv_input = directory_csv_input
+        self.directory_csv_convert = directory_csv_convert
+        self.directory_csv_output = directory_csv_output
+        self.path_file_config = path_file_config
+        self.pipelined = pipelined
+        self.logger = getLogger(__name__)
+        self.signature_config: Signature | None = None
+        self.snapshot_convert: dict[Path, Signature] = {}
+        self.snapshot_source: SnapshotSource = {}
+        self.snapshot_input: dict[Path, Signature] = {}
+        self.dictionary_convert_result: dict[Path, ConvertResult] = {}
+
+    def watch(self, interval: float = DEFAULT_INTERVAL_SECONDS, stop_event: Event | None = None) -> None:
+        """Convert all input CSV files, then keep converting changed ones until stop event is set."""
+        if stop_event is None:
+            stop_event = Event()
+        self.start()
+        while not stop_event.wait(interval):
+            self.try_to_poll()
+
+    def try_to_poll(self) -> None:
+        """Poll and log error since watching should continue even if converting unexpectedly fails."""
+        try:
+            self.poll()
+        # Reason: Any error should be logged to continue watching. pylint: disable=broad-exception-caught
+        except Exception:
+            self.logger.exception("Failed to convert.")
+
+    def start(self) -> list[Path]:
+        """Load configuration and all convert tables, then convert all input CSV files.
+
+        Returns:
+            Input CSV files which have been converted.
+        """
+        self.signature_config = self.take_signature(self.path_file_config)
+        CONFIG.load(self.path_file_config)
+        CONVERT_TABLE_INDEX.configure(CONFIG.store_categories)
+        initialize_database()
+        self.snapshot_convert = {}
+        self.reload_changed_convert_tables()
+        self.snapshot_source = {}
+        self.reload_changed_convert_table_sources()
+        self.snapshot_input = self.take_snapshot(self.directory_csv_input)
+        list_path_csv_file = list(self.snapshot_input)
+        self.convert(list_path_csv_file)
+        return list_path_csv_file
+
+    def poll(self) -> list[Path]:
+        """Reload changed convert tables and convert input CSV files affected by changes.
+
+        Returns:
+            Input CSV files which have been converted.
+        """
+        # Tables in configuration are reloaded after configuration since it can change them.
+        is_config_changed = self.reload_config_if_changed()
+        set_stem_changed_convert_table = (
+            self.reload_changed_convert_tables() | self.reload_changed_convert_table_sources()
+        )
+        snapshot_input = self.take_snapshot(self.directory_csv_input)
+        list_path_csv_file = [
+            path_csv_file
+            for path_csv_file, signature in snapshot_input.items()
+            if is_config_changed
+            or self.snapshot_input.get(path_csv_file) != signature
+            or self.depends_on(path_csv_file, set_stem_changed_convert_table)
+        ]
+        self.snapshot_input = snapshot_input
+        self.convert(list_path_csv_file)
+        return list_path_csv_file
+
+    def reload_changed_convert_tables(self) -> set[str]:
+        """Reload convert tables whose convert table file is added, changed or removed, return their stems.
+
+        Snapshot of each convert table file is updated only when it has been reloaded
+        so that invalid one is reloaded again by next polling even if it isn't changed after that.
+        """
+        snapshot_convert = self.take_snapshot_convert()
+        set_path_changed = {
+            path
+            for path in snapshot_convert.keys() | self.snapshot_convert.keys()
+            if snapshot_convert.get(path) != self.snapshot_convert.get(path)
+        }
+        set_stem_changed = set()
+        for path_csv_convert in sorted(set_path_changed):
+            if not self.reload_convert_table(path_csv_convert):
+                continue
+            signature = snapshot_convert.get(path_csv_convert)
+            if signature is None:
+                del self.snapshot_convert[path_csv_convert]
+            else:
+                self.snapshot_convert[path_csv_convert] = signature
+            set_stem_changed.add(path_csv_convert.stem)
+        return set_stem_changed
+
+    def reload_convert_table(self, path_csv_convert: Path) -> bool:
+        """Reload convert table file, return whether it has been reloaded or skipped since it's unknown."""
+        try:
+            convert_table_diff = ConvertTableImporter.reload(path_csv_convert)
+        except ValueError:
+            self.logger.warning("Skip unknown convert table CSV: %s", path_csv_convert)
+            return True
+        except InvalidConvertTableError as error:
+            self.logger.warning("Failed to load convert table CSV: %s\n%s", path_csv_convert, error)
+            return False
+        self.logger.info(
+            "Loaded convert table CSV: %s, inserted: %d, updated: %d, deleted: %d",
+            path_csv_convert,
+            len(convert_table_diff.list_value_inserted),
+            len(convert_table_diff.list_value_updated),
+            len(convert_table_diff.list_name_deleted),
+        )
+        return True
+
+    def reload_changed_convert_table_sources(self) -> set[str]:
+        """Reload tables in configuration which are added, changed or removed, return stems of their convert tables.
+
+        Snapshot of each table is updated only when it has been reloaded so that failed one is reloaded again.
+        """
+        snapshot_source = self.take_snapshot_source()
+        # Tables removed from configuration are treated as they don't exist.
+        list_changed: list[tuple[tuple[FileCsvConvert, str], SqliteConvertTableSource, str | None]] = [
+            (key, source, None) for key, (source, _) in self.snapshot_source.items() if key not in snapshot_source
+        ]
+        list_changed.extend(
+            (key, source, fingerprint)
+            for key, (source, fingerprint) in snapshot_source.items()
+            if key not in self.snapshot_source or self.snapshot_source[key][1] != fingerprint
+        )
+        set_stem_changed = set()
+        for key, source, fingerprint in list_changed:
+            if not self.reload_convert_table_source(source, fingerprint):
+                continue
+            if key in snapshot_source:
+                self.snapshot_source[key] = (source, fingerprint)
+            else:
+                del self.snapshot_source[key]
+            set_stem_changed.add(Path(source.file_csv_convert.value.name).stem)
+        return set_stem_changed
+
+    def reload_convert_table_source(self, source: SqliteConvertTableSource, fingerprint: str | None) -> bool:
+        """Import table again, or delete rows imported from it when it doesn't exist, return whether succeeded."""
+        try:
+            if fingerprint is None:
+                ConvertTableImporter.remove_source(source)
+            else:
+                ConvertTableImporter.execute_source(source)
+        except InvalidConvertTableError as error:
+            self.logger.warning("Failed to load convert table: %s\n%s", source.name, error)
+            return False
+        self.logger.info("Loaded convert table: %s", source.name)
+        return True
+
+    def reload_config_if_changed(self) -> bool:
+        signature_config = self.take_signature(self.path_file_config)
+        if signature_config == self.signature_config:
+            return False
+        self.signature_config = signature_config
+        CONFIG.load(self.path_file_config)
+        CONVERT_TABLE_INDEX.configure(CONFIG.store_categories)
+        self.logger.info("Reloaded config: %s", self.path_file_config)
+        return True
+
+    def depends_on(self, path_csv_file: Path, set_stem_convert_table: set[str]) -> bool:
+        """Return whether input CSV file depends on any of convert table files or not."""
+        account_context = self.detect_account(path_csv_file)
+        if account_context is None:
+            return False
+        return any(
+            Path(file_csv_convert.value.name).stem in set_stem_convert_table
+            for file_csv_convert in account_context.list_file_csv_convert
+        )
+
+    def convert(self, list_path_csv_file: list[Path]) -> None:
+        """Convert input CSV files, then report errors of all input CSV files into error CSV."""
+        for path_csv_file in list_path_csv_file:
+            if self.detect_account(path_csv_file) is None:
+                self.logger.warning("Skip input CSV which account can't be detected: %s", path_csv_file)
+                continue
+            self.dictionary_convert_result[path_csv_file] = ConvertResult.convert(
+                path_csv_file,
+                self.directory_csv_output,
+                pipelined=self.pipelined,
+            )
+            self.logger.info("Converted: %s", path_csv_file)
+        # Results of removed input CSV files are discarded.
+        self.dictionary_convert_result = {
+            path_csv_file: convert_result
+            for path_csv_file, convert_result in self.dictionary_convert_result.items()
+            if path_csv_file in self.snapshot_input
+        }
+        self.report()
+
+    def report(self) -> None:
+        """Rewrite error CSV by results of all input CSV files, error CSV is removed when no error remains."""
+        error_totalizer = ErrorTotalizer(self.directory_csv_output)
+        for path_csv_file in sorted(self.dictionary_convert_result):
+            error_totalizer.merge(self.dictionary_convert_result[path_csv_file])
+        for file_name_for_error in (FileNameForError.INVALID_ROW, FileNameForError.UNDEFINED_CONTENT):
+            (self.directory_csv_output / file_name_for_error.value).unlink(missing_ok=True)
+        if error_totalizer.is_presented:
+            error_totalizer.report_to_csv()
+            self.logger.warning(error_totalizer.message)
+
+    @staticmethod
+    def detect_account(path_csv_file: Path) -> AccountContext[Any, Any] | None:
+        try:
+            account_context: AccountContext[Any, Any] = Account.create_by_path_csv_input(path_csv_file).value
+        except ValueError:
+            return None
+        return account_context
+
+    def take_snapshot_convert(self) -> dict[Path, Signature]:
+        """Take signatures of convert table files of supported formats in order of file name."""
+        return self.take_snapshot_of(ConvertTableSourceFactory.list_path(self.directory_csv_convert))
+
+    @staticmethod
+    def take_snapshot_source() -> SnapshotSource:
+        """Take fingerprints of tables in current configuration."""
+        return {
+            (source.file_csv_convert, source.name): (source, source.fingerprint())
+            for source in ConvertTableSourceFactory.create_by_config()
+        }
+
+    @staticmethod
+    def take_snapshot(directory: Path) -> dict[Path, Signature]:
+        """Take signatures of CSV files in directory in order of file name."""
+        return ZaimCsvConverterWatcher.take_snapshot_of(sorted(directory.glob("*.csv")))
+
+    @staticmethod
+    def take_snapshot_of(iterable_path: Iterable[Path]) -> dict[Path, Signature]:
+        snapshot = {}
+        for path in iterable_path:
+            signature = ZaimCsvConverterWatcher.take_signature(path)
+            if signature is not None:
+                snapshot[path] = signature
+        return snapshot
+
+    @staticmethod
+    def take_signature(path: Path) -> Signature | None:
+        """Take signature of file, or None when file doesn't exist."""
+        with suppress(FileNotFoundError):
+            stat = path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        return None
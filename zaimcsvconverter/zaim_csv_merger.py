@@ -0,0 +1,85 @@
+"""This module implements merging Zaim CSV files into single Zaim CSV file ordered by date."""
+
+from __future__ import annotations
+
+import csv
+import heapq
+from contextlib import ExitStack
+from operator import itemgetter
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+
+from zaimcsvconverter.inputtooutput.exporters.zaim.csvfile.zaim_csv_format import ZaimCsvFormat
+from zaimcsvconverter.iterables import split
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class ZaimCsvMerger:
+    """This class implements merging Zaim CSV files into single Zaim CSV file ordered by date.
+
+    Zaim CSV files are merged by streaming k-way merge so that memory usage doesn't depend on number of rows.
+    Zaim CSV file which isn't ordered by date is split into sorted runs of at most chunk_size rows in advance.
+    Rows of same date keep order of files in argument and order in each file.
+    """
+
+    FILE_NAME = "zaim_merged.csv"
+    DEFAULT_CHUNK_SIZE = 100_000
+    # Date is formatted as "YYYY-MM-DD" so that it can be compared as string.
+    INDEX_DATE = ZaimCsvFormat.HEADER.index("日付")
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.chunk_size = chunk_size
+
+    def execute(self, list_path_zaim_csv: list[Path], path_output: Path) -> None:
+        """Merge Zaim CSV files into Zaim CSV file of path_output."""
+        with TemporaryDirectory() as directory, ExitStack() as stack:
+            list_path_run = [
+                path_run
+                for index, path_zaim_csv in enumerate(list_path_zaim_csv)
+                for path_run in self.build_runs(path_zaim_csv, Path(directory) / str(index))
+            ]
+            list_reader = [self.read(stack, path_run) for path_run in list_path_run]
+            with path_output.open("w", encoding="UTF-8", newline="\n") as file_output:
+                writer = csv.writer(file_output)
+                writer.writerow(ZaimCsvFormat.HEADER)
+                iterator_row = heapq.merge(*list_reader, key=itemgetter(self.INDEX_DATE))
+                writer.writerows(iterator_row)
+
+    def build_runs(self, path_zaim_csv: Path, directory_run: Path) -> list[Path]:
+        """Return Zaim CSV files ordered by date which consist rows of argument."""
+        if self.is_sorted(path_zaim_csv):
+            return [path_zaim_csv]
+        directory_run.mkdir()
+        list_path_run: list[Path] = []
+        with ExitStack() as stack:
+            for list_row in split(self.read(stack, path_zaim_csv), self.chunk_size):
+                path_run = directory_run / f"{len(list_path_run)}.csv"
+                with path_run.open("w", encoding="UTF-8", newline="\n") as file_run:
+                    writer = csv.writer(file_run)
+                    writer.writerow(ZaimCsvFormat.HEADER)
+                    list_row_sorted = sorted(list_row, key=itemgetter(self.INDEX_DATE))
+                    writer.writerows(list_row_sorted)
+                list_path_run.append(path_run)
+        return list_path_run
+
+    def is_sorted(self, path_zaim_csv: Path) -> bool:
+        """Return whether rows of Zaim CSV file are ordered by date or not."""
+        with ExitStack() as stack:
+            previous_date = ""
+            for row in self.read(stack, path_zaim_csv):
+                date = row[self.INDEX_DATE]
+                if date < previous_date:
+                    return False
+                previous_date = date
+        return True
+
+    @staticmethod
+    def read(stack: ExitStack, path_zaim_csv: Path) -> Iterator[list[str]]:
+        """Open Zaim CSV file until stack is closed and return reader which skipped header."""
+        file_zaim_csv = stack.enter_context(path_zaim_csv.open("r", encoding="UTF-8", newline=""))
+        reader = csv.reader(file_zaim_csv)
+        next(reader, None)
+        return reader